@@ -8,6 +8,11 @@ import tweepy
 import requests
 import os
 
+from .modules.cache_store import CacheStore, init_cache
+from .modules.schema import migrate
+from .modules.utils import get_db
+from .modules.market_snapshot import MARKET_TTL, cached_markets, market_record
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,11 +38,23 @@ if not all([X_API_KEY, X_API_SECRET, X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET]):
 
 # Database path
 DB_PATH = r"c:\CryptoBot\crypto_bot\data\crypto_bot.db"
+migrate(DB_PATH)
+# Market data is shared with the other bots through their cache database
+SHARED_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "crypto_bot.db")
+os.makedirs(os.path.dirname(SHARED_DB), exist_ok=True)
+init_cache(SHARED_DB)
+market_cache = CacheStore(SHARED_DB).namespace("markets", MARKET_TTL, retain=3600, max_entries=200, memory_size=64)
 
 # File to track monthly post count
 POST_COUNT_FILE = r"c:\CryptoBot\crypto_bot\data\post_count.txt"
 X_FREE_TIER_POST_LIMIT = 500  # Free tier limit: 500 posts per month
 
+# Daily posting slot; coin data is fetched PREWARM_MINUTES earlier so the post only has to send
+POST_TIME = "00:40"
+PREWARM_MINUTES = 5
+PREWARM_MAX_AGE = 15 * 60  # Older pre-fetched data is refetched at post time
+prewarmed = {}
+
 
 def load_post_count():
     """Load the current post count and last reset date from a file."""
@@ -89,11 +106,10 @@ def increment_post_count(posts_made, last_reset):
 def get_top_coins(db_path):
     """Fetch the list of top coins from the database."""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT coin_id FROM top_coins")
-        coins = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        with get_db(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT coin_id FROM top_coins ORDER BY rank")
+            coins = [row[0] for row in cursor.fetchall()]
         logger.info(f"Retrieved top coins from database: {coins}")
         return coins
     except sqlite3.Error as e:
@@ -101,7 +117,39 @@ def get_top_coins(db_path):
         return []
 
 
-def fetch_coin_data(coin_ids, retries=5, initial_delay=1):
+def fetch_coin_data(coin_ids, wait=15):
+    """Fetch coin data, reusing market data another bot stored within MARKET_TTL.
+
+    Only the process holding the markets refresh lease calls CoinGecko; the others wait
+    up to `wait` seconds for its result before fetching themselves.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        shared = cached_markets(market_cache, coin_ids)
+        if len(shared) == len(coin_ids):
+            logger.info(f"Using shared market data for coins: {coin_ids}")
+            return [{
+                "id": coin_id,
+                "symbol": shared[coin_id]["symbol"] or coin_id,
+                "current_price": shared[coin_id]["price"],
+                "price_change_percentage_24h": shared[coin_id]["price_change_24h"],
+                "market_cap": shared[coin_id]["market_cap"]
+            } for coin_id in coin_ids]
+        if market_cache.acquire("refresh", lease=60) or time.monotonic() >= deadline:
+            break
+        time.sleep(0.5)
+    try:
+        data = request_coin_data(coin_ids)
+    finally:
+        market_cache.release("refresh")
+    for coin in data or []:
+        record = market_record(coin)
+        if record:
+            market_cache.put(coin["id"], record)
+    return data
+
+
+def request_coin_data(coin_ids, retries=5, initial_delay=1):
     """Fetch coin data from CoinGecko API with rate-limit handling."""
     params = {
         "vs_currency": "usd",
@@ -134,6 +182,27 @@ def fetch_coin_data(coin_ids, retries=5, initial_delay=1):
     return None
 
 
+def prewarm_coin_data():
+    """Fetch the next update's coin data ahead of its posting slot."""
+    coin_ids = get_top_coins(DB_PATH)
+    if not coin_ids:
+        return
+    coin_data = fetch_coin_data(coin_ids)
+    if coin_data:
+        prewarmed.update(coin_ids=coin_ids, coin_data=coin_data, fetched=time.monotonic())
+        logger.info(f"Pre-fetched coin data for {coin_ids} ahead of the {POST_TIME} post")
+
+
+def take_prewarmed(coin_ids):
+    """Return (and consume) pre-fetched coin data for `coin_ids` if it is recent enough."""
+    if prewarmed.get("coin_ids") == coin_ids and time.monotonic() - prewarmed["fetched"] < PREWARM_MAX_AGE:
+        coin_data = prewarmed["coin_data"]
+        prewarmed.clear()
+        logger.info("Using pre-fetched coin data")
+        return coin_data
+    return None
+
+
 def post_to_x(coin_data):
     """Post the crypto update to X."""
     try:
@@ -206,8 +275,8 @@ def perform_crypto_update():
         logger.error("No coins retrieved from database, aborting update.")
         return
 
-    # Step 2: Fetch coin data
-    coin_data = fetch_coin_data(coin_ids)
+    # Step 2: Fetch coin data (usually already fetched by prewarm_coin_data)
+    coin_data = take_prewarmed(coin_ids) or fetch_coin_data(coin_ids)
     if not coin_data:
         logger.warning("No coin data fetched, update failed.")
         return
@@ -223,7 +292,9 @@ def perform_crypto_update():
 def schedule_updates():
     """Schedule crypto updates to run periodically."""
     # Run once per day at 00:40 UTC (matches Currency Gator post time)
-    schedule.every().day.at("00:40").do(perform_crypto_update)
+    schedule.every().day.at(POST_TIME).do(perform_crypto_update)
+    prewarm_time = datetime.strptime(POST_TIME, "%H:%M") - timedelta(minutes=PREWARM_MINUTES)
+    schedule.every().day.at(prewarm_time.strftime("%H:%M")).do(prewarm_coin_data)
 
     # Initial run if needed
     perform_crypto_update()
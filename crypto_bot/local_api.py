@@ -0,0 +1,416 @@
+# c:\CryptoBot\crypto_bot\local_api.py
+"""Local stand-in for the CoinGecko, NewsAPI, YouTube, DappRadar and Santiment APIs.
+
+Start it with `python -m crypto_bot.local_api`, then point the bot at it:
+
+    COINGECKO_BASE_URL=http://127.0.0.1:8800/coingecko/api/v3
+    NEWSAPI_BASE_URL=http://127.0.0.1:8800/newsapi/v2
+    DAPPRADAR_BASE_URL=http://127.0.0.1:8800/dappradar/v2
+    SANTIMENT_BASE_URL=http://127.0.0.1:8800/santiment
+    YOUTUBE_BASE_URL=http://127.0.0.1:8800/youtube/
+
+LOCAL_API_MODE=replay (default) answers from recordings and falls back to responses
+built from the seed payloads in data/seeds (coin_data.json, coin_info.json, news.json).
+Coin seeds are imported once into a per-coin store (LOCAL_API_SEED_STORE) and read
+from there one coin at a time.
+LOCAL_API_MODE=record forwards every request to the real API and saves the answer
+under LOCAL_API_RECORDINGS for later replay. LOCAL_API_LATENCY_MS adds a fixed delay
+per request when a load test should look like the real network.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import zlib
+from datetime import datetime, UTC, timedelta
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+
+from .modules.api_endpoints import DEFAULT_BASE_URLS
+from .modules.coin_store import COIN_INFO_FIELDS, CoinStore, init_coin_store
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+lg = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_DIR = os.getenv("LOCAL_API_SEED_DIR", os.path.join(ROOT_DIR, "data", "seeds"))
+RECORDINGS_DIR = os.getenv("LOCAL_API_RECORDINGS", os.path.join(ROOT_DIR, "data", "recordings"))
+SEED_STORE = os.getenv("LOCAL_API_SEED_STORE", os.path.join(ROOT_DIR, "data", "local_api.db"))
+MODE = os.getenv("LOCAL_API_MODE", "replay")
+HOST = os.getenv("LOCAL_API_HOST", "127.0.0.1")
+PORT = int(os.getenv("LOCAL_API_PORT", 8800))
+LATENCY = int(os.getenv("LOCAL_API_LATENCY_MS", 0)) / 1000
+
+# Credentials never end up in recording keys or files
+SECRET_PARAMS = {"apiKey", "api_key", "key", "x_cg_demo_api_key", "x_cg_pro_api_key"}
+FORWARD_HEADERS = ("X-Api-Key", "Authorization", "Content-Type", "x-cg-demo-api-key", "x-cg-pro-api-key")
+
+
+def load_json(name):
+    path = os.path.join(SEED_DIR, name)
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        lg.warning(f"No seed data from {path}: {e}")
+        return {}
+    data.pop("date", None)
+    return data
+
+
+# The fields of a formatted coin_data record the stand-in builds responses from
+COIN_DATA_SEED_FIELDS = ("coin", "prices", "price_change_24h", "volume", "market_cap", "fundamentals", "twitter_followers")
+
+
+def load_coin_store(kind, name, fields):
+    store = CoinStore(SEED_STORE, kind, fields)
+    path = os.path.join(SEED_DIR, name)
+    if not store.ids() and os.path.exists(path):
+        try:
+            store.import_json(path)
+        except (OSError, json.JSONDecodeError) as e:
+            lg.warning(f"No seed data from {path}: {e}")
+    return store
+
+
+def parse_money(value):
+    """Turn a cached display string like '$129.8B' back into a number."""
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).replace("$", "").replace(",", "").strip()
+    scale = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}.get(text[-1:].upper(), 1)
+    try:
+        return float(text.rstrip("KMBTkmbt")) * scale
+    except ValueError:
+        return 0
+
+
+def stable_number(seed, low, high):
+    """Deterministic pseudo-random value for coins with no seed data."""
+    return low + (zlib.crc32(seed.encode()) % 10000) / 10000 * (high - low)
+
+
+class Seeds:
+    """Response builders backed by recorded payloads of the bot's coins and news queries."""
+
+    def __init__(self):
+        os.makedirs(os.path.dirname(SEED_STORE), exist_ok=True)
+        init_coin_store(SEED_STORE)
+        self.coin_data = load_coin_store("seed_coin_data", "coin_data.json", COIN_DATA_SEED_FIELDS)
+        self.coin_info = load_coin_store("seed_coin_info", "coin_info.json", COIN_INFO_FIELDS)
+        self.news = load_json("news.json")
+        lg.info(f"Seeded {len(self.coin_data.ids())} coins, {len(self.coin_info.ids())} coin payloads, "
+                f"{len(self.news)} news queries")
+
+    def market(self, coin_id):
+        info = self.coin_info.get(coin_id, {}).get("market_data")
+        if info:
+            return {
+                "price": info["current_price"]["usd"],
+                "change": info.get("price_change_percentage_24h") or 0,
+                "volume": info["total_volume"]["usd"],
+                "market_cap": info["market_cap"]["usd"]
+            }
+        cached = self.coin_data.get(coin_id)
+        if cached and cached.get("prices"):
+            return {
+                "price": cached["prices"][-1][1],
+                "change": cached.get("price_change_24h", 0),
+                "volume": cached.get("volume", 0),
+                "market_cap": parse_money(cached.get("market_cap", 0))
+            }
+        price = stable_number(coin_id, 0.01, 5)
+        return {
+            "price": price,
+            "change": stable_number(coin_id + "24h", -5, 5),
+            "volume": price * 5e7,
+            "market_cap": price * 1e9
+        }
+
+    def price_series(self, coin_id):
+        cached = self.coin_data.get(coin_id, {})
+        prices = [price for _, price in cached.get("prices", [])]
+        if prices:
+            return prices
+        base = self.market(coin_id)["price"]
+        return [base * (1 + 0.02 * ((i % 7) - 3) / 3) for i in range(30)]
+
+    # CoinGecko
+    def coins_markets(self, query):
+        ids = [coin_id for coin_id in query.get("ids", "").split(",") if coin_id]
+        result = []
+        for coin_id in ids:
+            market = self.market(coin_id)
+            result.append({
+                "id": coin_id,
+                "symbol": coin_id[:4],
+                "name": self.coin_data.get(coin_id, {}).get("coin", coin_id.title()),
+                "current_price": market["price"],
+                "price_change_percentage_24h": market["change"],
+                "total_volume": market["volume"],
+                "market_cap": market["market_cap"]
+            })
+        return 200, result
+
+    def simple_price(self, query):
+        result = {}
+        for coin_id in query.get("ids", "").split(","):
+            if coin_id:
+                market = self.market(coin_id)
+                result[coin_id] = {"usd": market["price"], "usd_24h_change": market["change"]}
+        return 200, result
+
+    def coin(self, coin_id):
+        info = self.coin_info.get(coin_id)
+        if info:
+            return 200, info
+        market = self.market(coin_id)
+        return 200, {
+            "id": coin_id,
+            "name": self.coin_data.get(coin_id, {}).get("coin", coin_id.title()),
+            "description": {"en": self.coin_data.get(coin_id, {}).get("fundamentals", "")},
+            "market_data": {
+                "current_price": {"usd": market["price"]},
+                "price_change_percentage_24h": market["change"],
+                "total_volume": {"usd": market["volume"]},
+                "market_cap": {"usd": market["market_cap"]}
+            },
+            "community_data": {"twitter_followers": self.coin_data.get(coin_id, {}).get("twitter_followers", 0)},
+            "developer_data": {"code_additions_deletions_4_weeks": {"additions": 0, "deletions": 0}}
+        }
+
+    def market_chart_range(self, coin_id, query):
+        """Replay the recorded price series onto the requested window, one point per day."""
+        start = int(float(query.get("from", 0)))
+        end = int(float(query.get("to", start)))
+        series = self.price_series(coin_id)
+        market = self.market(coin_id)
+        day = datetime.fromtimestamp(start, UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        if day.timestamp() < start:
+            day += timedelta(days=1)
+        prices, volumes, caps = [], [], []
+        i = 0
+        while day.timestamp() <= end:
+            ts = int(day.timestamp() * 1000)
+            price = series[i % len(series)]
+            prices.append([ts, price])
+            volumes.append([ts, market["volume"]])
+            caps.append([ts, market["market_cap"] * price / market["price"] if market["price"] else 0])
+            day += timedelta(days=1)
+            i += 1
+        return 200, {"prices": prices, "total_volumes": volumes, "market_caps": caps}
+
+    def history(self, coin_id, query):
+        series = self.price_series(coin_id)
+        date = query.get("date", "")
+        price = series[zlib.crc32(date.encode()) % len(series)]
+        market = self.market(coin_id)
+        return 200, {
+            "id": coin_id,
+            "market_data": {
+                "current_price": {"usd": price},
+                "total_volume": {"usd": market["volume"]},
+                "market_cap": {"usd": market["market_cap"]}
+            }
+        }
+
+    def coingecko(self, path, query):
+        parts = path.strip("/").split("/")
+        if parts[:3] != ["api", "v3", "coins"] and parts[:3] != ["api", "v3", "simple"]:
+            return 404, {"error": "Not found"}
+        parts = parts[2:]
+        if parts == ["coins", "markets"]:
+            return self.coins_markets(query)
+        if parts == ["simple", "price"]:
+            return self.simple_price(query)
+        if len(parts) == 2:
+            return self.coin(parts[1])
+        if len(parts) == 4 and parts[2:] == ["market_chart", "range"]:
+            return self.market_chart_range(parts[1], query)
+        if len(parts) == 3 and parts[2] == "history":
+            return self.history(parts[1], query)
+        return 404, {"error": "Not found"}
+
+    # NewsAPI
+    def newsapi(self, path, query):
+        q = query.get("q", "")
+        headline = self.news.get(q)
+        if not headline or headline.startswith("No new updates"):
+            headline = f"{q} network update announced"
+        slug = "-".join(q.lower().split())
+        return 200, {
+            "status": "ok",
+            "totalResults": 1,
+            "articles": [{
+                "title": headline,
+                "url": f"https://example.com/news/{slug}",
+                "publishedAt": datetime.now(UTC).isoformat()
+            }]
+        }
+
+    # DappRadar
+    def dappradar(self, path, query):
+        chain = query.get("chain", "unknown")
+        per_page = int(query.get("resultsPerPage", 5))
+        results = [
+            {
+                "name": f"{chain.title()} Dapp {i + 1}",
+                "description": f"Top {chain} application #{i + 1}",
+                "website": f"https://example.com/{chain}/{i + 1}",
+                "dailyUsers": int(stable_number(f"{chain}{i}", 100, 50000))
+            }
+            for i in range(per_page)
+        ]
+        return 200, {"success": True, "totalResults": per_page * 10, "results": results}
+
+    # Santiment
+    def santiment(self, path, body):
+        variables = (body or {}).get("variables", {})
+        slug = variables.get("slug", "unknown")
+        value = self.market(slug)["volume"] / 1e6
+        return 200, {"data": {"getMetric": {"timeseriesData": [
+            {"datetime": variables.get("to", datetime.now(UTC).isoformat()), "value": value}
+        ]}}}
+
+    # YouTube Data API
+    def youtube(self, path, query):
+        method = path.strip("/").split("/")[-1]
+        now = datetime.now(UTC).isoformat()
+        if method == "search":
+            q = query.get("q", "crypto")
+            count = int(query.get("maxResults", 1))
+            items = [
+                {
+                    "id": {"kind": "youtube#video", "videoId": hashlib.sha1(f"{q}{i}".encode()).hexdigest()[:11]},
+                    "snippet": {"title": f"{q} explained ({i + 1})", "channelTitle": "Local Stand-in", "publishedAt": now}
+                }
+                for i in range(count)
+            ]
+            return 200, {"items": items}
+        if method == "channels":
+            items = [
+                {
+                    "id": channel_id,
+                    "snippet": {"title": f"Channel {channel_id[-4:]}"},
+                    "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}}
+                }
+                for channel_id in query.get("id", "").split(",") if channel_id
+            ]
+            return 200, {"items": items}
+        if method == "playlistItems":
+            playlist_id = query.get("playlistId", "")
+            video_id = hashlib.sha1(playlist_id.encode()).hexdigest()[:11]
+            return 200, {"items": [{"snippet": {
+                "title": f"Market recap from {playlist_id[-4:]}",
+                "publishedAt": now,
+                "resourceId": {"videoId": video_id}
+            }}]}
+        if method == "videos":
+            items = [
+                {"id": video_id, "snippet": {"title": f"Video {video_id}", "description": "Market recap. More inside."}}
+                for video_id in query.get("id", "").split(",") if video_id
+            ]
+            return 200, {"items": items}
+        return 404, {"error": {"code": 404, "message": "Not found"}}
+
+
+class Recordings:
+    """Recorded upstream answers, one JSON file per provider."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._data = {}
+
+    def _path(self, provider):
+        return os.path.join(self.directory, f"{provider}.json")
+
+    def _load(self, provider):
+        if provider not in self._data:
+            try:
+                with open(self._path(provider), 'r') as f:
+                    self._data[provider] = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._data[provider] = {}
+        return self._data[provider]
+
+    @staticmethod
+    def key(method, path, query, body=None):
+        params = "&".join(f"{k}={v}" for k, v in sorted(query.items()) if k not in SECRET_PARAMS)
+        key = f"{method} {path}?{params}"
+        if body:
+            key += " " + hashlib.sha1(body).hexdigest()
+        return key
+
+    def get(self, provider, key):
+        return self._load(provider).get(key)
+
+    def put(self, provider, key, status, text):
+        recordings = self._load(provider)
+        recordings[key] = {"status": status, "body": text}
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(provider), 'w') as f:
+            json.dump(recordings, f, indent=1)
+
+
+seeds = Seeds()
+recordings = Recordings(RECORDINGS_DIR)
+
+
+async def forward(request, provider, tail):
+    """Pass the request to the real API and record what it answers."""
+    # `tail` already carries the API's base path (api/v3/..., v2/...), so only the host is taken
+    base = urlsplit(DEFAULT_BASE_URLS[provider])._replace(path="").geturl()
+    headers = {name: request.headers[name] for name in FORWARD_HEADERS if name in request.headers}
+    body = await request.read()
+    async with aiohttp.ClientSession() as session:
+        async with session.request(request.method, f"{base}/{tail}", params=request.query,
+                                   data=body or None, headers=headers) as response:
+            return response.status, await response.text()
+
+
+async def handle(request):
+    provider = request.match_info["provider"]
+    tail = request.match_info["tail"]
+    if provider not in DEFAULT_BASE_URLS:
+        return web.json_response({"error": f"Unknown provider {provider}"}, status=404)
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+
+    body = await request.read()
+    key = Recordings.key(request.method, tail, request.query, body)
+    if MODE == "record":
+        status, text = await forward(request, provider, tail)
+        if status == 200:
+            recordings.put(provider, key, status, text)
+        lg.info(f"Recorded {provider} {key} -> {status}")
+    else:
+        recorded = recordings.get(provider, key)
+        if recorded:
+            status, text = recorded["status"], recorded["body"]
+        else:
+            builder = getattr(seeds, provider)
+            payload = json.loads(body) if provider == "santiment" and body else dict(request.query)
+            status, data = builder(tail, payload)
+            text = json.dumps(data)
+        lg.debug(f"Served {provider} {key} -> {status}")
+
+    # Validators let the bot's HTTP cache exercise its 304 path
+    etag = '"' + hashlib.sha1(text.encode()).hexdigest() + '"'
+    if status == 200 and request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    headers = {"ETag": etag} if status == 200 else {}
+    return web.Response(status=status, text=text, content_type="application/json", headers=headers)
+
+
+def make_app():
+    app = web.Application()
+    app.router.add_route("*", "/{provider}/{tail:.*}", handle)
+    return app
+
+
+if __name__ == "__main__":
+    lg.info(f"Local API stand-in on http://{HOST}:{PORT} ({MODE} mode)")
+    web.run_app(make_app(), host=HOST, port=PORT, print=None)
@@ -0,0 +1,28 @@
+# c:\CryptoBot\crypto_bot\modules\api_endpoints.py
+import os
+from dotenv import load_dotenv
+from googleapiclient.discovery import build
+
+load_dotenv()
+
+# Upstream base URLs. Each one can be overridden with <PROVIDER>_BASE_URL, e.g. to
+# point the bot at the local stand-in server (python -m crypto_bot.local_api).
+DEFAULT_BASE_URLS = {
+    "coingecko": "https://api.coingecko.com/api/v3",
+    "newsapi": "https://newsapi.org/v2",
+    "dappradar": "https://apis.dappradar.com/v2",
+    "santiment": "https://api.santiment.net",
+    "youtube": "https://youtube.googleapis.com/",
+}
+
+
+def base_url(provider):
+    """Return the configured base URL for `provider` without a trailing slash."""
+    return os.getenv(f"{provider.upper()}_BASE_URL", DEFAULT_BASE_URLS[provider]).rstrip("/")
+
+
+def youtube_client(api_key):
+    """Build a YouTube Data API client, honouring YOUTUBE_BASE_URL if set."""
+    endpoint = os.getenv("YOUTUBE_BASE_URL")
+    client_options = {"api_endpoint": endpoint} if endpoint else None
+    return build("youtube", "v3", developerKey=api_key, client_options=client_options)
@@ -0,0 +1,153 @@
+# c:\CryptoBot\crypto_bot\modules\async_db.py
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .db_pool import connection
+
+lg = logging.getLogger(__name__)
+
+# Threads serving reads per database file
+READ_THREADS = int(os.getenv("SQLITE_READ_THREADS", 2))
+# Most queued writes committed in one transaction
+WRITE_BATCH = 500
+
+
+def _consume(future):
+    # The writer already logged the failure; awaiting callers still receive it
+    if not future.cancelled():
+        future.exception()
+
+
+class AsyncDB:
+    """SQLite access for coroutines: reads in a small thread pool, writes through one writer task.
+
+    A slow disk then holds up a worker thread instead of the event loop (and with it the
+    Discord heartbeat). Writes are queued and the writer commits whatever has queued up
+    while the previous batch was committing in a single transaction, each write in its
+    own savepoint so one failing statement does not lose the rest.
+    """
+
+    def __init__(self, db_path, readers=READ_THREADS, batch_size=WRITE_BATCH):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="db-read")
+        self._writer_thread = ThreadPoolExecutor(1, thread_name_prefix="db-write")
+        self._queue = None
+        self._writer = None
+        self.batches = 0
+        self.writes = 0
+
+    async def read(self, func, *args):
+        """Run func(conn, *args) on a pooled connection in a reader thread and return its result."""
+        def run():
+            with connection(self.db_path) as conn:
+                return func(conn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._readers, run)
+
+    def write(self, func, *args):
+        """Queue func(conn, *args) for the writer; returns a future set to its result once committed.
+
+        `func` must not commit. Callers that do not need the result can ignore the future.
+        """
+        loop = asyncio.get_running_loop()
+        if self._writer is None or self._writer.done() or self._writer.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._write_forever())
+        future = loop.create_future()
+        future.add_done_callback(_consume)
+        self._queue.put_nowait((func, args, future))
+        return future
+
+    def _commit(self, batch):
+        results = []
+        with connection(self.db_path) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            for func, args, _ in batch:
+                conn.execute('SAVEPOINT batch_write')
+                try:
+                    results.append((True, func(conn, *args)))
+                    conn.execute('RELEASE batch_write')
+                except Exception as e:
+                    conn.execute('ROLLBACK TO batch_write')
+                    conn.execute('RELEASE batch_write')
+                    lg.error(f"Queued write {getattr(func, '__name__', func)} to {self.db_path} failed: {e}")
+                    results.append((False, e))
+            conn.commit()
+        return results
+
+    async def _write_forever(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self._writer_thread, self._commit, batch)
+            except Exception as e:
+                lg.error(f"Write batch of {len(batch)} to {self.db_path} failed: {e}")
+                results = [(False, e)] * len(batch)
+            self.batches += 1
+            self.writes += len(batch)
+            for (_, _, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    async def flush(self):
+        """Wait until every write queued so far has been committed."""
+        if self._writer and not self._writer.done():
+            await self.write(lambda conn: None)
+
+    async def close(self):
+        await self.flush()
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+        self._readers.shutdown(wait=False)
+        self._writer_thread.shutdown(wait=True)
+
+    def stats(self):
+        pending = self._queue.qsize() if self._queue else 0
+        return {"db_path": self.db_path, "batches": self.batches, "writes": self.writes, "pending": pending}
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def database(db_path):
+    """The process-wide AsyncDB for `db_path`."""
+    key = os.path.abspath(db_path)
+    with _databases_lock:
+        if key not in _databases:
+            _databases[key] = AsyncDB(db_path)
+        return _databases[key]
+
+
+def submit(db_path, func, *args):
+    """Commit func(conn, *args): queued on the writer when called on an event loop, inline otherwise.
+
+    Returns the writer's future on an event loop and func's result otherwise.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        with connection(db_path) as conn:
+            result = func(conn, *args)
+            conn.commit()
+        return result
+    return database(db_path).write(func, *args)
+
+
+async def close_all():
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for db in databases:
+        await db.close()
@@ -0,0 +1,460 @@
+# c:\CryptoBot\crypto_bot\modules\cache_store.py
+import asyncio
+import functools
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import zlib
+from datetime import datetime, UTC, timedelta
+
+from .async_db import database, submit
+from .coin_store import pack, unpack
+from .memory_cache import LRUCache
+from .utils import get_db
+
+lg = logging.getLogger(__name__)
+
+# TTL value for entries that stay fresh until the end of the UTC day they were stored
+DAILY = "daily"
+LRU, FIFO = "lru", "fifo"
+# Identifies this process in cache_leases; the bots share one database
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def init_cache(db_path):
+    """Create the shared cache and lease tables if needed."""
+    with get_db(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                purge_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_purge ON cache_entries (namespace, purge_at)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_leases (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+
+
+def _timestamp(value):
+    # Legacy tables stored either epoch seconds or ISO strings
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+class CacheEntry:
+    """A cached value with the time it was stored and the time it stops being fresh."""
+
+    __slots__ = ("value", "stored_at", "expires_at")
+
+    def __init__(self, value, stored_at, expires_at):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return datetime.now(UTC).timestamp() < self.expires_at
+
+    @property
+    def age(self):
+        return datetime.now(UTC).timestamp() - self.stored_at
+
+
+class Namespace:
+    """One kind of cached data with its own freshness, retention and size bound.
+
+    Entries are fresh for `ttl` seconds (or until UTC midnight with DAILY) and are kept
+    `retain` seconds beyond that so callers can serve them stale or as a last resort.
+    The sweeper removes entries past retention and trims the namespace to
+    `max_entries`, dropping the least recently read (LRU) or oldest stored (FIFO) first.
+    Up to `memory_size` decoded entries are also held in memory; values are shared
+    between callers and must be treated as read-only. With `compress` values are
+    stored zlib-compressed (see coin_store.pack), which suits large records.
+    """
+
+    def __init__(self, store, name, ttl, max_entries=500, eviction=LRU, retain=0, memory_size=128, memory_ttl=600,
+                 compress=False):
+        if eviction not in (LRU, FIFO):
+            raise ValueError(f"Unknown eviction policy {eviction!r} for cache namespace {name}")
+        self.store = store
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.retain = retain
+        self.compress = compress
+        # The memory TTL only bounds how long another process's writes can go unseen
+        self.memory = LRUCache(memory_size, memory_ttl, name=name)
+        self._touched = {}
+        self.swept = 0
+        self.evicted = 0
+
+    def expiry(self, stored_at, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl == DAILY:
+            day = datetime.fromtimestamp(stored_at, UTC).date() + timedelta(days=1)
+            return datetime(day.year, day.month, day.day, tzinfo=UTC).timestamp()
+        return stored_at + ttl
+
+    def _remembered(self, key):
+        entry = self.memory.get(key)
+        # A stale copy may have been refreshed by another process; the database holds the latest
+        return entry if entry is not None and entry.fresh else None
+
+    def _select(self, conn, key):
+        return conn.execute(
+            'SELECT value, stored_at, expires_at, purge_at FROM cache_entries WHERE namespace = ? AND key = ?',
+            (self.name, key)
+        ).fetchone()
+
+    def _loaded(self, key, row):
+        if not row or row[3] < datetime.now(UTC).timestamp():
+            return None
+        try:
+            entry = CacheEntry(unpack(row[0]), row[1], row[2])
+        except (json.JSONDecodeError, zlib.error) as e:
+            lg.error(f"Removing corrupted {self.name} cache entry for {key}: {e}")
+            self.delete(key)
+            return None
+        self.memory.put(key, entry)
+        return entry
+
+    def _hit(self, key, entry):
+        if entry is not None:
+            # Read times are written back by the sweeper rather than on every hit
+            self._touched[key] = datetime.now(UTC).timestamp()
+        return entry
+
+    def get(self, key):
+        """Return the CacheEntry for `key` (fresh or not), or None if absent or past retention."""
+        entry = self._remembered(key)
+        if entry is None:
+            with get_db(self.store.db_path) as conn:
+                entry = self._loaded(key, self._select(conn, key))
+        return self._hit(key, entry)
+
+    async def aget(self, key):
+        """get() for coroutines: a memory miss is read in the database's reader threads."""
+        entry = self._remembered(key)
+        if entry is None:
+            entry = self._loaded(key, await self.store.db.read(self._select, key))
+        return self._hit(key, entry)
+
+    def fresh(self, key):
+        """Return the cached value for `key` if it is still fresh, else None."""
+        entry = self.get(key)
+        return entry.value if entry and entry.fresh else None
+
+    async def afresh(self, key):
+        entry = await self.aget(key)
+        return entry.value if entry and entry.fresh else None
+
+    @staticmethod
+    def _write_entry(conn, row):
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries '
+            '(namespace, key, value, stored_at, expires_at, purge_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            row
+        )
+
+    def put(self, key, value, stored_at=None, ttl=None):
+        """Store `value` in memory and SQLite; returns False if the database write failed.
+
+        `ttl` overrides the namespace TTL for this entry only. On an event loop the SQLite
+        write is queued on the database's writer task and a failure is only logged.
+        """
+        stored_at = datetime.now(UTC).timestamp() if stored_at is None else stored_at
+        entry = CacheEntry(value, stored_at, self.expiry(stored_at, ttl))
+        self.memory.put(key, entry)
+        try:
+            submit(self.store.db_path, self._write_entry, (
+                self.name, key, pack(value) if self.compress else json.dumps(value), stored_at, entry.expires_at,
+                entry.expires_at + self.retain, stored_at
+            ))
+        except Exception as e:
+            lg.error(f"Error writing {self.name} cache entry for {key}: {e}")
+            return False
+        return True
+
+    def _delete_entry(self, conn, key):
+        conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (self.name, key))
+
+    def delete(self, key):
+        self.memory.pop(key)
+        self._touched.pop(key, None)
+        submit(self.store.db_path, self._delete_entry, key)
+
+    def _take_lease(self, conn, key, lease):
+        now = datetime.now(UTC).timestamp()
+        return conn.execute(
+            'INSERT INTO cache_leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (namespace, key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+            'WHERE cache_leases.expires_at < ? OR cache_leases.owner = excluded.owner',
+            (self.name, key, OWNER, now + lease, now)
+        ).rowcount == 1
+
+    def acquire(self, key, lease=120):
+        """Take (or extend) this process's lease on refreshing `key`; False if another process holds it."""
+        with get_db(self.store.db_path) as conn:
+            taken = self._take_lease(conn, key, lease)
+            conn.commit()
+        return taken
+
+    async def aacquire(self, key, lease=120):
+        return await self.store.db.write(self._take_lease, key, lease)
+
+    def _drop_lease(self, conn, key):
+        conn.execute('DELETE FROM cache_leases WHERE namespace = ? AND key = ? AND owner = ?', (self.name, key, OWNER))
+
+    def release(self, key):
+        submit(self.store.db_path, self._drop_lease, key)
+
+    def shared(self, key=None, lease=120, wait=30, poll=0.5):
+        """Decorator letting one process at a time refresh an entry of this namespace.
+
+        The wrapped coroutine must put() its result under `key(*args)` (default: the first
+        argument). While that entry is fresh its value is returned without a call; otherwise
+        the process holding the key's lease runs the coroutine and the others poll for its
+        result. A waiter runs the coroutine itself once the lease is released without a fresh
+        entry, or after `wait` seconds; a crashed owner's lease lapses after `lease` seconds.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = key(*args, **kwargs) if key else args[0]
+                deadline = time.monotonic() + wait
+                waited = False
+                while True:
+                    entry = await self.aget(cache_key)
+                    if entry and entry.fresh:
+                        if waited:
+                            lg.debug(f"Using {self.name} entry for {cache_key} refreshed by another process")
+                        return entry.value
+                    if await self.aacquire(cache_key, lease):
+                        break
+                    if time.monotonic() >= deadline:
+                        lg.warning(f"Gave up waiting for another process to refresh {self.name} entry {cache_key}")
+                        break
+                    waited = True
+                    await asyncio.sleep(poll)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.release(cache_key)
+            return wrapper
+        return decorator
+
+    def take_touched(self):
+        touched, self._touched = self._touched, {}
+        return touched
+
+    def sweep(self, conn, now, touched):
+        """Write back read times, drop entries past retention and trim to `max_entries`.
+
+        Only runs SQL, so it can run on the writer thread; see after_sweep() for the rest.
+        """
+        if touched:
+            conn.executemany(
+                'UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                [(at, self.name, key) for key, at in touched.items()]
+            )
+        swept = conn.execute(
+            'DELETE FROM cache_entries WHERE namespace = ? AND purge_at < ?', (self.name, now)
+        ).rowcount
+        order = 'accessed_at' if self.eviction == LRU else 'stored_at'
+        evicted = conn.execute(
+            f'DELETE FROM cache_entries WHERE namespace = ? AND key IN ('
+            f'SELECT key FROM cache_entries WHERE namespace = ? ORDER BY {order} DESC LIMIT -1 OFFSET ?)',
+            (self.name, self.name, self.max_entries)
+        ).rowcount
+        return swept, evicted
+
+    def after_sweep(self, swept, evicted):
+        if swept or evicted:
+            # Memory may still hold rows just removed; start it over rather than track them
+            self.memory.clear()
+        self.swept += swept
+        self.evicted += evicted
+
+    def adopt(self, table, key_col, value_col, time_col):
+        """Move rows from a pre-namespace cache table into this namespace, then drop the table.
+
+        `value_col` is a column holding JSON, or a tuple of columns whose values become one
+        JSON object. A table without these columns is left for an adopt() with another layout.
+        """
+        value_cols = value_col if isinstance(value_col, tuple) else (value_col,)
+        try:
+            with get_db(self.store.db_path) as conn:
+                if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+                    return 0
+                columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+                if not columns.issuperset((key_col, time_col) + value_cols):
+                    lg.debug(f"{table} has columns {sorted(columns)}, not the ones asked for; leaving it")
+                    return 0
+                rows = conn.execute(f'SELECT {key_col}, {time_col}, {", ".join(value_cols)} FROM {table}').fetchall()
+                entries = []
+                for key, stamp, *values in rows:
+                    try:
+                        if isinstance(value_col, tuple):
+                            value = json.dumps(dict(zip(value_cols, values)))
+                        else:
+                            value = values[0]
+                            json.loads(value)
+                        stored_at = _timestamp(stamp)
+                    except (TypeError, ValueError) as e:
+                        lg.warning(f"Dropping unreadable {table} row for {key}: {e}")
+                        continue
+                    expires_at = self.expiry(stored_at)
+                    entries.append((self.name, key, value, stored_at, expires_at, expires_at + self.retain, stored_at))
+                conn.executemany(
+                    'INSERT OR IGNORE INTO cache_entries '
+                    '(namespace, key, value, stored_at, expires_at, purge_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    entries
+                )
+                conn.execute(f'DROP TABLE {table}')
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            lg.warning(f"Could not move {table} into cache namespace {self.name}: {e}")
+            return 0
+        lg.info(f"Moved {len(entries)} rows from {table} into cache namespace {self.name}")
+        return len(entries)
+
+    def stats(self):
+        return dict(self.memory.stats(), swept=self.swept, evicted=self.evicted, max_entries=self.max_entries)
+
+
+class NegativeCache:
+    """Remembers lookups known to come back empty so they are skipped until re-checked.
+
+    `ttls` maps a kind of lookup (e.g. "news", "youtube") to how long its empty answers
+    are trusted. Entries live in their own namespace and are swept like any other.
+    """
+
+    def __init__(self, store, ttls, name="negative", max_entries=1000):
+        self.ttls = dict(ttls)
+        self.namespace = store.namespace(name, max(self.ttls.values()), max_entries=max_entries, memory_size=256)
+
+    def hit(self, kind, key):
+        """Return the recorded reason if `key` is known to be empty for `kind`, else None."""
+        return self.namespace.fresh(f"{kind}:{key}")
+
+    async def ahit(self, kind, key):
+        return await self.namespace.afresh(f"{kind}:{key}")
+
+    def remember(self, kind, key, reason="empty"):
+        self.namespace.put(f"{kind}:{key}", reason, ttl=self.ttls[kind])
+        lg.info(f"Skipping {kind} lookups for {key} for {self.ttls[kind] / 3600:.0f}h ({reason})")
+
+    def forget(self, kind, key):
+        self.namespace.delete(f"{kind}:{key}")
+
+    def stats(self):
+        return self.namespace.stats()
+
+
+class CacheStore:
+    """Namespaced cache in one SQLite table, swept in the background.
+
+    Every namespace declares its own TTL, retention, eviction policy and size bound,
+    so the database never grows past the sum of those bounds and the cost of a sweep
+    is bounded by the number of rows it removes.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = database(db_path)
+        self.namespaces = {}
+        self._extra_sweeps = []
+        self._sweeper = None
+
+    def namespace(self, name, ttl, **options):
+        if name not in self.namespaces:
+            self.namespaces[name] = Namespace(self, name, ttl, **options)
+        return self.namespaces[name]
+
+    def discard(self, table):
+        """Drop a pre-namespace cache table no adopt() could convert; its rows are refetched instead."""
+        with get_db(self.db_path) as conn:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+                conn.execute(f'DROP TABLE {table}')
+                conn.commit()
+                lg.info(f"Dropped legacy cache table {table}")
+
+    def on_sweep(self, func):
+        """Run `func()` on every sweep, for caches that keep their own tables."""
+        self._extra_sweeps.append(func)
+
+    @staticmethod
+    def _sweep_rows(conn, now, touched):
+        removed = {namespace: namespace.sweep(conn, now, reads) for namespace, reads in touched.items()}
+        # Leases of processes that died mid-refresh
+        conn.execute('DELETE FROM cache_leases WHERE expires_at < ?', (now,))
+        return removed
+
+    def sweep(self):
+        with get_db(self.db_path) as conn:
+            removed = self._sweep_rows(conn, *self._sweep_args())
+            conn.commit()
+        return self._finish_sweep(removed)
+
+    async def asweep(self):
+        """sweep() for coroutines: the deletes run on the database's writer task."""
+        return self._finish_sweep(await self.db.write(self._sweep_rows, *self._sweep_args()))
+
+    def _sweep_args(self):
+        return datetime.now(UTC).timestamp(), {ns: ns.take_touched() for ns in self.namespaces.values()}
+
+    def _finish_sweep(self, removed):
+        swept = evicted = 0
+        for namespace, (ns_swept, ns_evicted) in removed.items():
+            namespace.after_sweep(ns_swept, ns_evicted)
+            swept += ns_swept
+            evicted += ns_evicted
+        for func in self._extra_sweeps:
+            try:
+                func()
+            except Exception as e:
+                lg.error(f"Cache sweep hook {getattr(func, '__name__', func)} failed: {e}")
+        if swept or evicted:
+            lg.info(f"Cache sweep removed {swept} expired and {evicted} over-limit entries")
+        return swept, evicted
+
+    async def _sweep_forever(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.asweep()
+            except Exception as e:
+                lg.error(f"Cache sweep failed: {e}")
+
+    def start_sweeper(self, interval=300):
+        """Start the background sweep task (once); call from a running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever(interval))
+        return self._sweeper
+
+    def stop_sweeper(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    def stats(self):
+        return {name: namespace.stats() for name, namespace in self.namespaces.items()}
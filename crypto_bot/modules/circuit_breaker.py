@@ -0,0 +1,121 @@
+# c:\CryptoBot\crypto_bot\modules\circuit_breaker.py
+import logging
+import time
+
+lg = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider or resource whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing.
+
+    After `failure_threshold` failures in a row the circuit opens and calls are refused
+    without touching the network. Once `reset_timeout` has passed a single probe is let
+    through: success closes the circuit, failure reopens it with the timeout doubled
+    (up to `max_reset_timeout`) so dead endpoints are probed less and less often.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=60, max_reset_timeout=6 * 3600):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+
+    def allow(self, now=None):
+        """Return True if a call may go out now (claims the probe slot when half-open)."""
+        now = time.monotonic() if now is None else now
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self.probe_started = None
+        # Half-open: one probe at a time; a probe that never reported back is replaced
+        if self.probe_started is None or now - self.probe_started >= self.reset_timeout:
+            self.probe_started = now
+            lg.info(f"Circuit {self.name} half-open, probing")
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            lg.info(f"Circuit {self.name} closed after successful probe")
+        self.state = CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self.probe_started = None
+
+    def record_failure(self, now=None):
+        """Count a failure; returns True if the circuit is (now) open."""
+        now = time.monotonic() if now is None else now
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open(now)
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._open(now)
+        return self.state == OPEN
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        self.probe_started = None
+        lg.warning(f"Circuit {self.name} open after {self.failures} failures, retrying in {self.reset_timeout:.0f}s")
+
+
+class BreakerBoard:
+    """Breakers per provider and per provider resource (e.g. one CoinGecko coin id).
+
+    A call needs both its provider and its resource circuit to allow it. Provider
+    breakers catch outages; resource breakers isolate ids that can never resolve so
+    they stop burning retries every cycle without blocking the rest of the provider.
+    """
+
+    def __init__(self, provider_threshold=5, resource_threshold=2, reset_timeout=60, max_reset_timeout=6 * 3600):
+        self.provider_threshold = provider_threshold
+        self.resource_threshold = resource_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._breakers = {}
+
+    def get(self, provider, resource=None):
+        key = (provider, resource)
+        if key not in self._breakers:
+            name = f"{provider}:{resource}" if resource else provider
+            threshold = self.resource_threshold if resource else self.provider_threshold
+            self._breakers[key] = CircuitBreaker(name, threshold, self.reset_timeout, self.max_reset_timeout)
+        return self._breakers[key]
+
+    def _chain(self, provider, resource):
+        return [self.get(provider)] + ([self.get(provider, resource)] if resource else [])
+
+    def check(self, provider, resource=None):
+        """Raise CircuitOpenError unless both circuits allow a call."""
+        for breaker in self._chain(provider, resource):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit {breaker.name} is {breaker.state}")
+
+    def success(self, provider, resource=None):
+        for breaker in self._chain(provider, resource):
+            breaker.record_success()
+
+    def failure(self, provider, resource=None):
+        """Record a failure on both circuits; returns True if either is now open."""
+        return any([breaker.record_failure() for breaker in self._chain(provider, resource)])
+
+    def status(self):
+        return {breaker.name: breaker.state for breaker in self._breakers.values()}
+
+
+breakers = BreakerBoard()
@@ -1,39 +1,53 @@
 # c:\CryptoBot\crypto_bot\modules\coin_data.py
 import logging
-import aiohttp
+
+from .api_endpoints import base_url
+from .coingecko_client import CoinGeckoClient
+from .market_snapshot import acached_markets
 
 lg = logging.getLogger(__name__)
 
-async def fetch_all_data(coin_ids, session):
+# Takes from the process-wide CoinGecko budget and circuit breaker like every other caller
+coingecko = CoinGeckoClient(base_url=base_url("coingecko"))
+
+async def fetch_all_data(coin_ids, session, markets=None):
     """
     Fetch price data for the given coin IDs from CoinGecko API.
+
+    With `markets` (the namespace shared with the other bots, see market_snapshot),
+    coins one of them fetched in the last few minutes are read from it instead.
     """
+    records = await acached_markets(markets, coin_ids) if markets else {}
+    shared = {
+        coin_id: {"id": coin_id, "price": record["price"], "percent_change_24h": round(record["price_change_24h"], 2)}
+        for coin_id, record in records.items()
+    }
+    missing = [coin_id for coin_id in coin_ids if coin_id not in shared]
+    if not missing:
+        lg.info(f"Using shared market data for coins: {coin_ids}")
+        return [shared[coin_id] for coin_id in coin_ids]
     try:
-        url = "https://api.coingecko.com/api/v3/simple/price"
         params = {
-            "ids": ",".join(coin_ids),
+            "ids": ",".join(missing),
             "vs_currencies": "usd",
             "include_24hr_change": "true"
         }
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                lg.error(f"Failed to fetch coin data: HTTP {response.status}")
-                return []
-
-            data = await response.json()
-            result = []
-            for coin_id in coin_ids:
-                if coin_id in data:
-                    coin_data = {
-                        "id": coin_id,
-                        "price": data[coin_id]["usd"],
-                        "percent_change_24h": round(data[coin_id]["usd_24h_change"], 2)
-                    }
-                    result.append(coin_data)
-                else:
-                    lg.warning(f"No data found for coin: {coin_id}")
-            lg.info(f"Fetched data for coins: {coin_ids}")
-            return result
+        data = await coingecko.get("simple/price", session, params=params, max_attempts=2)
+        result = []
+        for coin_id in coin_ids:
+            if coin_id in shared:
+                result.append(shared[coin_id])
+            elif coin_id in data:
+                coin_data = {
+                    "id": coin_id,
+                    "price": data[coin_id]["usd"],
+                    "percent_change_24h": round(data[coin_id]["usd_24h_change"], 2)
+                }
+                result.append(coin_data)
+            else:
+                lg.warning(f"No data found for coin: {coin_id}")
+        lg.info(f"Fetched data for coins: {coin_ids}")
+        return result
 
     except Exception as e:
         lg.error(f"Error fetching coin data: {e}")
@@ -48,4 +62,4 @@ async def fetch_all_data(coin_ids, session):
             "algorand": {"id": "algorand", "price": 0.22, "percent_change_24h": 0.52},
             "casper": {"id": "casper", "price": 0.02, "percent_change_24h": -1.92},
         }
-        return [mock_data[coin_id] for coin_id in coin_ids if coin_id in mock_data]
\ No newline at end of file
+        return [shared.get(coin_id) or mock_data[coin_id] for coin_id in coin_ids if coin_id in shared or coin_id in mock_data]
\ No newline at end of file
@@ -0,0 +1,134 @@
+# c:\CryptoBot\crypto_bot\modules\coin_store.py
+import json
+import logging
+import zlib
+from datetime import datetime, UTC
+
+from .memory_cache import LRUCache
+from .utils import get_db
+
+lg = logging.getLogger(__name__)
+
+# Fields of a CoinGecko /coins/{id} payload anything in the bot reads; the rest of the
+# ~25 KB document (localized descriptions, tickers, platform maps...) is never stored.
+COIN_INFO_FIELDS = (
+    "id", "symbol", "name",
+    "market_data.current_price.usd",
+    "market_data.price_change_percentage_24h",
+    "market_data.total_volume.usd",
+    "market_data.market_cap.usd",
+    "community_data.twitter_followers",
+    "developer_data.code_additions_deletions_4_weeks",
+    "description.en",
+)
+
+
+def pack(value):
+    """Encode a JSON-compatible value as compact, zlib-compressed bytes."""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def unpack(blob):
+    """Decode bytes written by pack(); plain JSON text from older rows is accepted too."""
+    if isinstance(blob, (bytes, memoryview)):
+        return json.loads(zlib.decompress(blob))
+    return json.loads(blob)
+
+
+def project(payload, fields):
+    """Keep only the dotted `fields` paths of `payload`; a path ending on a dict keeps all of it."""
+    if not fields:
+        return payload
+    result = {}
+    for field in fields:
+        source, target = payload, result
+        parts = field.split(".")
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    return result
+
+
+def init_coin_store(db_path):
+    """Create the per-coin payload table if needed."""
+    with get_db(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS coin_payloads (
+                kind TEXT NOT NULL,
+                coin_id TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (kind, coin_id)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+
+
+class CoinStore:
+    """Per-coin payload store: one projected, compressed row per coin, loaded on demand.
+
+    Reading a coin touches only its own row, so cost stays flat as the tracked-coin
+    list grows; the last `memory_size` decoded coins are kept in memory. Payloads are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, db_path, kind, fields=None, memory_size=32):
+        self.db_path = db_path
+        self.kind = kind
+        self.fields = fields
+        self.memory = LRUCache(memory_size, ttl=3600, name=f"coin_store:{kind}")
+
+    def get(self, coin_id, default=None):
+        payload = self.memory.get(coin_id)
+        if payload is not None:
+            return payload
+        with get_db(self.db_path) as conn:
+            row = conn.execute(
+                'SELECT payload FROM coin_payloads WHERE kind = ? AND coin_id = ?', (self.kind, coin_id)
+            ).fetchone()
+        if not row:
+            return default
+        payload = unpack(row[0])
+        self.memory.put(coin_id, payload)
+        return payload
+
+    def put_many(self, payloads):
+        """Store {coin_id: payload} after projecting each payload to `fields`."""
+        now = datetime.now(UTC).timestamp()
+        rows = []
+        for coin_id, payload in payloads.items():
+            payload = project(payload, self.fields)
+            self.memory.put(coin_id, payload)
+            rows.append((self.kind, coin_id, pack(payload), now))
+        with get_db(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO coin_payloads (kind, coin_id, payload, updated) VALUES (?, ?, ?, ?)', rows
+            )
+            conn.commit()
+        return len(rows)
+
+    def put(self, coin_id, payload):
+        self.put_many({coin_id: payload})
+
+    def ids(self):
+        with get_db(self.db_path) as conn:
+            return [row[0] for row in conn.execute(
+                'SELECT coin_id FROM coin_payloads WHERE kind = ? ORDER BY coin_id', (self.kind,)
+            )]
+
+    def import_json(self, path):
+        """Load a whole-document {coin_id: payload} JSON file into the store (one parse, once)."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        data.pop("date", None)
+        count = self.put_many({coin_id: payload for coin_id, payload in data.items() if isinstance(payload, dict)})
+        lg.info(f"Imported {count} {self.kind} payloads from {path}")
+        return count
+
+    def stats(self):
+        return self.memory.stats()
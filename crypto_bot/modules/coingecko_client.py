@@ -0,0 +1,111 @@
+# c:\CryptoBot\crypto_bot\modules\coingecko_client.py
+import asyncio
+import logging
+import aiohttp
+
+from .circuit_breaker import breakers
+from .rate_limiter import provider_limiter
+
+lg = logging.getLogger(__name__)
+
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+
+# Budget cost of each endpoint family. The full coin payload with community and
+# developer data is by far the heaviest call we make, so it is charged double.
+ENDPOINT_WEIGHTS = {
+    "coins/markets": 1,
+    "coins/{id}": 2,
+    "coins/{id}/history": 1,
+    "coins/{id}/market_chart/range": 1,
+    "simple/price": 1,
+}
+
+# Path segments under /coins that are endpoints rather than coin ids
+_COINS_COLLECTIONS = {"markets", "list", "categories"}
+
+
+def endpoint_key(path):
+    """Map a concrete path (e.g. coins/ripple/history) to its ENDPOINT_WEIGHTS key."""
+    parts = path.strip("/").split("?")[0].split("/")
+    if len(parts) >= 2 and parts[0] == "coins" and parts[1] not in _COINS_COLLECTIONS:
+        parts[1] = "{id}"
+    return "/".join(parts)
+
+
+class NotFoundError(ValueError):
+    """CoinGecko does not know this coin/path; retrying will not help."""
+
+
+class CoinGeckoClient:
+    """Single CoinGecko entry point shared by every coroutine in the process."""
+
+    def __init__(self, calls_per_minute=30, max_retries=5, backoff=15, timeout=10, base_url=COINGECKO_API_URL, cache=None):
+        # Shared adaptive budget: starts at calls_per_minute and follows 429s/rate headers
+        self.bucket = provider_limiter("coingecko", calls_per_minute)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/")
+        # Optional HttpCache; fresh hits skip the budget, stale ones are revalidated
+        self.cache = cache
+        # Optional NegativeCache; paths CoinGecko answered 404 for are not asked again until it expires
+        self.negative = None
+
+    def weight_for(self, path):
+        return ENDPOINT_WEIGHTS.get(endpoint_key(path), 1)
+
+    async def _request(self, url, session, params):
+        if self.cache:
+            response = await self.cache.get(session, url, params=params, timeout=self.timeout)
+            return response.status, response.headers, response.data
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            if response.status == 429:
+                return response.status, response.headers, None
+            return response.status, response.headers, await response.json()
+
+    async def get(self, path, session, params=None, max_attempts=None):
+        """GET a CoinGecko endpoint, taking from the shared budget before every attempt.
+
+        Raises CircuitOpenError without a request while CoinGecko or this path is
+        failing, so callers can fall back to their cached data at once. A 404 raises
+        NotFoundError straight away, and again without a request while it is remembered.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        resource = path.strip("/")
+        weight = self.weight_for(path)
+        attempts = max_attempts or self.max_retries
+        if self.cache:
+            data = await self.cache.fresh(url, params)
+            if data is not None:
+                return data
+        if self.negative and await self.negative.ahit("coingecko", resource):
+            raise NotFoundError(f"{resource} is known to be missing on CoinGecko")
+        breakers.check("coingecko", resource)
+        for attempt in range(attempts):
+            await self.bucket.acquire(weight)
+            try:
+                status, headers, data = await self._request(url, session, params)
+                if status == 429:
+                    lg.warning(f"CoinGecko rate limit hit for {url}")
+                    self.bucket.on_throttle(headers)
+                    continue
+                self.bucket.on_success(headers)
+                if status == 404:
+                    # An unknown coin id is an answer, not an outage: no breaker failure, no retries
+                    if self.negative:
+                        self.negative.remember("coingecko", resource, "not found")
+                    raise NotFoundError(f"{url} not found on CoinGecko")
+                if not data or (isinstance(data, dict) and 'error' in data):
+                    error = data.get('error', 'No data') if isinstance(data, dict) else 'No data'
+                    raise ValueError(f"Invalid response from {url}: {error}")
+                breakers.success("coingecko", resource)
+                return data
+            except NotFoundError:
+                raise
+            except Exception as e:
+                lg.error(f"Error fetching {url} attempt {attempt + 1}: {type(e).__name__} - {str(e)}")
+                # Stop retrying as soon as the circuit opens instead of sitting out the full backoff
+                if breakers.failure("coingecko", resource) or attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt * self.backoff)
+        raise ValueError(f"Failed to fetch {url} after {attempts} attempts")
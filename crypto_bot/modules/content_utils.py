@@ -3,9 +3,46 @@ import logging
 from datetime import datetime
 import discord
 
+from .post_fragments import fragments
+
 lg = logging.getLogger(__name__)
 
 
+def _coin_source(coin, news_dict, santiment_metrics=None):
+    """The fields a coin's fragments are rendered from; their hash keys the rendered text."""
+    news = (news_dict or {}).get(coin['id'])
+    return {
+        "coin": coin,
+        "tx_volume": (santiment_metrics or {}).get(coin['id'], {}).get("transaction_volume", 0),
+        "news": news[0] if news else None
+    }
+
+
+def _coin_post(source):
+    coin, news = source['coin'], source['news']
+    change = coin['percent_change_24h']
+    trend = "📈" if change >= 0 else "📉"
+    post = (
+        f"{coin['id'].replace('-', ' ').upper()}: ${coin['price']} ({change}% 24h) {trend}\n"
+        f"Tx Volume: {source['tx_volume']}M\n"
+        f"Top Project: N/A"
+    )
+    if news:
+        post += f"\nNews: {news['title']} {news['url']}\n#{coin['id'].replace('-', '').upper()}"
+    return post
+
+
+def _coin_embed_fields(source):
+    """(name, value) pairs for one coin's embed fields."""
+    coin, news = source['coin'], source['news']
+    change = coin['percent_change_24h']
+    trend = "📈" if change >= 0 else "📉"
+    fields = [(f"{coin['id'].replace('-', ' ').upper()} {trend}", f"Price: ${coin['price']} ({change}% 24h)")]
+    if news:
+        fields.append(("News", f"[{news['title']}]({news['url']})"))
+    return fields
+
+
 def create_thread_content(coins_data, news_dict, youtube_videos, santiment_metrics):
     """
     Create thread content for posting to X.
@@ -16,19 +53,9 @@ def create_thread_content(coins_data, news_dict, youtube_videos, santiment_metri
         posts = [f"🚀 Crypto Market Update ({current_date})! 📈 Latest on top altcoins: #Crypto #Altcoins"]
 
         # Add coin data
+        # Coins whose data and news are unchanged reuse the text rendered on an earlier run
         for coin in coins_data:
-            change = coin['percent_change_24h']
-            trend = "📈" if change >= 0 else "📉"
-            tx_volume = santiment_metrics.get(coin['id'], {}).get("transaction_volume", 0)
-            post = (
-                f"{coin['id'].replace('-', ' ').upper()}: ${coin['price']} ({change}% 24h) {trend}\n"
-                f"Tx Volume: {tx_volume}M\n"
-                f"Top Project: N/A"
-            )
-            if coin['id'] in news_dict and news_dict[coin['id']]:
-                news = news_dict[coin['id']][0]
-                post += f"\nNews: {news['title']} {news['url']}\n#{coin['id'].replace('-', '').upper()}"
-            posts.append(post)
+            posts.append(fragments.render("thread_coin", _coin_source(coin, news_dict, santiment_metrics), _coin_post))
 
         # Add YouTube videos
         if youtube_videos:
@@ -55,20 +82,8 @@ async def post_discord_update(channel, coins_data, news_dict, youtube_videos):
         embed = discord.Embed(title="🚀 Crypto Market Update", color=0x00ff00, timestamp=datetime.utcnow())
 
         for coin in coins_data:
-            change = coin['percent_change_24h']
-            trend = "📈" if change >= 0 else "📉"
-            embed.add_field(
-                name=f"{coin['id'].replace('-', ' ').upper()} {trend}",
-                value=f"Price: ${coin['price']} ({change}% 24h)",
-                inline=False
-            )
-            if coin['id'] in news_dict and news_dict[coin['id']]:
-                news = news_dict[coin['id']][0]
-                embed.add_field(
-                    name="News",
-                    value=f"[{news['title']}]({news['url']})",
-                    inline=False
-                )
+            for name, value in fragments.render("embed_coin", _coin_source(coin, news_dict), _coin_embed_fields):
+                embed.add_field(name=name, value=value, inline=False)
 
         if youtube_videos:
             embed.add_field(
@@ -1,8 +1,10 @@
 # c:\CryptoBot\crypto_bot\modules\database_utils.py
-import sqlite3
 import logging
 import os
 
+from .schema import migrate
+from .utils import get_db
+
 lg = logging.getLogger(__name__)
 
 class DatabaseManager:
@@ -12,19 +14,10 @@ class DatabaseManager:
         self._populate_coins()
 
     def _create_tables(self):
-        """Create the necessary tables in the database."""
+        """Create or upgrade the tables in the database (see schema.migrate)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS coins (
-                        id TEXT PRIMARY KEY,
-                        name TEXT,
-                        symbol TEXT
-                    )
-                ''')
-                conn.commit()
-                lg.info(f"Created tables in {self.db_path}")
+            version = migrate(self.db_path)
+            lg.info(f"Database {self.db_path} is at schema version {version}")
         except Exception as e:
             lg.error(f"Error creating tables: {e}")
 
@@ -41,9 +34,12 @@ class DatabaseManager:
                 ("algorand", "Algorand", "ALGO"),
                 ("casper", "Casper", "CSPR"),
             ]
-            with sqlite3.connect(self.db_path) as conn:
+            with get_db(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.executemany("INSERT OR IGNORE INTO coins (id, name, symbol) VALUES (?, ?, ?)", coins)
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO coins (id, name, symbol, rank) VALUES (?, ?, ?, ?)",
+                    [(coin_id, name, symbol, rank) for rank, (coin_id, name, symbol) in enumerate(coins, 1)]
+                )
                 conn.commit()
                 lg.info("Populated coins table with initial data")
         except Exception as e:
@@ -52,9 +48,9 @@ class DatabaseManager:
     def get_top_coins(self):
         """Retrieve the list of coins to track."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_db(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT id, name, symbol FROM coins")
+                cursor.execute("SELECT id, name, symbol FROM coins ORDER BY rank")
                 coins = [{"id": row[0], "name": row[1], "symbol": row[2]} for row in cursor.fetchall()]
                 return coins
         except Exception as e:
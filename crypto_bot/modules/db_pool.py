@@ -0,0 +1,100 @@
+# c:\CryptoBot\crypto_bot\modules\db_pool.py
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+lg = logging.getLogger(__name__)
+
+# Seconds a connection waits for another process's write lock before "database is locked"
+BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 15))
+# Idle connections kept open per database file; extra concurrent callers get a short-lived one
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 4))
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE = 256
+
+
+class ConnectionPool:
+    """Reusable SQLite connections to one database file.
+
+    Connections are opened once in WAL mode with synchronous=NORMAL and a busy timeout,
+    so readers never wait for a writer and concurrent writers queue instead of failing;
+    keeping them open lets sqlite3 reuse its prepared statements across calls. Each
+    connection is lent to one caller at a time (from any thread) and anything the caller
+    left uncommitted is rolled back when it comes back, as closing it used to do.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}')
+        self.opened += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error as e:
+                lg.warning(f"Discarding connection to {self.db_path}: {e}")
+                conn.close()
+                conn = None
+            if conn is not None:
+                with self._lock:
+                    if len(self._idle) < self.size:
+                        self._idle.append(conn)
+                        conn = None
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        return {"db_path": self.db_path, "idle": len(self._idle), "opened": self.opened, "size": self.size}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool(db_path):
+    """The process-wide ConnectionPool for `db_path`."""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(db_path)
+        return _pools[key]
+
+
+def connection(db_path):
+    """Context manager lending a pooled connection to `db_path`."""
+    return pool(db_path).connection()
+
+
+def close_all():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for p in pools:
+        p.close()
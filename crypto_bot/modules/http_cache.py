@@ -0,0 +1,210 @@
+# c:\CryptoBot\crypto_bot\modules\http_cache.py
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, UTC
+
+import aiohttp
+from yarl import URL
+
+from .async_db import database, submit
+from .utils import get_db
+
+lg = logging.getLogger(__name__)
+
+# Query parameters that carry credentials; they are left out of cache keys so keys
+# never hold secrets and survive key rotation.
+SECRET_PARAMS = {"apiKey", "api_key", "key", "x_cg_demo_api_key", "x_cg_pro_api_key"}
+
+
+def init_http_cache(db_path):
+    """Create the HTTP response cache table if needed."""
+    with get_db(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fresh_until REAL NOT NULL,
+                body TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+
+
+def cache_key(url, params=None):
+    """Canonical key for a GET: the URL with sorted, credential-free query parameters."""
+    url = URL(url)
+    if params:
+        url = url.update_query({k: str(v) for k, v in params.items()})
+    query = sorted((k, v) for k, v in url.query.items() if k not in SECRET_PARAMS)
+    return str(url.with_query(query))
+
+
+def parse_cache_control(value):
+    """Return (max_age, no_store, no_cache) from a Cache-Control header value."""
+    max_age, no_store, no_cache = 0, False, False
+    for directive in (value or "").lower().split(","):
+        directive = directive.strip()
+        if directive == "no-store":
+            no_store = True
+        elif directive == "no-cache":
+            no_cache = True
+        elif directive.startswith("max-age="):
+            try:
+                max_age = max(0, int(directive.split("=", 1)[1]))
+            except ValueError:
+                pass
+    return max_age, no_store, no_cache
+
+
+class CachedResponse:
+    """Status, headers and decoded JSON body of a GET answered by HttpCache."""
+
+    def __init__(self, status, headers, data, source):
+        self.status = status
+        self.headers = headers
+        self.data = data
+        # "fresh" (no request made), "revalidated" (304), "network" (full body) or "error"
+        self.source = source
+
+
+class HttpCache:
+    """Conditional-request cache for JSON GETs, persisted in the bot database.
+
+    Responses carrying an ETag, Last-Modified or a Cache-Control max-age are stored.
+    While max-age holds they are served without a request; after that the stored
+    validators are sent back and a 304 reuses the stored body. Recently decoded bodies
+    are also kept in memory so a 304 skips the JSON parse. Returned data is shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, db_path, memory_size=256):
+        self.db_path = db_path
+        # Lookups run in the database's reader threads and stores go to its writer task
+        self.db = database(db_path)
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self.stats = {"fresh": 0, "revalidated": 0, "network": 0}
+
+    @staticmethod
+    def _select(conn, key):
+        return conn.execute(
+            "SELECT etag, last_modified, fresh_until, body, stored_at FROM http_cache WHERE cache_key = ?",
+            (key,)
+        ).fetchone()
+
+    async def _load(self, key):
+        return await self.db.read(self._select, key)
+
+    def _decode(self, key, row):
+        stored_at, body = row[4], row[3]
+        cached = self._memory.get(key)
+        if cached and cached[0] == stored_at:
+            self._memory.move_to_end(key)
+            return cached[1]
+        data = json.loads(body)
+        self._remember(key, stored_at, data)
+        return data
+
+    def _remember(self, key, stored_at, data):
+        self._memory[key] = (stored_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _prune_rows(conn, cutoff, max_entries):
+        removed = conn.execute("DELETE FROM http_cache WHERE fresh_until < ? AND stored_at < ?", (cutoff, cutoff)).rowcount
+        removed += conn.execute(
+            "DELETE FROM http_cache WHERE cache_key IN "
+            "(SELECT cache_key FROM http_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (max_entries,)
+        ).rowcount
+        if removed:
+            lg.debug(f"Pruned {removed} HTTP cache entries")
+        return removed
+
+    def prune(self, max_age=7 * 24 * 3600, max_entries=2000):
+        """Drop entries not refreshed for `max_age` seconds and keep at most `max_entries`.
+
+        Decoded bodies in memory need no clean-up: they are only used while their row exists.
+        """
+        return submit(self.db_path, self._prune_rows, datetime.now(UTC).timestamp() - max_age, max_entries)
+
+    async def fresh(self, url, params=None):
+        """Return the stored body if Cache-Control says it is still fresh, else None."""
+        key = cache_key(url, params)
+        row = await self._load(key)
+        if row and row[2] > datetime.now(UTC).timestamp():
+            self.stats["fresh"] += 1
+            lg.debug(f"HTTP cache fresh hit for {key}")
+            return self._decode(key, row)
+        return None
+
+    @staticmethod
+    def _revalidated(conn, fresh_until, etag, key):
+        conn.execute(
+            "UPDATE http_cache SET fresh_until = ?, etag = COALESCE(?, etag) WHERE cache_key = ?",
+            (fresh_until, etag, key)
+        )
+
+    @staticmethod
+    def _store(conn, key, etag, last_modified, fresh_until, body, stored_at):
+        conn.execute(
+            "INSERT OR REPLACE INTO http_cache (cache_key, etag, last_modified, fresh_until, body, stored_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, etag, last_modified, fresh_until, body, stored_at)
+        )
+
+    async def get(self, session, url, params=None, headers=None, timeout=10, limiter=None):
+        """GET `url`, revalidating any stored copy, and return a CachedResponse.
+
+        If `limiter` (an AdaptiveBucket) is given, network requests wait for it and
+        report their outcome back to it; fresh hits cost nothing.
+        """
+        key = cache_key(url, params)
+        now = datetime.now(UTC).timestamp()
+        row = await self._load(key)
+        if row and row[2] > now:
+            self.stats["fresh"] += 1
+            return CachedResponse(200, {}, self._decode(key, row), "fresh")
+
+        request_headers = dict(headers or {})
+        if row and row[0]:
+            request_headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            request_headers["If-Modified-Since"] = row[1]
+
+        if limiter:
+            await limiter.acquire()
+        async with session.get(url, params=params, headers=request_headers,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if limiter and response.status == 429:
+                limiter.on_throttle(response.headers)
+            elif limiter and response.status < 400:
+                limiter.on_success(response.headers)
+            max_age, no_store, no_cache = parse_cache_control(response.headers.get("Cache-Control"))
+            fresh_until = now + max_age if not no_cache else now
+
+            if response.status == 304 and row:
+                self.db.write(self._revalidated, fresh_until, response.headers.get("ETag"), key)
+                self.stats["revalidated"] += 1
+                lg.debug(f"HTTP cache revalidated {key} (304)")
+                return CachedResponse(200, response.headers, self._decode(key, row), "revalidated")
+
+            if response.status == 429:
+                return CachedResponse(429, response.headers, None, "error")
+            if response.status != 200:
+                return CachedResponse(response.status, response.headers, await response.json(), "error")
+
+            body = await response.text()
+            data = json.loads(body)
+            self.stats["network"] += 1
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if not no_store and (etag or last_modified or max_age):
+                self.db.write(self._store, key, etag, last_modified, fresh_until, body, now)
+                self._remember(key, now, data)
+            return CachedResponse(200, response.headers, data, "network")
@@ -0,0 +1,63 @@
+# c:\CryptoBot\crypto_bot\modules\http_session.py
+import asyncio
+import logging
+import aiohttp
+
+lg = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """Owns the one pooled aiohttp session every fetcher borrows.
+
+    Connections are kept alive between calls and DNS answers are cached, so only the
+    first request to a host pays for DNS, TCP and TLS setup. Fetchers must not close
+    the session they borrow; the bot closes it once on shutdown.
+    """
+
+    def __init__(self, limit=64, limit_per_host=8, dns_ttl=300, keepalive_timeout=60, timeout=30):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+        self._loop = None
+
+    def get(self):
+        """Return the shared session, creating it on first use in the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._loop = loop
+            lg.debug(f"Opened pooled HTTP session (limit={self.limit}, per host={self.limit_per_host})")
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            lg.info("Closed pooled HTTP session")
+        self._session = None
+        self._loop = None
+
+
+http_sessions = SessionManager()
+
+
+def get_session():
+    """Borrow the process-wide pooled session."""
+    return http_sessions.get()
+
+
+async def close_session():
+    """Close the process-wide pooled session (call once on shutdown)."""
+    await http_sessions.close()
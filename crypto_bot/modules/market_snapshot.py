@@ -0,0 +1,130 @@
+# c:\CryptoBot\crypto_bot\modules\market_snapshot.py
+import asyncio
+import logging
+import time
+from datetime import datetime, UTC
+
+lg = logging.getLogger(__name__)
+
+# Community/developer stats move slowly, so the heavy /coins/{id} payload is
+# refreshed on its own schedule instead of every posting cycle.
+COIN_DETAIL_TTL = 6 * 3600
+# Per-coin market records in the shared "markets" namespace are reused by every bot
+# process for this long
+MARKET_TTL = 300
+
+
+def market_record(coin):
+    """The snapshot fields of one /coins/markets item, or None if CoinGecko has no price for it."""
+    if coin.get("current_price") is None:
+        return None
+    return {
+        "symbol": coin.get("symbol"),
+        "price": coin["current_price"],
+        "price_change_24h": coin.get("price_change_percentage_24h") or 0,
+        "volume": coin.get("total_volume") or 0,
+        "market_cap": coin.get("market_cap") or 0
+    }
+
+
+async def fetch_market_snapshot(client, session, coin_ids):
+    """Fetch price, 24h change, volume and market cap for all coins in one /coins/markets call."""
+    data = await client.get(
+        "coins/markets",
+        session,
+        params={
+            "vs_currency": "usd",
+            "ids": ",".join(coin_ids),
+            "per_page": len(coin_ids),
+            "page": 1,
+            "sparkline": "false",
+            "price_change_percentage": "24h"
+        }
+    )
+    snapshot = {}
+    listed = {coin.get("id") for coin in data}
+    for coin in data:
+        record = market_record(coin)
+        if record:
+            snapshot[coin["id"]] = record
+    missing = [coin_id for coin_id in coin_ids if coin_id not in snapshot]
+    if missing:
+        lg.warning(f"No market snapshot for {missing}")
+    if client.negative:
+        # Ids left out of the listing entirely are unknown to CoinGecko, not just unpriced
+        for coin_id in missing:
+            if coin_id not in listed:
+                client.negative.remember("coingecko", f"coins/{coin_id}", "not in /coins/markets")
+    lg.info(f"Fetched market snapshot for {len(snapshot)}/{len(coin_ids)} coins in one call")
+    return snapshot
+
+
+def cached_markets(cache, coin_ids):
+    """{coin_id: record} for the coins with a fresh entry in the shared markets namespace."""
+    snapshot = {}
+    for coin_id in coin_ids:
+        record = cache.fresh(coin_id)
+        if record:
+            snapshot[coin_id] = record
+    return snapshot
+
+
+async def acached_markets(cache, coin_ids):
+    """cached_markets() for coroutines: the lookups run in the database's reader threads."""
+    records = await asyncio.gather(*(cache.afresh(coin_id) for coin_id in coin_ids))
+    return {coin_id: record for coin_id, record in zip(coin_ids, records) if record}
+
+
+async def shared_market_snapshot(client, session, cache, coin_ids, wait=15, poll=0.5):
+    """fetch_market_snapshot through the markets namespace shared by every bot process.
+
+    Coins another process fetched within MARKET_TTL are read from `cache`; the rest are
+    fetched by whichever process holds the refresh lease while the others wait up to
+    `wait` seconds for its result.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        snapshot = await acached_markets(cache, coin_ids)
+        missing = [coin_id for coin_id in coin_ids if coin_id not in snapshot]
+        if not missing:
+            lg.info(f"Market snapshot for {len(coin_ids)} coins served from the shared cache")
+            return snapshot
+        if await cache.aacquire("refresh", lease=60) or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(poll)
+    try:
+        fetched = await fetch_market_snapshot(client, session, missing)
+    finally:
+        cache.release("refresh")
+    for coin_id, record in fetched.items():
+        cache.put(coin_id, record)
+    snapshot.update(fetched)
+    return snapshot
+
+
+async def fetch_coin_detail(client, session, cache, coin):
+    """Return the slow-moving community/developer fields for `coin`, refetched once its `cache` entry expires."""
+    entry = await cache.aget(coin)
+    if entry and entry.fresh:
+        return entry.value
+
+    try:
+        data = await client.get(
+            f"coins/{coin}",
+            session,
+            params={"localization": "false", "tickers": "false", "market_data": "false",
+                    "community_data": "true", "developer_data": "true", "sparkline": "false"},
+            max_attempts=2
+        )
+    except Exception as e:
+        if entry:
+            lg.warning(f"Detail refresh failed for {coin}, keeping data from {datetime.fromtimestamp(entry.stored_at, UTC)}: {e}")
+            return entry.value
+        raise
+
+    detail = {
+        "twitter_followers": (data.get("community_data") or {}).get("twitter_followers") or 0,
+        "code_changes_4w": (data.get("developer_data") or {}).get("code_additions_deletions_4_weeks", 0)
+    }
+    cache.put(coin, detail)
+    return detail
@@ -2,6 +2,8 @@ import logging
 import os
 import aiohttp
 
+from .rate_limiter import provider_limiter
+
 # Setup logging
 lg = logging.getLogger(__name__)
 
@@ -24,12 +26,17 @@ async def fetch_onchain_metrics(session, coin_symbol):
         'whale_activity': f'metrics/transactions/transfers_volume_to_whale_sum?a={coin_symbol}&api_key={glassnode_api_key}'
     }
 
+    limiter = provider_limiter("glassnode")
     for metric, endpoint in endpoints.items():
         try:
+            await limiter.acquire()
             async with session.get(base_url + endpoint) as response:
+                if response.status == 429:
+                    limiter.on_throttle(response.headers)
                 if response.status != 200:
                     lg.error(f'Glassnode API error for {coin_symbol} ({metric}): {response.status} - {await response.text()}')
                     continue
+                limiter.on_success(response.headers)
                 data = await response.json()
                 metrics[metric] = data[-1]['v'] if data else None
         except Exception as e:
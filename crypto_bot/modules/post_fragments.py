@@ -0,0 +1,41 @@
+# c:\CryptoBot\crypto_bot\modules\post_fragments.py
+import hashlib
+import json
+import logging
+
+from .memory_cache import LRUCache
+
+lg = logging.getLogger(__name__)
+
+
+def content_hash(value):
+    """Stable digest of a JSON-compatible value; dict key order does not matter."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FragmentCache:
+    """Rendered post fragments keyed by fragment kind and a hash of the data they were built from.
+
+    A coin whose data and news are unchanged since the last run hashes to the same key,
+    so its tweet, Discord block or embed field is reused instead of formatted again.
+    Builders must be pure functions of `source`.
+    """
+
+    def __init__(self, maxsize=256, ttl=24 * 3600):
+        self.memory = LRUCache(maxsize, ttl=ttl, name="post_fragments")
+
+    def render(self, kind, source, build):
+        key = (kind, content_hash(source))
+        fragment = self.memory.get(key)
+        if fragment is None:
+            fragment = build(source)
+            self.memory.put(key, fragment)
+        return fragment
+
+    def stats(self):
+        return self.memory.stats()
+
+
+# Shared by every output channel in the process
+fragments = FragmentCache()
@@ -0,0 +1,117 @@
+# c:\CryptoBot\crypto_bot\modules\post_index.py
+import hashlib
+import logging
+import math
+from datetime import datetime, UTC
+
+from .async_db import database
+
+lg = logging.getLogger(__name__)
+
+
+def record_posts(conn, post_hashes, coins, posted_at):
+    """Insert the hashes and coin ids of a thread posted at `posted_at`; the caller commits.
+
+    The tables are created by schema.migrate().
+    """
+    conn.executemany(
+        'INSERT OR IGNORE INTO post_hashes (post_hash, posted_at) VALUES (?, ?)',
+        [(post_hash, posted_at) for post_hash in post_hashes]
+    )
+    conn.executemany(
+        'INSERT OR IGNORE INTO thread_coins (posted_at, coin) VALUES (?, ?)',
+        [(posted_at, coin) for coin in coins]
+    )
+
+
+def expire_posts(conn, cutoff):
+    """Delete everything posted at or before `cutoff`; the caller commits.
+
+    Every bot shares these tables, so `cutoff` must be the shared retention
+    (thread_mgmt.RETENTION), not one bot's window; PostIndex applies that on read.
+    """
+    conn.execute('DELETE FROM post_hashes WHERE posted_at <= ?', (cutoff,))
+    conn.execute('DELETE FROM thread_coins WHERE posted_at <= ?', (cutoff,))
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings: no false negatives, about `error_rate` false positives at `capacity`."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class PostIndex:
+    """Which post hashes went out within the last `window` seconds, from any bot process.
+
+    Each check first pulls rows added since the last one (by any process) into an
+    in-memory bloom filter through the id index; hashes the filter has never seen are
+    new without touching the table, and possible repeats are confirmed with one indexed
+    lookup each. The filter is rebuilt from the window once it holds `capacity` hashes.
+    """
+
+    def __init__(self, db_path, window, capacity=10000):
+        self.db = database(db_path)
+        self.window = window
+        self.capacity = capacity
+        self._bloom = None
+        self._last_id = 0
+        self.stats = {"checked": 0, "filtered": 0, "confirmed": 0}
+
+    @staticmethod
+    def _rows_after(conn, last_id, cutoff):
+        return conn.execute(
+            'SELECT id, post_hash FROM post_hashes WHERE id > ? AND posted_at > ?', (last_id, cutoff)
+        ).fetchall()
+
+    @staticmethod
+    def _posted(conn, post_hashes, cutoff):
+        return {
+            post_hash for post_hash in post_hashes
+            if conn.execute(
+                'SELECT 1 FROM post_hashes WHERE post_hash = ? AND posted_at > ? LIMIT 1', (post_hash, cutoff)
+            ).fetchone()
+        }
+
+    async def seen(self, post_hashes):
+        """The subset of `post_hashes` posted within the window."""
+        cutoff = datetime.now(UTC).timestamp() - self.window
+        if self._bloom is None or self._bloom.count >= self.capacity:
+            self._bloom, self._last_id = BloomFilter(self.capacity), 0
+        for row_id, post_hash in await self.db.read(self._rows_after, self._last_id, cutoff):
+            self._bloom.add(post_hash)
+            self._last_id = max(self._last_id, row_id)
+        maybe = [post_hash for post_hash in post_hashes if post_hash in self._bloom]
+        self.stats["checked"] += len(post_hashes)
+        self.stats["filtered"] += len(post_hashes) - len(maybe)
+        if not maybe:
+            return set()
+        posted = await self.db.read(self._posted, maybe, cutoff)
+        self.stats["confirmed"] += len(posted)
+        return posted
+
+    async def last_coins(self):
+        """Coin ids of the most recently posted thread, if it went out within the window."""
+        cutoff = datetime.now(UTC).timestamp() - self.window
+        rows = await self.db.read(lambda conn: conn.execute(
+            'SELECT coin FROM thread_coins WHERE posted_at = '
+            '(SELECT MAX(posted_at) FROM thread_coins WHERE posted_at > ?)', (cutoff,)
+        ).fetchall())
+        return {row[0] for row in rows}
@@ -0,0 +1,56 @@
+# c:\CryptoBot\crypto_bot\modules\prewarm.py
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, UTC, timedelta
+
+lg = logging.getLogger(__name__)
+
+# Seconds before a posting slot at which its data starts being fetched
+PREWARM_LEAD = int(os.getenv("PREWARM_LEAD", 300))
+
+
+def next_daily_slot(now, hour, minute):
+    """Next UTC datetime at hour:minute strictly after `now`."""
+    slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return slot if slot > now else slot + timedelta(days=1)
+
+
+def next_aligned_slot(now, every_hours, minute):
+    """Next UTC datetime at `minute` past an hour divisible by `every_hours`, strictly after `now`."""
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    slot = day + timedelta(minutes=minute)
+    while slot <= now:
+        slot += timedelta(hours=every_hours)
+    return slot
+
+
+async def prewarm_until(slot, warm, lead=PREWARM_LEAD, name="post"):
+    """Sleep until `slot`, running `warm()` from `lead` seconds before it; returns what it produced.
+
+    The post at `slot` can then render from the warmed result (and from the caches the
+    warm-up filled) instead of fetching inline. If warming runs past the slot the post
+    waits for it rather than starting a second fetch; if it fails, None is returned and
+    the caller fetches as before. A slot that is already due is not warmed.
+    """
+    now = datetime.now(UTC)
+    if slot <= now:
+        return None
+    warm_at = slot - timedelta(seconds=lead)
+    if warm_at > now:
+        lg.info(f"Next {name} at {slot:%Y-%m-%d %H:%M} UTC, warming caches from {warm_at:%H:%M:%S}")
+        await asyncio.sleep((warm_at - now).total_seconds())
+
+    started = time.monotonic()
+    task = asyncio.ensure_future(warm())
+    await asyncio.sleep(max(0.0, (slot - datetime.now(UTC)).total_seconds()))
+    if not task.done():
+        lg.warning(f"Pre-warm for {name} still running at slot time, waiting for it")
+    try:
+        result = await task
+    except Exception as e:
+        lg.error(f"Pre-warm for {name} failed, fetching at post time instead: {e}")
+        return None
+    lg.info(f"Pre-warmed {name} in {time.monotonic() - started:.1f}s")
+    return result
@@ -0,0 +1,128 @@
+# c:\CryptoBot\crypto_bot\modules\price_history.py
+import logging
+from datetime import datetime, UTC, timedelta
+
+from .async_db import database
+
+lg = logging.getLogger(__name__)
+
+DAY = 86400
+
+
+def _day_start(day):
+    return int(datetime(day.year, day.month, day.day, tzinfo=UTC).timestamp())
+
+
+def _select_range(conn, coin, start_ts, end_ts):
+    # price_series (see schema) is keyed by (coin_id, ts), so this is one primary-key range scan
+    return conn.execute(
+        'SELECT ts, price, volume, market_cap FROM price_series WHERE coin_id = ? AND ts BETWEEN ? AND ? ORDER BY ts',
+        (coin, start_ts, end_ts)
+    ).fetchall()
+
+
+def _store_points(conn, rows):
+    conn.executemany(
+        'INSERT OR REPLACE INTO price_series (coin_id, ts, price, volume, market_cap) VALUES (?, ?, ?, ?, ?)',
+        rows
+    )
+
+
+async def load_price_history(db_path, coin, start_day, end_day):
+    """Return stored daily rows for `coin` between two dates (inclusive), oldest first."""
+    rows = await database(db_path).read(_select_range, coin, _day_start(start_day), _day_start(end_day))
+    return [
+        {'date': ts, 'price': price, 'volume': volume, 'market_cap': market_cap}
+        for ts, price, volume, market_cap in rows
+    ]
+
+
+async def missing_ranges(db_path, coin, start_day, end_day):
+    """Return contiguous (first, last) date ranges with no stored row for `coin`."""
+    rows = await database(db_path).read(_select_range, coin, _day_start(start_day), _day_start(end_day))
+    have = {row[0] for row in rows}
+    ranges = []
+    day = start_day
+    while day <= end_day:
+        if _day_start(day) not in have:
+            if ranges and ranges[-1][1] == day - timedelta(days=1):
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        day += timedelta(days=1)
+    return ranges
+
+
+def daily_rows_from_chart(chart):
+    """Collapse a market_chart/range payload to one row per UTC day, keyed by the day's start timestamp.
+
+    CoinGecko returns 5-minute, hourly or daily points depending on the span, so the
+    first point of each day is kept, which matches the 00:00 UTC snapshot /history serves.
+    """
+    volumes = {int(ts): v for ts, v in chart.get('total_volumes', [])}
+    caps = {int(ts): v for ts, v in chart.get('market_caps', [])}
+    rows = {}
+    for ts, price in chart.get('prices', []):
+        if price is None:
+            continue
+        day = int(ts // 1000) // DAY * DAY
+        if day not in rows:
+            rows[day] = (price, volumes.get(int(ts)), caps.get(int(ts)))
+    return rows
+
+
+async def ingest_price_history(client, session, db_path, coin, start_day, end_day):
+    """Fetch only the days missing from the local store, one range call per gap, and store them."""
+    gaps = await missing_ranges(db_path, coin, start_day, end_day)
+    for first, last in gaps:
+        try:
+            chart = await client.get(
+                f"coins/{coin}/market_chart/range",
+                session,
+                params={
+                    'vs_currency': 'usd',
+                    'from': _day_start(first),
+                    'to': _day_start(last + timedelta(days=1)) - 1
+                },
+                max_attempts=2
+            )
+        except Exception as e:
+            lg.error(f"Error fetching price history for {coin} {first} to {last}: {e}")
+            continue
+        rows = daily_rows_from_chart(chart)
+        # One bulk write per gap, queued on the database's writer task
+        await database(db_path).write(
+            _store_points,
+            [(coin, ts, price, volume, cap) for ts, (price, volume, cap) in rows.items()
+             if _day_start(first) <= ts <= _day_start(last)]
+        )
+        lg.info(f"Stored {len(rows)} days of price history for {coin} ({first} to {last})")
+    return len(gaps)
+
+
+async def fetch_price_history(client, session, db_path, coin, days):
+    """Return the last `days` complete days of history for `coin`, fetching only what is missing."""
+    end_day = datetime.now(UTC).date() - timedelta(days=1)
+    start_day = end_day - timedelta(days=days)
+    await ingest_price_history(client, session, db_path, coin, start_day, end_day)
+    historical_data = await load_price_history(db_path, coin, start_day, end_day)
+    missing = (end_day - start_day).days + 1 - len(historical_data)
+    lg.info(f"Historical data for {coin}: {len(historical_data)} days available, {missing} days missing")
+    return historical_data
+
+
+def price_averages(history, days=30):
+    """Average price over the last `days` days of `history` and over the `days` before that.
+
+    `history` is load_price_history() output; either average is None when its window
+    has no rows.
+    """
+    if not history:
+        return None, None
+    end = history[-1]['date']
+    recent = [row['price'] for row in history if row['date'] > end - days * DAY]
+    prior = [row['price'] for row in history if end - 2 * days * DAY < row['date'] <= end - days * DAY]
+    return (
+        sum(recent) / len(recent) if recent else None,
+        sum(prior) / len(prior) if prior else None
+    )
@@ -0,0 +1,190 @@
+# c:\CryptoBot\crypto_bot\modules\rate_limiter.py
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, UTC
+from email.utils import parsedate_to_datetime
+
+lg = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket shared by every coroutine that calls the same provider.
+
+    Waiters are served in FIFO order: the coroutine at the head of the queue holds
+    the lock while it sleeps for exactly the time its deficit needs to refill, so
+    concurrent callers never race on the count and never sleep longer than needed.
+    """
+
+    def __init__(self, rate, capacity, name="bucket"):
+        self.rate = float(rate)  # tokens per second
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.name = name
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def delay_for(self, weight, now=None):
+        """Seconds until `weight` tokens can be taken (0 if available now)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < weight:
+            wait = max(wait, (weight - self.tokens) / self.rate)
+        return wait
+
+    async def acquire(self, weight=1):
+        """Wait until `weight` tokens are available and take them.
+
+        A weight above the capacity could never be met; it waits for a full bucket and
+        empties it instead, so heavy endpoints still go through on small budgets.
+        """
+        weight = min(weight, self.capacity)
+        async with self._lock:
+            wait = self.delay_for(weight)
+            if wait > 0:
+                lg.info(f"{self.name} rate budget exhausted, waiting {wait:.2f} seconds...")
+                await asyncio.sleep(wait)
+                self._refill(time.monotonic())
+            self.tokens -= weight
+
+    def pause(self, seconds):
+        """Drain the bucket and block all callers for `seconds` (e.g. after a 429)."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.updated = max(self.updated, self.blocked_until)
+
+
+def per_minute_bucket(calls_per_minute, name, burst=None):
+    """Build a bucket that never exceeds `calls_per_minute` in any rolling 60 s window.
+
+    A bucket of capacity C refilling at r/s admits at most C + 60 * r calls per
+    minute, so the burst is carved out of the budget instead of added on top of it.
+    """
+    burst = burst if burst is not None else max(1, calls_per_minute // 4)
+    burst = min(burst, calls_per_minute)
+    rate = max(calls_per_minute - burst, 1) / 60
+    return TokenBucket(rate=rate, capacity=burst, name=name)
+
+
+# Starting budgets (calls per minute); override with <PROVIDER>_CALLS_PER_MINUTE.
+# They are ceilings: the adaptive buckets only slow down from them as responses come back.
+PROVIDER_LIMITS = {
+    "coingecko": 30,
+    "newsapi": 30,
+    "dappradar": 10,
+    "santiment": 30,
+    "glassnode": 10,
+    "lunarcrush": 10,
+    "x": 12,
+}
+
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def seconds_until(value, now=None):
+    """Interpret a reset/Retry-After value: delta seconds, epoch (s or ms) or an HTTP date."""
+    now = datetime.now(UTC).timestamp() if now is None else now
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
+    if number > 1e12:
+        number /= 1000
+    if number > 1e9:
+        return max(0.0, number - now)
+    return max(0.0, number)
+
+
+class AdaptiveBucket(TokenBucket):
+    """Token bucket that tunes its own rate from what the provider tells it.
+
+    The configured `calls_per_minute` is a ceiling: a 429 halves the rate and blocks
+    callers until Retry-After or the advertised reset, and successful calls raise it
+    additively back up to the configured rate, never past it. When a response carries
+    remaining/reset headers the rate is set to spread the remaining calls over the time
+    left in the window, so the quota is used up exactly when it resets.
+    """
+
+    def __init__(self, calls_per_minute, name, min_per_minute=1, burst=None):
+        burst = burst if burst is not None else max(1, calls_per_minute // 4)
+        burst = min(burst, calls_per_minute)
+        super().__init__(rate=max(calls_per_minute - burst, 1) / 60, capacity=burst, name=name)
+        self.min_rate = min_per_minute / 60
+        # The refill rate plus a full burst add up to calls_per_minute in any minute
+        self.max_rate = self.rate
+        self.step = self.rate * 0.05
+        self.throttled = 0
+
+    def _set_rate(self, rate, reason):
+        rate = min(self.max_rate, max(self.min_rate, rate))
+        if abs(rate - self.rate) * 60 >= 0.5:
+            lg.info(f"{self.name} rate {self.rate * 60:.1f} -> {rate * 60:.1f}/min ({reason})")
+        self._refill(time.monotonic())
+        self.rate = rate
+
+    def _window(self, headers):
+        remaining = _header(headers, "X-RateLimit-Remaining", "x-rate-limit-remaining", "RateLimit-Remaining")
+        reset = _header(headers, "X-RateLimit-Reset", "x-rate-limit-reset", "RateLimit-Reset")
+        if remaining is None or reset is None:
+            return None, None
+        try:
+            return float(remaining), seconds_until(reset)
+        except ValueError:
+            return None, None
+
+    def on_success(self, headers=None):
+        """Record a successful call and adapt the rate."""
+        remaining, reset_in = self._window(headers or {})
+        if remaining is not None and reset_in:
+            if remaining <= 0:
+                self.pause(reset_in)
+                return
+            self._set_rate(remaining / reset_in, f"{remaining:.0f} left for {reset_in:.0f}s")
+        elif self.rate < self.max_rate:
+            self._set_rate(self.rate + self.step, "no throttling")
+
+    def on_throttle(self, headers=None, default_wait=60):
+        """Record a 429: back off the rate and block until the provider's reset. Returns the wait."""
+        headers = headers or {}
+        self.throttled += 1
+        wait = seconds_until(_header(headers, "Retry-After"))
+        if wait is None:
+            _, wait = self._window(headers)
+        if wait is None:
+            wait = default_wait
+        self._set_rate(self.rate / 2, "429")
+        self.pause(wait)
+        lg.warning(f"{self.name} throttled, pausing all calls for {wait:.0f} seconds")
+        return wait
+
+
+_limiters = {}
+
+
+def provider_limiter(provider, calls_per_minute=None):
+    """Return the process-wide adaptive bucket for `provider`, creating it on first use."""
+    if provider not in _limiters:
+        env_limit = os.getenv(f"{provider.upper()}_CALLS_PER_MINUTE")
+        limit = int(env_limit) if env_limit else calls_per_minute or PROVIDER_LIMITS.get(provider, 30)
+        _limiters[provider] = AdaptiveBucket(limit, name=provider)
+    return _limiters[provider]
@@ -5,6 +5,9 @@ import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from .api_endpoints import base_url
+from .rate_limiter import provider_limiter
+
 load_dotenv()
 SANTIMENT_API_KEY = os.getenv('SANTIMENT_API_KEY')
 
@@ -30,13 +33,14 @@ async def fetch_santiment_metrics(coin_ids, session):
             "casper": "casper-network",
         }
 
+        limiter = provider_limiter("santiment")
         metrics = {}
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=1)
 
         for coin_id in coin_ids:
             slug = coin_slugs.get(coin_id, coin_id)
-            url = "https://api.santiment.net/graphql"
+            url = f"{base_url('santiment')}/graphql"
             query = """
             query($slug: String!, $from: DateTime!, $to: DateTime!) {
               getMetric(metric: "transaction_volume") {
@@ -63,12 +67,16 @@ async def fetch_santiment_metrics(coin_ids, session):
             }
             payload = {"query": query, "variables": variables}
 
+            await limiter.acquire()
             async with session.post(url, json=payload, headers=headers) as response:
+                if response.status == 429:
+                    limiter.on_throttle(response.headers)
                 if response.status != 200:
                     lg.warning(f"Failed to fetch Santiment metrics for {coin_id}: HTTP {response.status}")
                     metrics[coin_id] = {}
                     continue
 
+                limiter.on_success(response.headers)
                 data = await response.json()
                 timeseries = data.get("data", {}).get("getMetric", {}).get("timeseriesData", [])
                 if timeseries:
@@ -0,0 +1,183 @@
+# c:\CryptoBot\crypto_bot\modules\schema.py
+import json
+import logging
+import os
+import threading
+
+from .db_pool import connection
+
+lg = logging.getLogger(__name__)
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _primary_key(conn, table):
+    return [row[1] for row in sorted(conn.execute(f'PRAGMA table_info({table})'), key=lambda row: row[5]) if row[5]]
+
+
+def _thread_history(conn):
+    """One append-only thread_history, holding the threads every entry point used to keep its own way."""
+    tables = _tables(conn)
+    rows = []
+    if 'thread_history' in tables and 'data' in _columns(conn, 'thread_history'):
+        # modules/thread_mgmt kept the whole history as one JSON list at rowid 1
+        blob = conn.execute('SELECT data FROM thread_history WHERE rowid = 1').fetchone()
+        try:
+            entries = json.loads(blob[0]) if blob and blob[0] else []
+        except json.JSONDecodeError as e:
+            lg.error(f"Dropping unreadable thread_mgmt history: {e}")
+            entries = []
+        rows += [
+            (entry['timestamp'], json.dumps(entry.get('post_hashes', [])), json.dumps(entry.get('influencers', [])))
+            for entry in entries if isinstance(entry, dict) and 'timestamp' in entry
+        ]
+        conn.execute('DROP TABLE thread_history')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS thread_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp REAL NOT NULL,
+            post_hashes TEXT NOT NULL,
+            influencers TEXT
+        )
+    ''')
+    # The bots' own table is already keyed by timestamp; the others could hold the same
+    # thread many times, since saves used to insert the whole history again every cycle
+    if _primary_key(conn, 'thread_history') != ['timestamp']:
+        removed = conn.execute(
+            'DELETE FROM thread_history WHERE rowid NOT IN (SELECT MIN(rowid) FROM thread_history GROUP BY timestamp)'
+        ).rowcount
+        if removed:
+            lg.info(f"Removed {removed} duplicated thread_history rows")
+        conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_thread_history_timestamp ON thread_history (timestamp)')
+    if 'history' in tables:
+        # The table of the same shape modules/utils.init_db used to create
+        rows += conn.execute(
+            "SELECT timestamp, post_hashes, COALESCE(influencers, '[]') FROM history "
+            "WHERE timestamp IS NOT NULL AND post_hashes IS NOT NULL"
+        ).fetchall()
+        conn.execute('DROP TABLE history')
+    conn.executemany(
+        'INSERT OR IGNORE INTO thread_history (timestamp, post_hashes, influencers) VALUES (?, ?, ?)', rows
+    )
+
+
+def _post_index(conn):
+    """Posted hashes and coins for post_index, filled from the existing thread history."""
+    # AUTOINCREMENT ids never go backwards, so other processes' rows can be picked up by id
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS post_hashes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_hash TEXT NOT NULL,
+            posted_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS thread_coins (
+            posted_at REAL NOT NULL,
+            coin TEXT NOT NULL,
+            PRIMARY KEY (posted_at, coin)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(
+        'DELETE FROM post_hashes WHERE rowid NOT IN '
+        '(SELECT MIN(rowid) FROM post_hashes GROUP BY post_hash, posted_at)'
+    )
+    conn.execute('DROP INDEX IF EXISTS idx_post_hashes_hash')
+    conn.execute('CREATE UNIQUE INDEX idx_post_hashes_hash ON post_hashes (post_hash, posted_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_post_hashes_posted_at ON post_hashes (posted_at)')
+    rows = []
+    for timestamp, post_hashes in conn.execute('SELECT timestamp, post_hashes FROM thread_history').fetchall():
+        try:
+            rows += [(post_hash, timestamp) for post_hash in json.loads(post_hashes)]
+        except json.JSONDecodeError:
+            continue
+    conn.executemany('INSERT OR IGNORE INTO post_hashes (post_hash, posted_at) VALUES (?, ?)', rows)
+
+
+def _coins(conn):
+    """Ranked top_coins, the list the bots post about, next to DatabaseManager's own coins list."""
+    # The two lists name some coins differently (xdce-crowd-sale/xdc-network, ondo-finance/ondo),
+    # so they are kept apart rather than merged
+    conn.execute('CREATE TABLE IF NOT EXISTS top_coins (coin_id TEXT PRIMARY KEY, display_name TEXT, rank INTEGER)')
+    conn.execute('CREATE TABLE IF NOT EXISTS coins (id TEXT PRIMARY KEY, name TEXT, symbol TEXT, rank INTEGER)')
+    for table, added in (('top_coins', ['display_name TEXT', 'rank INTEGER']), ('coins', ['rank INTEGER'])):
+        # setup_db's top_coins has only coin_id and the original coins has no rank
+        columns = _columns(conn, table)
+        for column in added:
+            if column.split()[0] not in columns:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column}')
+        # Unranked rows keep their insertion order
+        conn.execute(f'UPDATE {table} SET rank = rowid WHERE rank IS NULL')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_rank ON {table} (rank)')
+
+
+def _price_series(conn):
+    """Price, volume and market cap points keyed by (coin_id, ts), replacing the per-day price_history."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS price_series (
+            coin_id TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            price REAL NOT NULL,
+            volume REAL,
+            market_cap REAL,
+            PRIMARY KEY (coin_id, ts)
+        ) WITHOUT ROWID
+    ''')
+    if 'price_history' in _tables(conn):
+        # Its days are UTC dates; each becomes the timestamp of that day's 00:00 UTC
+        moved = conn.execute(
+            "INSERT OR IGNORE INTO price_series (coin_id, ts, price, volume, market_cap) "
+            "SELECT coin_id, CAST(strftime('%s', day) AS INTEGER), price, volume, market_cap FROM price_history"
+        ).rowcount
+        conn.execute('DROP TABLE price_history')
+        lg.info(f"Moved {moved} price_history rows to price_series")
+
+
+# Applied in order; a database's PRAGMA user_version is the number already applied.
+# Append new steps, never edit or reorder released ones.
+MIGRATIONS = [
+    ("thread history", _thread_history),
+    ("post index", _post_index),
+    ("coins", _coins),
+    ("price series", _price_series),
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+
+def migrate(db_path):
+    """Bring `db_path` up to SCHEMA_VERSION; every entry point calls this before using its tables.
+
+    Each step runs in its own write transaction together with the version bump, so a
+    failed step leaves the database at the previous version, and processes starting
+    at the same time apply each step once.
+    """
+    key = os.path.abspath(db_path)
+    with _migrated_lock:
+        if key in _migrated:
+            return SCHEMA_VERSION
+        with connection(db_path) as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            while version < SCHEMA_VERSION:
+                conn.execute('BEGIN IMMEDIATE')
+                # Another process may have migrated while this one waited for the lock
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if version >= SCHEMA_VERSION:
+                    conn.rollback()
+                    break
+                name, step = MIGRATIONS[version]
+                step(conn)
+                conn.execute(f'PRAGMA user_version = {version + 1}')
+                conn.commit()
+                version += 1
+                lg.info(f"Migrated {db_path} to schema version {version} ({name})")
+        _migrated.add(key)
+    return version
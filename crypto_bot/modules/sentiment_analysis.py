@@ -2,6 +2,8 @@ import logging
 import os
 import aiohttp
 
+from .rate_limiter import provider_limiter
+
 # Setup logging
 lg = logging.getLogger(__name__)
 
@@ -26,11 +28,16 @@ async def fetch_sentiment_data(session, coin):
         'galaxy_score': 0
     }
 
+    limiter = provider_limiter("lunarcrush")
     try:
+        await limiter.acquire()
         async with session.get(url) as response:
+            if response.status == 429:
+                limiter.on_throttle(response.headers)
             if response.status != 200:
                 lg.error(f"LunarCrush API error for {coin}: {response.status} - {await response.text()}")
                 return sentiment_data
+            limiter.on_success(response.headers)
             data = await response.json()
             sentiment = data.get('sentiment', {})
             sentiment_data['bullish_percent'] = sentiment.get('bullish', 0)
@@ -0,0 +1,74 @@
+# c:\CryptoBot\crypto_bot\modules\single_flight.py
+import asyncio
+import functools
+import logging
+
+lg = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one in-flight fetch.
+
+    The first caller for a key starts the work; callers arriving before it finishes
+    await the same task and get the same result (or exception). Nothing is kept once
+    the task completes, so this never serves stale data - caching stays with the callers.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self.shared = 0
+
+    def start(self, key, func, *args, **kwargs):
+        """Start the fetch for `key` unless one is already running; returns its task without waiting."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    async def do(self, key, func, *args, **kwargs):
+        if key in self._calls:
+            self.shared += 1
+            lg.info(f"Joining in-flight {self.name} fetch for {key}")
+        task = self.start(key, func, *args, **kwargs)
+        # Shield the shared task so one caller being cancelled does not cancel it for the rest
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Background refreshes may have nobody awaiting them; log their failures here
+        if not task.cancelled() and task.exception():
+            lg.error(f"{self.name} fetch for {key} failed: {task.exception()}")
+
+    def in_flight(self):
+        return list(self._calls)
+
+
+def single_flight(name, key=None):
+    """Decorate a coroutine so concurrent calls with the same key share one execution.
+
+    `key` maps the call arguments to the request identity; by default it is the first
+    positional argument (coin id or query). Results are shared between callers, so they
+    must be treated as read-only. `func.start(...)` kicks off the same call in the
+    background without waiting for it.
+    """
+    def decorator(func):
+        flight = SingleFlight(name)
+
+        def call_key(*args, **kwargs):
+            return key(*args, **kwargs) if key else args[0]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await flight.do(call_key(*args, **kwargs), func, *args, **kwargs)
+
+        def start(*args, **kwargs):
+            return flight.start(call_key(*args, **kwargs), func, *args, **kwargs)
+
+        wrapper.flight = flight
+        wrapper.start = start
+        return wrapper
+    return decorator
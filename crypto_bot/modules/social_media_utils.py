@@ -3,6 +3,8 @@ import logging
 import tweepy
 import asyncio
 
+from .rate_limiter import provider_limiter
+
 lg = logging.getLogger(__name__)
 
 async def post_x_thread(x_client, posts):
@@ -11,9 +13,12 @@ async def post_x_thread(x_client, posts):
         lg.error("X client not initialized")
         return
 
+    limiter = provider_limiter("x")
     try:
         previous_tweet = None
         for i, post in enumerate(posts):
+            # Paced by the shared X budget instead of a fixed delay
+            await limiter.acquire()
             if i == 0:
                 # Post the first tweet
                 response = x_client.create_tweet(text=post)
@@ -24,9 +29,11 @@ async def post_x_thread(x_client, posts):
                 response = x_client.create_tweet(text=post, in_reply_to_tweet_id=previous_tweet)
                 previous_tweet = response.data['id']
                 lg.info(f"Posted reply tweet: {post}")
-            # Add a small delay to avoid rate limits
-            await asyncio.sleep(1)
+            limiter.on_success()
 
+    except tweepy.TooManyRequests as e:
+        limiter.on_throttle(e.response.headers if e.response is not None else None, default_wait=900)
+        lg.error(f"X rate limit hit posting thread: {e}")
     except tweepy.TweepyException as e:
         lg.error(f"Error posting X thread: {e}")
     except Exception as e:
@@ -1,43 +1,75 @@
-import sqlite3  # Added for database operations
 import json
 import hashlib
 import logging
 from datetime import datetime, UTC
 
+from .post_index import expire_posts, record_posts
+from .utils import get_db
+
 # Setup logging
 lg = logging.getLogger(__name__)
 
+# Threads older than this are deleted from thread_history. Every bot shares the table, so
+# this is the longest window any of them reads; each applies its own when reading.
+RETENTION = 30 * 86400
+
+
+def read_history(conn, cutoff, limit=None):
+    """Threads posted after `cutoff` from thread_history (see schema), newest first, at most `limit`."""
+    # Newest first through the timestamp index, so only the rows asked for are read
+    rows = conn.execute(
+        'SELECT timestamp, post_hashes, influencers FROM thread_history WHERE timestamp > ? '
+        'ORDER BY timestamp DESC LIMIT ?',
+        (cutoff, -1 if limit is None else limit)
+    ).fetchall()
+    history = []
+    for timestamp, post_hashes, influencers in rows:
+        try:
+            history.append({
+                'timestamp': timestamp,
+                'post_hashes': json.loads(post_hashes),
+                'influencers': json.loads(influencers) if influencers else []
+            })
+        except json.JSONDecodeError as e:
+            lg.error(f'Error parsing thread_history JSON for thread at {timestamp}: {e}')
+    return history
+
+
+def append_history(conn, entry):
+    """Add one posted thread (and its post_index rows) and drop threads older than RETENTION; the caller commits."""
+    cutoff = datetime.now(UTC).timestamp() - RETENTION
+    conn.execute(
+        'INSERT OR IGNORE INTO thread_history (timestamp, post_hashes, influencers) VALUES (?, ?, ?)',
+        (entry['timestamp'], json.dumps(entry['post_hashes']), json.dumps(entry.get('influencers', [])))
+    )
+    record_posts(conn, entry['post_hashes'], entry.get('coins', []), entry['timestamp'])
+    # Retention through the timestamp indexes touches only the expired rows
+    conn.execute('DELETE FROM thread_history WHERE timestamp <= ?', (cutoff,))
+    expire_posts(conn, cutoff)
+
 
 def load_history(db_path):
-    """Load thread history from the database."""
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
-        cur.execute('SELECT data FROM thread_history WHERE rowid=1')
-        row = cur.fetchone()
-        if row:
-            try:
-                history = json.loads(row[0])
-                lg.debug(f'Loaded history: {history}')
-                return history
-            except json.JSONDecodeError:
-                lg.error('Failed to decode thread history JSON')
-                return []
-        lg.debug('No thread history found')
-        return []
+    """Load the last 30 days of thread history from the database, oldest first."""
+    with get_db(db_path) as conn:
+        history = read_history(conn, datetime.now(UTC).timestamp() - RETENTION)
+    lg.debug(f'Loaded {len(history)} history entries')
+    return history[::-1]
 
 
 def save_history(history, db_path):
-    """Save thread history to the database."""
+    """Save threads in `history` that are not stored yet; stored ones are left as they are."""
     lg.debug(f'Saving history: {history}')
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
-        cur.execute('INSERT OR REPLACE INTO thread_history (rowid, data) VALUES (1, ?)', (json.dumps(history),))
+    cutoff = datetime.now(UTC).timestamp() - RETENTION
+    with get_db(db_path) as conn:
+        for entry in history:
+            if entry['timestamp'] > cutoff:
+                append_history(conn, entry)
         conn.commit()
 
 
 def prune_history(history):
     """Prune thread history to keep only the last 30 days of entries."""
-    threshold = datetime.now(UTC).timestamp() - (30 * 86400)  # 30 days ago
+    threshold = datetime.now(UTC).timestamp() - RETENTION
     pruned = [entry for entry in history if entry['timestamp'] >= threshold]
     lg.debug(f'Pruned history from {len(history)} to {len(pruned)} entries')
     return pruned
@@ -1,15 +1,112 @@
 # c:\CryptoBot\crypto_bot\modules\youtube_utils.py
 import logging
 import os
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
+from .api_endpoints import youtube_client
+
 load_dotenv()
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
 lg = logging.getLogger(__name__)
 
+# A channel's uploads playlist id and title practically never change
+CHANNEL_TTL = 7 * 24 * 3600
+
+
+def channel_metadata(youtube, channel_cache, channel_ids):
+    """Return {channel_id: {"uploads": playlist_id, "title": title}} for `channel_ids`.
+
+    Channels missing from `channel_cache` (a cache_store namespace) or expired there are
+    looked up together in one channels.list call; if that call fails, expired entries
+    are used as they are.
+    """
+    channels, missing = {}, []
+    for channel_id in channel_ids:
+        entry = channel_cache.get(channel_id)
+        if entry:
+            channels[channel_id] = entry.value
+        if not entry or not entry.fresh:
+            missing.append(channel_id)
+    if not missing:
+        return channels
+    try:
+        response = youtube.channels().list(
+            part="contentDetails,snippet",
+            id=",".join(missing),
+            maxResults=50
+        ).execute()
+    except Exception as e:
+        if not channels:
+            raise
+        lg.warning(f"Channel lookup failed, using cached metadata for {list(channels)}: {e}")
+        return channels
+    for item in response.get("items", []):
+        meta = {
+            "uploads": item["contentDetails"]["relatedPlaylists"]["uploads"],
+            "title": item["snippet"]["title"]
+        }
+        channel_cache.put(item["id"], meta)
+        channels[item["id"]] = meta
+    lg.info(f"Looked up {len(missing)} YouTube channels in one call")
+    return channels
+
+
+def latest_uploads(youtube, channel_cache, channel_ids):
+    """Return {channel_id: video} with the newest upload of each channel.
+
+    Costs one playlistItems.list call per channel plus one videos.list call for all the
+    descriptions. A video is {"video_id", "title", "description"}; None means the channel
+    has no uploads and an exception means its lookup failed. Unknown channels are left out.
+    """
+    channels = channel_metadata(youtube, channel_cache, channel_ids)
+    latest = {}
+    for channel_id in channel_ids:
+        meta = channels.get(channel_id)
+        if not meta:
+            continue
+        try:
+            response = youtube.playlistItems().list(
+                part="snippet",
+                playlistId=meta["uploads"],
+                maxResults=1
+            ).execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                # The uploads playlist moved; look the channel up again next time
+                channel_cache.delete(channel_id)
+            latest[channel_id] = e
+            continue
+        except Exception as e:
+            latest[channel_id] = e
+            continue
+        items = response.get("items") or []
+        if not items:
+            latest[channel_id] = None
+            continue
+        snippet = items[0]["snippet"]
+        latest[channel_id] = {
+            "video_id": snippet["resourceId"]["videoId"],
+            "title": snippet["title"],
+            "description": ""
+        }
+
+    videos = [video for video in latest.values() if isinstance(video, dict)]
+    if videos:
+        try:
+            response = youtube.videos().list(
+                part="snippet",
+                id=",".join(video["video_id"] for video in videos),
+                maxResults=50
+            ).execute()
+            descriptions = {item["id"]: item["snippet"]["description"] for item in response.get("items", [])}
+            for video in videos:
+                video["description"] = descriptions.get(video["video_id"], "")
+        except Exception as e:
+            lg.warning(f"Could not fetch video descriptions: {e}")
+    return latest
+
 async def fetch_youtube_videos(search_terms):
     """
     Fetch YouTube videos for the given search terms using the YouTube Data API.
@@ -18,7 +115,7 @@ async def fetch_youtube_videos(search_terms):
         if not GOOGLE_API_KEY:
             raise ValueError("Google API key not found in environment variables")
 
-        youtube = build('youtube', 'v3', developerKey=GOOGLE_API_KEY)
+        youtube = youtube_client(GOOGLE_API_KEY)
         search_term = " ".join(search_terms)
         lg.info(f"Fetching YouTube videos for terms: {search_term}")
 
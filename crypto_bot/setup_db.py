@@ -1,32 +1,31 @@
 import sqlite3
 
+from .modules.schema import migrate
+from .modules.utils import get_db
+
 DB_PATH = r"c:\CryptoBot\crypto_bot\modules\..\data\crypto_bot.db"
 
 def setup_database():
-    """Set up the SQLite database with top coins."""
+    """Set up the SQLite database with top coins (run as `python -m crypto_bot.setup_db`)."""
     top_coins = [
         "ripple", "hedera-hashgraph", "stellar", "xdc-network",
         "sui", "ondo", "algorand", "casper"
     ]
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # Create table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS top_coins (
-                coin_id TEXT PRIMARY KEY
+        # Create or upgrade the tables
+        migrate(DB_PATH)
+        with get_db(DB_PATH) as conn:
+            # Insert coins, ranked in list order
+            conn.executemany(
+                "INSERT INTO top_coins (coin_id, rank) VALUES (?, ?) "
+                "ON CONFLICT (coin_id) DO UPDATE SET rank = excluded.rank",
+                [(coin, rank) for rank, coin in enumerate(top_coins, 1)]
             )
-        """)
-        # Insert coins
-        for coin in top_coins:
-            cursor.execute("INSERT OR REPLACE INTO top_coins (coin_id) VALUES (?)", (coin,))
-        conn.commit()
+            conn.commit()
         print(f"Database set up successfully at {DB_PATH} with coins: {top_coins}")
     except sqlite3.Error as e:
         print(f"Error setting up database: {e}")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     setup_database()
\ No newline at end of file
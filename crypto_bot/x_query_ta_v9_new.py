@@ -2,13 +2,10 @@
 import os
 import logging
 import asyncio
-import aiohttp
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-import schedule
 from datetime import datetime, timezone
-import pytz
 import sys
 
 # Add the crypto_bot directory to sys.path
@@ -22,6 +19,10 @@ from .modules.youtube_utils import fetch_youtube_videos
 from .modules.santiment_utils import fetch_santiment_metrics
 from .modules.social_media_utils import follow_crypto_users, post_x_thread
 from .modules.content_utils import post_discord_update, create_thread_content
+from .modules.http_session import get_session, close_session
+from .modules.prewarm import next_aligned_slot, prewarm_until
+from .modules.cache_store import CacheStore, init_cache
+from .modules.market_snapshot import MARKET_TTL
 
 # Setup logging
 logging.basicConfig(
@@ -45,13 +46,25 @@ X_API_KEY = os.getenv('X_API_KEY')
 X_API_SECRET = os.getenv('X_API_SECRET')
 
 # Discord bot setup
+class CryptoBot(commands.Bot):
+    async def close(self):
+        # Release pooled HTTP connections together with the bot
+        await close_session()
+        await super().close()
+
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+bot = CryptoBot(command_prefix='!', intents=intents)
 
 # Database setup
 db_manager = DatabaseManager('crypto_bot.db')
 
+# Market data cached by the other bots in the shared database (data/crypto_bot.db)
+SHARED_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "crypto_bot.db")
+os.makedirs(os.path.dirname(SHARED_DB), exist_ok=True)
+init_cache(SHARED_DB)
+market_cache = CacheStore(SHARED_DB).namespace("markets", MARKET_TTL, retain=3600, max_entries=200, memory_size=64)
+
 # Initialize X client
 def initialize_x_client():
     """Initialize and return the X client using Tweepy."""
@@ -71,35 +84,45 @@ def initialize_x_client():
         lg.error(f"Failed to initialize X client: {e}")
         return None
 
-# Perform crypto update
-async def perform_coin_update(x_client, session, post_to_x=True):
-    """Fetch coin data, news, YouTube videos, and post updates to X and Discord."""
-    try:
-        # Get top coins from the database
-        top_coins = db_manager.get_top_coins()
-        coin_ids = [coin['id'] for coin in top_coins]
-        lg.info(f"Getting top coins from {db_manager.db_path}: {coin_ids}")
-
-        # Fetch coin data
-        coins_data = await fetch_all_data(coin_ids, session)
-        if not coins_data:
-            lg.error("No coin data fetched")
-            return False
+# Fetch everything an update posts
+async def fetch_update_data(session):
+    """Fetch coin data, news, YouTube videos and on-chain metrics for the top coins."""
+    # Get top coins from the database
+    top_coins = db_manager.get_top_coins()
+    coin_ids = [coin['id'] for coin in top_coins]
+    lg.info(f"Getting top coins from {db_manager.db_path}: {coin_ids}")
+
+    # Fetch coin data
+    coins_data = await fetch_all_data(coin_ids, session, markets=market_cache)
+    if not coins_data:
+        lg.error("No coin data fetched")
+        return None
+
+    # Fetch news
+    news_dict = await fetch_news(coin_ids, session)
+    if not news_dict:
+        lg.warning("No news data fetched")
+
+    # Fetch YouTube videos
+    youtube_videos = await fetch_youtube_videos(['crypto market update'])
+    if not youtube_videos:
+        lg.warning("No YouTube videos fetched")
 
-        # Fetch news
-        news_dict = await fetch_news(coin_ids, session)
-        if not news_dict:
-            lg.warning("No news data fetched")
+    # Fetch on-chain metrics
+    santiment_metrics = await fetch_santiment_metrics(coin_ids, session)
+    if not santiment_metrics:
+        lg.warning("No Santiment metrics fetched")
 
-        # Fetch YouTube videos
-        youtube_videos = await fetch_youtube_videos(['crypto market update'])
-        if not youtube_videos:
-            lg.warning("No YouTube videos fetched")
+    return coins_data, news_dict, youtube_videos, santiment_metrics
 
-        # Fetch on-chain metrics
-        santiment_metrics = await fetch_santiment_metrics(coin_ids, session)
-        if not santiment_metrics:
-            lg.warning("No Santiment metrics fetched")
+# Perform crypto update
+async def perform_coin_update(x_client, session, post_to_x=True, update_data=None):
+    """Post updates to X and Discord, fetching their data unless `update_data` was pre-fetched."""
+    try:
+        update_data = update_data or await fetch_update_data(session)
+        if not update_data:
+            return False
+        coins_data, news_dict, youtube_videos, santiment_metrics = update_data
 
         # Create thread content
         posts = create_thread_content(coins_data, news_dict, youtube_videos, santiment_metrics)
@@ -128,67 +151,40 @@ async def schedule_updates(x_client):
     """Schedule periodic updates for X and Discord."""
     lg.info("Starting schedule_updates loop")
 
-    async with aiohttp.ClientSession() as session:
-        while True:
-            now = datetime.now(timezone.utc)
-
-            # Define thread types and their intervals (in hours)
-            threads = [
-                {"type": "Coin Update", "interval": 2},
-                {"type": "News Update", "interval": 4},
-                {"type": "Analytics Update", "interval": 6}
-            ]
-
-            next_run = None
-            scheduler = None
-            for thread in threads:
-                # For simplicity, we'll just run the coin update for now
-                if thread["type"] == "Coin Update":
-                    # Set up the schedule
-                    scheduler = schedule.every(thread["interval"]).hours.at(":44").do(lambda: None)
-                    # Get the next run time
-                    next_run = scheduler.next_run
-                    # Ensure next_run is timezone-aware (same as 'now')
-                    if next_run.tzinfo is None:
-                        next_run = pytz.UTC.localize(next_run)
-                    break
-
-            if next_run is None:
-                lg.error("No schedule defined for updates")
-                return
-
-            # Calculate the time difference
-            sleep_seconds = (next_run - now).total_seconds()
-            if sleep_seconds < 0:
-                # If next_run is in the past, wait until the next occurrence
-                lg.warning(f"Next run time {next_run} is in the past. Rescheduling...")
-                schedule.run_all()  # Trigger the scheduler to update next_run
-                next_run = scheduler.next_run
-                if next_run.tzinfo is None:
-                    next_run = pytz.UTC.localize(next_run)
-                sleep_seconds = (next_run - now).total_seconds()
-
-            lg.info(f"Sleeping for {sleep_seconds:.2f} seconds until {next_run} to post X update")
-            await asyncio.sleep(sleep_seconds)
-
-            # Perform the update
-            lg.info("Performing scheduled crypto update")
-            success = await perform_coin_update(x_client, session)
-            if success:
-                lg.info("Scheduled update completed successfully")
-            else:
-                lg.error("Scheduled update failed")
+    # Define thread types and their intervals (in hours)
+    threads = [
+        {"type": "Coin Update", "interval": 2},
+        {"type": "News Update", "interval": 4},
+        {"type": "Analytics Update", "interval": 6}
+    ]
+    # For simplicity, we'll just run the coin update for now
+    interval = next(thread["interval"] for thread in threads if thread["type"] == "Coin Update")
+
+    session = get_session()
+    while True:
+        # Posts go out at :44 past every `interval`-th hour (UTC); their data is fetched shortly before
+        next_run = next_aligned_slot(datetime.now(timezone.utc), interval, 44)
+        lg.info(f"Waiting until {next_run} to post X update")
+        update_data = await prewarm_until(next_run, lambda: fetch_update_data(session), name="coin update")
+
+        # Perform the update
+        lg.info("Performing scheduled crypto update")
+        success = await perform_coin_update(x_client, session, update_data=update_data)
+        if success:
+            lg.info("Scheduled update completed successfully")
+        else:
+            lg.error("Scheduled update failed")
 
 # Discord command to manually trigger an update
 @bot.command()
 async def update(ctx):
     lg.info(f'Received !update command from {ctx.author}')
-    async with aiohttp.ClientSession() as session:
-        success = await perform_coin_update(initialize_x_client(), session, post_to_x=False)
-        if success:
-            await ctx.send("Crypto update posted to Discord!")
-        else:
-            await ctx.send("Failed to post crypto update.")
+    session = get_session()
+    success = await perform_coin_update(initialize_x_client(), session, post_to_x=False)
+    if success:
+        await ctx.send("Crypto update posted to Discord!")
+    else:
+        await ctx.send("Failed to post crypto update.")
 
 # On ready event
 @bot.event
@@ -10,42 +10,55 @@ import aiohttp
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from joblib import dump
-from googleapiclient.discovery import build
 import random
 import traceback
-import json
+import copy
 import hashlib
 import tweepy
 from tweepy import TooManyRequests
-import time
 import logging
-import sqlite3
-from contextlib import contextmanager
+from crypto_bot.modules.coingecko_client import CoinGeckoClient
+from crypto_bot.modules.api_endpoints import base_url, youtube_client
+from crypto_bot.modules.http_session import get_session, close_session
+from crypto_bot.modules.http_cache import HttpCache, init_http_cache
+from crypto_bot.modules.db_pool import close_all, connection
+from crypto_bot.modules.async_db import close_all as close_databases, database
+from crypto_bot.modules.cache_store import CacheStore, DAILY, NegativeCache, init_cache
+from crypto_bot.modules.rate_limiter import provider_limiter
+from crypto_bot.modules.circuit_breaker import breakers, CircuitOpenError
+from crypto_bot.modules.single_flight import single_flight
+from crypto_bot.modules.prewarm import prewarm_until
+from crypto_bot.modules.price_history import fetch_price_history, price_averages
+from crypto_bot.modules.market_snapshot import COIN_DETAIL_TTL, MARKET_TTL, shared_market_snapshot, fetch_coin_detail
+from crypto_bot.modules.youtube_utils import CHANNEL_TTL, latest_uploads
+from crypto_bot.modules.post_fragments import fragments
+from crypto_bot.modules.post_index import PostIndex
+from crypto_bot.modules.schema import migrate
+from crypto_bot.modules.thread_mgmt import append_history
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Rate limit tracking
-COINGECKO_REQUESTS = 0
+# Rate limit tracking: one CoinGecko client shared by every call site
 COINGECKO_RATE_LIMIT = 20
-COINGECKO_RESET_TIME = time.time()
+coingecko = CoinGeckoClient(calls_per_minute=COINGECKO_RATE_LIMIT, max_retries=6, backoff=1, base_url=base_url("coingecko"))
 
 
 def format_number(value):
     """Convert a large number to a human-readable format (e.g., $345,678,901 -> $345.68M)."""
     try:
-        value = float(value.replace('$', '').replace(',', ''))
-        if value >= 1_000_000_000:
-            return f"${value / 1_000_000_000:.2f}B"
-        elif value >= 1_000_000:
-            return f"${value / 1_000_000:.2f}M"
-        elif value >= 1_000:
-            return f"${value / 1_000:.2f}K"
-        else:
-            return f"${value:,.2f}"
-    except (ValueError, AttributeError):
+        value = float(value)
+    except (TypeError, ValueError):
         return "N/A"
+    if value >= 1_000_000_000:
+        return f"${value / 1_000_000_000:.2f}B"
+    elif value >= 1_000_000:
+        return f"${value / 1_000_000:.2f}M"
+    elif value >= 1_000:
+        return f"${value / 1_000:.2f}K"
+    else:
+        return f"${value:,.2f}"
 
 
 async def download_vader_lexicon(max_retries=5, delay=10):
@@ -57,12 +70,12 @@ async def download_vader_lexicon(max_retries=5, delay=10):
         logger.info("VADER lexicon not found. Attempting to download...")
     for attempt in range(max_retries):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head("https://www.google.com", timeout=5) as response:
-                    if response.status == 200:
-                        nltk.download('vader_lexicon', quiet=True)
-                        logger.info("VADER lexicon downloaded successfully.")
-                        return True
+            session = get_session()
+            async with session.head("https://www.google.com", timeout=5) as response:
+                if response.status == 200:
+                    nltk.download('vader_lexicon', quiet=True)
+                    logger.info("VADER lexicon downloaded successfully.")
+                    return True
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.warning(f"No network connectivity (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
@@ -85,12 +98,22 @@ for var in required_env_vars:
         logger.error(f"{var} is not set in .env file. Exiting.")
         exit(1)
 
+class CryptoBot(commands.Bot):
+    async def close(self):
+        # Release pooled HTTP/SQLite connections and the cache sweeper together with the bot
+        cache.stop_sweeper()
+        await close_session()
+        await super().close()
+        await close_databases()
+        close_all()
+
+
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = CryptoBot(command_prefix="!", intents=intents)
 
 # Initialize APIs
-youtube = build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+youtube = youtube_client(os.getenv("YOUTUBE_API_KEY"))
 
 
 # Test Twitter/X authentication
@@ -131,55 +154,104 @@ x_api = tweepy.API(
 
 # Initialize VADER sentiment analyzer
 sid = None
-if asyncio.run(download_vader_lexicon()):
+
+
+async def bootstrap_vader():
+    # Runs in its own event loop before the bot starts, so close the pool it borrowed
+    try:
+        return await download_vader_lexicon()
+    finally:
+        await close_session()
+
+
+if asyncio.run(bootstrap_vader()):
     sid = SentimentIntensityAnalyzer()
 
 # Configuration
 USE_TOP_ACCOUNTS = True
+# Coins fetched at once by get_ta_data; provider budgets still apply to every call
+COIN_CONCURRENCY = int(os.getenv("COIN_CONCURRENCY", 4))
+# coin_data_cache entries are served as-is for COIN_DATA_TTL, then served stale while a
+# background refresh runs; past COIN_DATA_MAX_STALE callers wait for fresh data
+COIN_DATA_TTL = 3600
+COIN_DATA_MAX_STALE = 24 * 3600
+# X threads go out every POST_INTERVAL seconds; caches are warmed prewarm.PREWARM_LEAD seconds before each
+POST_INTERVAL = 14400
+# Duplicate checks look back this far; thread_mgmt.RETENTION decides how long threads
+# are kept, since every bot shares the table
+HISTORY_DAYS = 7
+# Known-empty answers are remembered for this long per kind and not asked for again meanwhile
+NEGATIVE_TTLS = {
+    "coingecko": 6 * 3600,   # paths CoinGecko answers 404 for, ids it leaves out of /coins/markets
+    "news": 2 * 3600,        # NewsAPI queries with no articles
+    "youtube": 6 * 3600,     # searches with no video from the past week
+    "dappradar": 24 * 3600,  # chains DappRadar lists no dApps for or rejects
+}
+# Calls allowed in flight per provider (the YouTube client is not thread-safe)
+provider_slots = {
+    'youtube': asyncio.Semaphore(1),
+    'dappradar': asyncio.Semaphore(2)
+}
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 DATABASE = os.path.join(DATA_DIR, "crypto_bot.db")
+# Revalidates NewsAPI, DappRadar and CoinGecko responses with ETag/Last-Modified instead of refetching
+http_cache = HttpCache(DATABASE)
+coingecko.cache = http_cache
+# Every cached payload lives in one namespaced store with its own TTL, retention and size
+# bound; hot entries stay decoded in memory and a background sweeper enforces the bounds.
+# The other bots share this database: leases (Namespace.shared) let one process refresh
+# a key while the rest wait for its result instead of calling the API themselves
+cache = CacheStore(DATABASE)
+coin_data_cache = cache.namespace("coin_data", COIN_DATA_TTL, retain=COIN_DATA_MAX_STALE - COIN_DATA_TTL,
+                                  max_entries=100, memory_size=64, compress=True)
+market_cache = cache.namespace("markets", MARKET_TTL, retain=3600, max_entries=200, memory_size=64)
+coin_detail_cache = cache.namespace("coin_detail", COIN_DETAIL_TTL, retain=7 * 24 * 3600, max_entries=100, memory_size=64)
+news_cache = cache.namespace("news", DAILY, retain=7 * 24 * 3600, max_entries=500)
+youtube_cache = cache.namespace("youtube", 3600, retain=24 * 3600, max_entries=500)
+youtube_channel_cache = cache.namespace("youtube_channels", CHANNEL_TTL, retain=30 * 24 * 3600, max_entries=100)
+cache.on_sweep(http_cache.prune)
+negative_cache = NegativeCache(cache, NEGATIVE_TTLS)
+coingecko.negative = negative_cache
+# Duplicate checks against every thread posted within HISTORY_DAYS, by any bot process
+post_index = PostIndex(DATABASE, HISTORY_DAYS * 24 * 3600)
 
 
 # SQLite database setup
 def init_database():
-    with sqlite3.connect(DATABASE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS thread_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp REAL NOT NULL,
-                post_hashes TEXT NOT NULL,
-                influencers TEXT
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS coin_data_cache (
-                coin_id TEXT PRIMARY KEY,
-                data TEXT NOT NULL,
-                last_updated REAL NOT NULL
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS news_cache (
-                query TEXT PRIMARY KEY,
-                result TEXT NOT NULL,
-                date TEXT NOT NULL
-            )
-        """)
-        conn.commit()
+    # thread_history, post_hashes and coins are created and upgraded by the shared migrations
+    migrate(DATABASE)
+
+
+def adopt_legacy_caches():
+    # One-time move of the per-feature cache tables into their namespaces
+    coin_data_cache.adopt("coin_data_cache", "coin_id", "data", "last_updated")
+    coin_detail_cache.adopt("coin_detail_cache", "coin_id", "data", "last_updated")
+    news_cache.adopt("news_cache", "query", "result", "date")
+    # Older databases keep one headline per coin, the same value fetch_news caches
+    news_cache.adopt("news_cache", "coin", ("headline", "url"), "last_updated")
+    youtube_cache.adopt("youtube_cache", "query", "result", "last_updated")
+    # What is left of youtube_cache is the older layout: bare summaries with no query to key them by
+    cache.discard("youtube_cache")
 
 
-@contextmanager
 def get_db():
-    conn = sqlite3.connect(DATABASE)
-    try:
-        yield conn
-    finally:
-        conn.close()
+    # Pooled connection to the bot database (WAL, busy timeout, cached statements)
+    return connection(DATABASE)
+
+
+def last_good(entry, label):
+    # An expired cache entry still beats static fallbacks while a provider's circuit is open
+    if not entry:
+        return None
+    logger.warning(f"Serving last good {label}")
+    return entry.value
 
 
 init_database()
+init_http_cache(DATABASE)
+init_cache(DATABASE)
+adopt_legacy_caches()
 
 # Coin data
 coin_names = {
@@ -306,18 +378,6 @@ channel_ids = [
     ("UCtQycmSrKdJ0zE0bWumO4vA", "@digitalassetinvestor")
 ]
 
-prior_year_averages = {
-    'ripple': 0.60,
-    'hedera-hashgraph': 0.09,
-    'stellar': 0.11,
-    'xdce-crowd-sale': 0.03,
-    'sui': 0.80,
-    'ondo': 0.25,
-    'algorand': 0.15,
-    'cspr': 0.04
-}
-
-
 async def test_url(url, session, timeout=5):
     try:
         async with session.head(url, timeout=timeout, allow_redirects=True) as response:
@@ -336,103 +396,51 @@ async def test_url(url, session, timeout=5):
 
 
 async def get_top_coins():
-    global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
     supported_coins = list(coin_names.keys())
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(3):
-            try:
-                current_time = time.time()
-                if current_time - COINGECKO_RESET_TIME > 60:
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                if COINGECKO_REQUESTS >= COINGECKO_RATE_LIMIT:
-                    wait_time = 60 - (current_time - COINGECKO_RESET_TIME)
-                    if wait_time > 0:
-                        logger.info(f"Rate limit reached, waiting {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                COINGECKO_REQUESTS += 1
-
-                async with session.get(
-                        "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=20&page=1",
-                        timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    data = await response.json()
-                    if not isinstance(data, list) or not data:
-                        logger.error(f"Invalid CoinGecko response: {data}")
-                        raise ValueError("Empty or invalid response from CoinGecko")
-                    coins = [coin["id"] for coin in data if coin["id"] in supported_coins][:8]
-                    logger.info(
-                        f"CoinGecko returned {len(data)} coins, filtered to {len(coins)} supported coins: {coins}")
-
-                    if len(coins) < 4:
-                        logger.warning(
-                            f"Insufficient coins from CoinGecko ({len(coins)}), supplementing with supported coins.")
-                        needed = 4 - len(coins)
-                        additional_coins = [c for c in supported_coins if c not in coins][:needed]
-                        coins.extend(additional_coins)
-                        logger.info(f"Supplemented with {additional_coins}")
-                    logger.info(f"Final coins list: {coins}")
-                    return coins
-            except Exception as e:
-                logger.error(f"Error fetching top coins (attempt {attempt + 1}/3): {type(e).__name__}: {str(e)}")
-                if attempt < 2:
-                    await asyncio.sleep(2 ** attempt)
-                else:
-                    logger.warning("Max retries reached, returning fallback coins.")
-                    return supported_coins[:4]
-    return supported_coins[:4]
-
-
-def load_history():
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT timestamp, post_hashes, influencers FROM thread_history")
-        history = [
-            {
-                "timestamp": row[0],
-                "post_hashes": json.loads(row[1]),
-                "influencers": json.loads(row[2]) if row[2] else []
-            }
-            for row in cursor.fetchall()
-        ]
-    return history
-
+    session = get_session()
+    try:
+        data = await coingecko.get(
+            "coins/markets",
+            session,
+            params={"vs_currency": "usd", "order": "market_cap_desc", "per_page": 20, "page": 1},
+            max_attempts=3
+        )
+        if not isinstance(data, list):
+            logger.error(f"Invalid CoinGecko response: {data}")
+            raise ValueError("Empty or invalid response from CoinGecko")
+        coins = [coin["id"] for coin in data if coin["id"] in supported_coins][:8]
+        logger.info(
+            f"CoinGecko returned {len(data)} coins, filtered to {len(coins)} supported coins: {coins}")
+
+        if len(coins) < 4:
+            logger.warning(
+                f"Insufficient coins from CoinGecko ({len(coins)}), supplementing with supported coins.")
+            needed = 4 - len(coins)
+            additional_coins = [c for c in supported_coins if c not in coins][:needed]
+            coins.extend(additional_coins)
+            logger.info(f"Supplemented with {additional_coins}")
+        logger.info(f"Final coins list: {coins}")
+        return coins
+    except Exception as e:
+        logger.error(f"Error fetching top coins: {type(e).__name__}: {str(e)}")
+        logger.warning("Max retries reached, returning fallback coins.")
+        return supported_coins[:4]
 
-def save_history(history):
-    with get_db() as conn:
-        cursor = conn.cursor()
-        for entry in history:
-            cursor.execute(
-                "INSERT OR REPLACE INTO thread_history (timestamp, post_hashes, influencers) VALUES (?, ?, ?)",
-                (entry["timestamp"], json.dumps(entry["post_hashes"]), json.dumps(entry.get("influencers", [])))
-            )
-        conn.commit()
 
+def save_history(entry):
+    """Append one posted thread and drop threads older than thread_mgmt.RETENTION.
 
-def prune_history(history):
-    cutoff = (datetime.now(UTC) - timedelta(days=7)).timestamp()
-    return [entry for entry in history if entry['timestamp'] > cutoff]
+    Committed by the database's writer task; await the result to wait for the commit.
+    """
+    return database(DATABASE).write(append_history, entry)
 
 
 def hash_post(post):
     return hashlib.md5(post.encode()).hexdigest()
 
 
-def is_post_unique(post, history):
-    post_hash = hash_post(post)
-    return not any(post_hash in entry['post_hashes'] for entry in history)
-
-
-def get_used_influencers(history):
-    used_influencers = set()
-    cutoff = (datetime.now(UTC) - timedelta(days=7)).timestamp()
-    for entry in history:
-        if entry['timestamp'] > cutoff:
-            for influencer in entry.get('influencers', []):
-                used_influencers.add(influencer)
-    return used_influencers
+async def is_thread_unique(thread):
+    return not await post_index.seen([hash_post(post) for post in thread])
 
 
 def score_influencers(influencer_list, followers):
@@ -478,23 +486,26 @@ async def send_discord_message(channel_id, message, files=None):
 
 
 async def send_x_thread(thread, chart_urls=None, influencers_per_post=None):
+    limiter = provider_limiter("x")
     parent_id = None
     for i, post in enumerate(thread):
         for attempt in range(3):
             try:
                 if len(post) > 280:
                     post = post[:277] + "..."
+                await limiter.acquire()
                 tweet = x_client.create_tweet(
                     text=post,
                     in_reply_to_tweet_id=parent_id if i > 0 else None
                 )
                 parent_id = tweet.data["id"]
                 logger.info(f"Posted X Tweet {i + 1}: {tweet.data['id']}")
-                await asyncio.sleep(5)
+                limiter.on_success()
                 break
-            except TooManyRequests:
-                logger.warning(f"X rate limit hit for tweet {i + 1}. Waiting 15 minutes...")
-                await asyncio.sleep(900)
+            except TooManyRequests as e:
+                # Wait for the reset X reports (x-rate-limit-reset) rather than a fixed 15 minutes
+                wait = limiter.on_throttle(e.response.headers if e.response is not None else None, default_wait=900)
+                logger.warning(f"X rate limit hit for tweet {i + 1}. Waiting {wait:.0f} seconds...")
             except tweepy.TweepyException as e:
                 logger.error(f"X error for tweet {i + 1}: {e}")
                 if "401" in str(e):
@@ -512,14 +523,16 @@ async def send_x_thread(thread, chart_urls=None, influencers_per_post=None):
     return True
 
 
+@single_flight("news")
+@news_cache.shared()
 async def fetch_news(query):
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT result, date FROM news_cache WHERE query = ?", (query,))
-        row = cursor.fetchone()
-        if row and datetime.fromisoformat(row[1]).date() == datetime.now(UTC).date():
-            logger.info(f"Using cached news for {query}")
-            return json.loads(row[0])
+    cached = await news_cache.aget(query)
+    if cached and cached.fresh:
+        logger.info(f"Using cached news for {query}")
+        return cached.value
+    if await negative_cache.ahit("news", query):
+        logger.info(f"NewsAPI had nothing for {query} recently, not asking again yet")
+        return {"headline": f"No new updates for {query} today", "url": ""}
 
     newsapi_key = os.getenv('NEWSAPI_KEY')
     if not newsapi_key:
@@ -529,156 +542,175 @@ async def fetch_news(query):
     async def fetch_with_backoff(url, session, max_attempts=3):
         for attempt in range(max_attempts):
             try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 429:
-                        retry_after = int(response.headers.get('Retry-After', 60))
-                        logger.warning(f"NewsAPI rate limit hit for {query}, waiting {retry_after} seconds...")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    return await response.json()
+                response = await http_cache.get(session, url, limiter=provider_limiter("newsapi"))
+                if response.status == 429:
+                    # The NewsAPI limiter is paused until the reset; the next attempt waits for it
+                    logger.warning(f"NewsAPI rate limit hit for {query}")
+                    continue
+                breakers.success("newsapi")
+                return response.data
             except Exception as e:
                 logger.error(f"Error fetching news attempt {attempt + 1}: {e}")
+                if breakers.failure("newsapi"):
+                    break
                 if attempt < max_attempts - 1:
                     await asyncio.sleep(2 ** attempt)
         return None
 
-    async with aiohttp.ClientSession() as session:
-        url = f"https://newsapi.org/v2/everything?q={query}&language=en&sortBy=publishedAt&apiKey={newsapi_key}"
-        data = await fetch_with_backoff(url, session)
-        if not data or data.get("status") != "ok" or not data.get("articles"):
-            logger.warning(f"No relevant news found for {query}")
-            result = {"headline": f"No new updates for {query} today", "url": ""}
-        else:
-            article = data["articles"][0]
-            headline = article.get("title", "No headline available")[:100]
-            article_url = article.get("url", "")
-            keywords = ["filed", "approved", "rejected", "settlement", "paused", "appeal", "ruling", "partnership",
-                        "launch", "update"]
-            if not any(keyword in headline.lower() for keyword in keywords):
-                headline = f"No significant updates for {query} today"
-                article_url = ""
-            result = {"headline": headline, "url": article_url}
-
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO news_cache (query, result, date) VALUES (?, ?, ?)",
-                (query, json.dumps(result), datetime.now(UTC).isoformat())
-            )
-            conn.commit()
-        return result
+    session = get_session()
+    url = f"{base_url('newsapi')}/everything?q={query}&language=en&sortBy=publishedAt&apiKey={newsapi_key}"
+    try:
+        breakers.check("newsapi")
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping NewsAPI for {query}: {e}")
+        return last_good(cached, f"news for {query}") or {"headline": f"No new updates for {query} today", "url": ""}
+    data = await fetch_with_backoff(url, session)
+    if not data or data.get("status") != "ok":
+        # A failed fetch is not an empty answer: serve what we had and cache nothing
+        return last_good(cached, f"news for {query}") or {"headline": f"No new updates for {query} today", "url": ""}
+    if not data.get("articles"):
+        logger.warning(f"No relevant news found for {query}")
+        negative_cache.remember("news", query, "no articles")
+        return {"headline": f"No new updates for {query} today", "url": ""}
+    article = data["articles"][0]
+    headline = article.get("title", "No headline available")[:100]
+    article_url = article.get("url", "")
+    keywords = ["filed", "approved", "rejected", "settlement", "paused", "appeal", "ruling", "partnership",
+                "launch", "update"]
+    if not any(keyword in headline.lower() for keyword in keywords):
+        headline = f"No significant updates for {query} today"
+        article_url = ""
+    result = {"headline": headline, "url": article_url}
+
+    news_cache.put(query, result)
+    return result
 
 
 async def get_youtube_summary():
+    # Channel metadata is cached, so a refresh is one playlist call per channel plus one videos call
+    try:
+        async with provider_slots['youtube']:
+            latest = await asyncio.to_thread(
+                latest_uploads, youtube, youtube_channel_cache, [channel_id for channel_id, _ in channel_ids]
+            )
+    except Exception as e:
+        logger.error(f"Error fetching YouTube uploads: {type(e).__name__}: {str(e)}")
+        latest = {channel_id: e for channel_id, _ in channel_ids}
+
     summaries = []
     for channel_id, channel_name in channel_ids:
-        try:
-            channel_response = youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            ).execute()
-            if "items" not in channel_response or not channel_response["items"]:
-                summaries.append(f"{channel_name}: No channel found.")
-                continue
-            uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-            playlist_response = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=uploads_playlist_id,
-                maxResults=1
-            ).execute()
-
-            if "items" not in playlist_response or not playlist_response["items"]:
-                summaries.append(f"{channel_name}: No videos found.")
-                continue
-            video = playlist_response["items"][0]["snippet"]
-            video_id = video["resourceId"]["videoId"]
+        video = latest.get(channel_id)
+        if isinstance(video, Exception):
+            logger.error(f"Error fetching YouTube data for {channel_name}: {type(video).__name__}: {str(video)}")
+            summaries.append(f"{channel_name}: Error fetching video ({video})")
+        elif channel_id not in latest:
+            summaries.append(f"{channel_name}: No channel found.")
+        elif video is None:
+            summaries.append(f"{channel_name}: No videos found.")
+        else:
             title = video["title"]
-            video_response = youtube.videos().list(
-                part="snippet",
-                id=video_id
-            ).execute()
-            description = video_response["items"][0]["snippet"]["description"] if video_response["items"] else ""
-            summary = title if len(title) <= 80 else description.split('.')[0].strip()[:77] + "..."
-            summaries.append(f"{channel_name}: {summary} (https://youtu.be/{video_id})")
-        except Exception as e:
-            logger.error(f"Error fetching YouTube data for {channel_name}: {type(e).__name__}: {str(e)}")
-            summaries.append(f"{channel_name}: Error fetching video ({e})")
-        await asyncio.sleep(1)
+            summary = title if len(title) <= 80 else video["description"].split('.')[0].strip()[:77] + "..."
+            summaries.append(f"{channel_name}: {summary} (https://youtu.be/{video['video_id']})")
     return "\n".join(summaries)
 
 
+@single_flight("YouTube")
+async def fetch_youtube_content(query):
+    cached = await youtube_cache.afresh(query)
+    if cached:
+        logger.info(f"Using cached YouTube data for {query}")
+        return cached
+    if await negative_cache.ahit("youtube", query):
+        logger.info(f"No recent YouTube videos for {query} last time, not searching again yet")
+        return {"youtube": "No recent videos found", "youtube_score": 0}
+    breakers.check("youtube")
+    try:
+        async with provider_slots['youtube']:
+            search_response = await asyncio.to_thread(youtube.search().list(
+                part="snippet",
+                q=query,
+                type="video",
+                order="date",
+                maxResults=1,
+                publishedAfter=(datetime.now(UTC) - timedelta(days=7)).isoformat()
+            ).execute)
+    except Exception:
+        breakers.failure("youtube")
+        raise
+    breakers.success("youtube")
+
+    videos = search_response.get("items", [])
+    if videos:
+        video = videos[0]["snippet"]
+        video_id = videos[0]["id"]["videoId"]
+        result = {
+            "youtube": f"{video['channelTitle']}: {video['title']} (https://youtu.be/{video_id})",
+            "youtube_score": 10 if "fundamental" in video["title"].lower() else 5
+        }
+    else:
+        negative_cache.remember("youtube", query, "no videos in the past week")
+        return {"youtube": "No recent videos found", "youtube_score": 0}
+    youtube_cache.put(query, result)
+    return result
+
+
 async def curate_content(coins, coin_names):
     content_data = {}
-    async with aiohttp.ClientSession() as session:
-        for coin in coins:
-            if coin not in coin_names:
-                logger.warning(f"Skipping unsupported coin: {coin}")
-                content_data[coin] = {"youtube": "Unsupported coin", "youtube_score": 0, "x_accounts": "N/A"}
-                continue
-            try:
-                search_response = youtube.search().list(
-                    part="snippet",
-                    q=f"{coin_names[coin]} fundamentals",
-                    type="video",
-                    order="date",
-                    maxResults=1,
-                    publishedAfter=(datetime.now(UTC) - timedelta(days=7)).isoformat()
-                ).execute()
-
-                videos = search_response.get("items", [])
-                if videos:
-                    video = videos[0]["snippet"]
-                    video_id = videos[0]["id"]["videoId"]
-                    content_data[coin] = {
-                        "youtube": f"{video['channelTitle']}: {video['title']} (https://youtu.be/{video_id})",
-                        "youtube_score": 10 if "fundamental" in video["title"].lower() else 5
-                    }
-                else:
-                    content_data[coin] = {"youtube": "No recent videos found", "youtube_score": 0}
-            except Exception as e:
-                logger.error(f"Error curating YouTube for {coin}: {type(e).__name__}: {str(e)}")
-                content_data[coin] = {"youtube": f"Error: {e}", "youtube_score": 0}
-
-            scored_accounts = []
-            token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
-            influencer_list = influencers.get(token_key, [])
-            if influencer_list:
-                scored_influencers = score_influencers(influencer_list, 0)
-                for influencer in scored_influencers[:2]:
-                    score = influencer['total_score']
-                    scored_accounts.append(f"{influencer['handle']} (Score: {score:.1f}/15)")
-            content_data[coin]["x_accounts"] = ", ".join(scored_accounts) if scored_accounts else "No accounts curated"
-            await asyncio.sleep(1)
+    for coin in coins:
+        if coin not in coin_names:
+            logger.warning(f"Skipping unsupported coin: {coin}")
+            content_data[coin] = {"youtube": "Unsupported coin", "youtube_score": 0, "x_accounts": "N/A"}
+            continue
+        try:
+            # Copy: the result may be shared with a concurrent caller
+            content_data[coin] = dict(await fetch_youtube_content(f"{coin_names[coin]} fundamentals"))
+        except Exception as e:
+            logger.error(f"Error curating YouTube for {coin}: {type(e).__name__}: {str(e)}")
+            content_data[coin] = {"youtube": f"Error: {e}", "youtube_score": 0}
+
+        scored_accounts = []
+        token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
+        influencer_list = influencers.get(token_key, [])
+        if influencer_list:
+            scored_influencers = score_influencers(influencer_list, 0)
+            for influencer in scored_influencers[:2]:
+                score = influencer['total_score']
+                scored_accounts.append(f"{influencer['handle']} (Score: {score:.1f}/15)")
+        content_data[coin]["x_accounts"] = ", ".join(scored_accounts) if scored_accounts else "No accounts curated"
     return content_data
 
 
 async def get_top_accounts(coin, days=7):
     logger.info(f"Fetching community data for {coin} (X API free-tier workaround)...")
-    async with aiohttp.ClientSession() as session:
-        try:
-            url = f"https://api.coingecko.com/api/v3/coins/{coin}?localization=false&tickers=false&market_data=false&community_data=true&developer_data=false&sparkline=false"
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                data = await response.json()
-                followers = data.get('community_data', {}).get('twitter_followers', 0)
-                token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
-                top_influencers = influencers.get(token_key, [])[:3]
-                accounts = [
-                    {
-                        "username": influencer["handle"],
-                        "engagement": influencer["engagement"] * 100,
-                        "text": f"Positive sentiment for {coin_names[coin]} based on {followers:,} Twitter followers!"
-                    } for influencer in top_influencers
-                ]
-                logger.info(f"Generated {len(accounts)} accounts for {coin} with {followers:,} followers")
-                return accounts
-        except Exception as e:
-            logger.error(f"Error fetching community data for {coin}: {e}")
-            return [
-                {"username": f"@{coin}_user1", "engagement": random.randint(100, 1000),
-                 "text": f"Excited about {coin}!"},
-                {"username": f"@{coin}_user2", "engagement": random.randint(50, 500), "text": f"{coin} is the future!"},
-                {"username": f"@{coin}_user3", "engagement": random.randint(10, 200), "text": f"Checking {coin} charts"}
-            ]
+    session = get_session()
+    try:
+        data = await coingecko.get(
+            f"coins/{coin}",
+            session,
+            params={"localization": "false", "tickers": "false", "market_data": "false", "community_data": "true",
+                    "developer_data": "false", "sparkline": "false"},
+            max_attempts=1
+        )
+        followers = data.get('community_data', {}).get('twitter_followers', 0)
+        token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
+        top_influencers = influencers.get(token_key, [])[:3]
+        accounts = [
+            {
+                "username": influencer["handle"],
+                "engagement": influencer["engagement"] * 100,
+                "text": f"Positive sentiment for {coin_names[coin]} based on {followers:,} Twitter followers!"
+            } for influencer in top_influencers
+        ]
+        logger.info(f"Generated {len(accounts)} accounts for {coin} with {followers:,} followers")
+        return accounts
+    except Exception as e:
+        logger.error(f"Error fetching community data for {coin}: {e}")
+        return [
+            {"username": f"@{coin}_user1", "engagement": random.randint(100, 1000),
+             "text": f"Excited about {coin}!"},
+            {"username": f"@{coin}_user2", "engagement": random.randint(50, 500), "text": f"{coin} is the future!"},
+            {"username": f"@{coin}_user3", "engagement": random.randint(10, 200), "text": f"Checking {coin} charts"}
+        ]
 
 
 async def analyze_engagement(top_accounts, coin):
@@ -714,8 +746,8 @@ async def fetch_dapp_data(coin, session):
         'hedera-hashgraph': 'hedera',
     }
     chain = chain_mapping.get(coin.lower())
-    if not chain:
-        logger.info(f"No DappRadar support for {coin}, using project_sources")
+    if not chain or await negative_cache.ahit("dappradar", chain):
+        logger.info(f"No DappRadar data for {coin}, using project_sources")
         return {
             'dapp_count': project_sources[coin]['total_projects'],
             'top_projects': daily_projects.get(coin, []),
@@ -725,43 +757,47 @@ async def fetch_dapp_data(coin, session):
 
     for attempt in range(3):
         try:
-            url = f"https://api.dappradar.com/v2/dapps?chain={chain}&sort=transactions&order=desc&page=1&resultsPerPage=5"
+            breakers.check("dappradar", chain)
+            url = f"{base_url('dappradar')}/dapps?chain={chain}&sort=transactions&order=desc&page=1&resultsPerPage=5"
             headers = {'X-Api-Key': os.getenv('DAPPRADAR_API_KEY')}
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"DappRadar rate limit hit for {coin}, waiting {retry_after} seconds...")
-                    await asyncio.sleep(retry_after)
-                    continue
-                data = await response.json()
-                if not data.get('results'):
-                    logger.warning(f"No dApps found for {coin} on DappRadar")
-                    return {
-                        'dapp_count': project_sources[coin]['total_projects'],
-                        'top_projects': daily_projects.get(coin, []),
-                        'top_project_metrics': {'public_interest': 'N/A',
-                                                'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
-                    }
-
-                dapp_count = data.get('totalResults', project_sources[coin]['total_projects'])
-                top_projects = [(dapp['name'], dapp['description'], dapp['website']) for dapp in data['results'][:2]]
-                top_project_metrics = {
-                    'public_interest': f"{data['results'][0]['dailyUsers']} daily users" if data['results'] else 'N/A',
-                    'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"
-                }
-                logger.info(f"Fetched {dapp_count} dApps for {coin} from DappRadar")
+            async with provider_slots['dappradar']:
+                response = await http_cache.get(session, url, headers=headers, limiter=provider_limiter("dappradar"))
+            if response.status == 429:
+                # The DappRadar limiter is paused until the reset; the next attempt waits for it
+                logger.warning(f"DappRadar rate limit hit for {coin}")
+                continue
+            breakers.success("dappradar", chain)
+            data = response.data
+            if response.status in (400, 404) or not data.get('results'):
+                logger.warning(f"No dApps found for {coin} on DappRadar")
+                negative_cache.remember("dappradar", chain, f"HTTP {response.status}" if response.status >= 400 else "no dApps")
                 return {
-                    'dapp_count': dapp_count,
-                    'top_projects': top_projects,
-                    'top_project_metrics': top_project_metrics
+                    'dapp_count': project_sources[coin]['total_projects'],
+                    'top_projects': daily_projects.get(coin, []),
+                    'top_project_metrics': {'public_interest': 'N/A',
+                                            'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
                 }
+
+            dapp_count = data.get('totalResults', project_sources[coin]['total_projects'])
+            top_projects = [(dapp['name'], dapp['description'], dapp['website']) for dapp in data['results'][:2]]
+            top_project_metrics = {
+                'public_interest': f"{data['results'][0]['dailyUsers']} daily users" if data['results'] else 'N/A',
+                'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"
+            }
+            logger.info(f"Fetched {dapp_count} dApps for {coin} from DappRadar")
+            return {
+                'dapp_count': dapp_count,
+                'top_projects': top_projects,
+                'top_project_metrics': top_project_metrics
+            }
         except Exception as e:
             logger.error(f"Error fetching DappRadar data for {coin} (attempt {attempt + 1}/3): {e}")
-            if attempt < 2:
+            circuit_open = isinstance(e, CircuitOpenError) or breakers.failure("dappradar", chain)
+            if attempt < 2 and not circuit_open:
                 logger.info(f"Retrying DappRadar in {2 ** attempt} seconds...")
                 await asyncio.sleep(2 ** attempt)
             else:
-                logger.warning(f"Max retries reached for DappRadar {coin}, using project_sources")
+                logger.warning(f"Giving up on DappRadar for {coin}, using project_sources")
                 return {
                     'dapp_count': project_sources[coin]['total_projects'],
                     'top_projects': daily_projects.get(coin, []),
@@ -771,38 +807,14 @@ async def fetch_dapp_data(coin, session):
 
 
 async def fetch_historical_data(coin, session, days=60):
-    historical_data = []
-    end_date = datetime.now(UTC) - timedelta(days=1)  # Use yesterday to avoid future dates
-    start_date = end_date - timedelta(days=days)
-    current_date = start_date
-
-    while current_date <= end_date:
-        date_str = current_date.strftime("%d-%m-%Y")
-        url = f"https://api.coingecko.com/api/v3/coins/{coin}/history?date={date_str}&localization=false"
-        try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                data = await response.json()
-                if 'market_data' in data and data['market_data']['current_price']['usd']:
-                    historical_data.append({
-                        'date': current_date.timestamp(),
-                        'price': data['market_data']['current_price']['usd'],
-                        'volume': data['market_data']['total_volume']['usd'],
-                        'market_cap': data['market_data']['market_cap']['usd']
-                    })
-                else:
-                    logger.warning(f"No market data for {coin} on {date_str}")
-        except Exception as e:
-            logger.error(f"Error fetching historical data for {coin} on {date_str}: {e}")
-        current_date += timedelta(days=1)
-        await asyncio.sleep(1)
-    return historical_data
+    # Past days never change, so only the gaps in the local store hit CoinGecko
+    return await fetch_price_history(coingecko, session, DATABASE, coin, days)
 
 
 def predict_price(historical_data, coin):
     if len(historical_data) < 5:
-        logger.warning(f"Insufficient data for price prediction for {coin}")
-        fallback_price = prior_year_averages.get(coin, 0) * 1.05  # Assume 5% growth
-        return fallback_price, "Fallback based on prior year average"
+        logger.warning(f"Insufficient data for price prediction for {coin} ({len(historical_data)} days)")
+        return None, "Insufficient data"
 
     df = pd.DataFrame(historical_data)
     df['price_lag1'] = df['price'].shift(1)
@@ -813,8 +825,7 @@ def predict_price(historical_data, coin):
 
     if df.empty:
         logger.warning(f"No valid data after processing for {coin}")
-        fallback_price = prior_year_averages.get(coin, 0) * 1.05
-        return fallback_price, "Fallback based on prior year average"
+        return None, "No valid data"
 
     X = df[['price_lag1', 'price_lag2', 'volume_lag1', 'market_cap_lag1']]
     y = df['price']
@@ -849,66 +860,127 @@ def predict_price(historical_data, coin):
     return predicted_price, explanation
 
 
-async def fetch_coin_data(coin, session):
-    global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT data, last_updated FROM coin_data_cache WHERE coin_id = ?", (coin,))
-        row = cursor.fetchone()
-        if row and (datetime.now(UTC).timestamp() - row[1]) < 3600:
-            logger.info(f"Using cached coin data for {coin}")
-            return json.loads(row[0])
+def fallback_coin_data(coin, content_data=None):
+    """Placeholder record for a coin whose live data could not be fetched."""
+    content = (content_data or {}).get(coin, {})
+    return {
+        "coin": coin_names[coin],
+        "text": f"{coin_names[coin]}: Price unavailable",
+        "price": None,
+        "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
+        "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
+        "market_cap": "N/A",
+        "projects": project_sources[coin]["count"],
+        "partnerships": project_sources[coin]["partnerships"],
+        "project_source": project_sources[coin]["source"],
+        "project_url": project_sources[coin]["url"],
+        "total_projects": project_sources[coin]["total_projects"],
+        "top_projects": daily_projects.get(coin, []),
+        "top_project_metrics": {'public_interest': 'N/A',
+                                'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
+        "volume": 0,
+        "exchange": exchange_links[coin],
+        "price_change_24h": 0,
+        "trend": "N/A",
+        "ma_30": None,
+        "prior_month_avg": None,
+        "fundamentals": "N/A",
+        "onchain_metrics": {
+            "transaction_volume": "N/A",
+            "active_addresses_proxy": "N/A",
+            "tvl": "N/A",
+            "developer_activity": "N/A"
+        },
+        "curated_youtube": content.get("youtube", "N/A"),
+        "curated_x": content.get("x_accounts", "N/A"),
+        "twitter_followers": 0,
+        "predicted_price": "N/A",
+        "prediction_explanation": "N/A"
+    }
 
-    async def fetch_with_backoff(url, session, max_attempts=6):
-        global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
-        for attempt in range(max_attempts):
-            try:
-                current_time = time.time()
-                if current_time - COINGECKO_RESET_TIME > 60:
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                if COINGECKO_REQUESTS >= COINGECKO_RATE_LIMIT:
-                    wait_time = 60 - (current_time - COINGECKO_RESET_TIME)
-                    if wait_time > 0:
-                        logger.info(f"Rate limit reached, waiting {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                COINGECKO_REQUESTS += 1
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 429:
-                        retry_after = int(response.headers.get('Retry-After', 60))
-                        logger.warning(f"CoinGecko rate limit hit for {url}, waiting {retry_after} seconds...")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    data = await response.json()
-                    logger.info(f"API response for {url}: {data}")
-                    if not data or 'error' in data:
-                        raise ValueError(f"Invalid response from {url}: {data.get('error', 'No data')}")
-                    return data
-            except Exception as e:
-                logger.error(f"Error fetching {url} attempt {attempt + 1}: {type(e).__name__} - {str(e)}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2 ** attempt)
-                else:
-                    raise
-        raise ValueError(f"Failed to fetch {url} after {max_attempts} attempts")
 
+def apply_market(data, coin, market):
+    """Write the fast-moving snapshot fields (price, change, volume, cap) into a coin entry."""
+    data.update({
+        "text": f"{coin_names[coin]}: ${market['price']:.2f}",
+        "price": market['price'],
+        "full_text": f"{coin_names[coin]}: ${market['price']:.2f} ({market['price_change_24h']:.2f}% 24h)",
+        "market_cap": f"${market['market_cap']:,}",
+        "volume": market['volume'],
+        "price_change_24h": market['price_change_24h'],
+        "trend": "Bullish" if market['price_change_24h'] > 0 else "Bearish"
+    })
+    if isinstance(data.get("onchain_metrics"), dict):
+        data["onchain_metrics"]["transaction_volume"] = f"${market['volume']:,}"
+    return data
+
+
+async def fetch_coin_data(coin, session, snapshot=None):
+    # Entries are kept until COIN_DATA_MAX_STALE, so anything returned here may be served
+    cached = await coin_data_cache.aget(coin)
+    if cached:
+        if cached.fresh:
+            logger.info(f"Using cached coin data for {coin}")
+        else:
+            # Stale-while-revalidate: answer now, refresh detail/history/DappRadar in the background
+            logger.info(f"Serving coin data for {coin} from {cached.age / 60:.0f} min ago, refreshing in background")
+            refresh_coin_data.start(coin, session, snapshot)
+        market = (snapshot or {}).get(coin)
+        # The cached dict is shared; overlay prices on a copy
+        return apply_market(copy.deepcopy(cached.value), coin, market) if market else cached.value
+    return await refresh_coin_data(coin, session, snapshot)
+
+
+@single_flight("coin data")
+@coin_data_cache.shared(lease=300, wait=120)
+async def refresh_coin_data(coin, session, snapshot=None):
+    if snapshot is None:
+        try:
+            snapshot = await shared_market_snapshot(coingecko, session, market_cache, [coin])
+        except Exception as e:
+            logger.error(f"Error fetching market snapshot for {coin}: {e}")
+            snapshot = {}
+    if coin not in snapshot:
+        # CoinGecko is failing for this coin (or its circuit is open): answer from cache at once
+        cached = last_good(await coin_data_cache.aget(coin), f"coin data for {coin}")
+        if cached:
+            return cached
+        if await negative_cache.ahit("coingecko", f"coins/{coin}"):
+            # Rejected id: detail/history/YouTube/DappRadar lookups would all be wasted
+            logger.info(f"CoinGecko does not list {coin}, using fallback data")
+            return fallback_coin_data(coin)
+
+    # Prices come from the batched snapshot; the slow-changing detail payload, YouTube,
+    # history and DappRadar are independent, so fetch them together
+    detail, content_data, historical_data, dapp_data = await asyncio.gather(
+        fetch_coin_detail(coingecko, session, coin_detail_cache, coin),
+        curate_content([coin], coin_names),
+        fetch_historical_data(coin, session),
+        fetch_dapp_data(coin, session),
+        return_exceptions=True
+    )
+    if isinstance(detail, Exception):
+        logger.warning(f"No community/developer data for {coin}: {detail}")
+        detail = {"twitter_followers": 0, "code_changes_4w": 0}
+    if isinstance(content_data, Exception):
+        logger.error(f"Error curating content for {coin}: {content_data}")
+        content_data = {}
+    if isinstance(historical_data, Exception):
+        logger.error(f"Error fetching historical data for {coin}: {historical_data}")
+        historical_data = []
     try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin}?localization=false&tickers=false&market_data=true&community_data=true&developer_data=true&sparkline=false"
-        data = await fetch_with_backoff(url, session)
-        content_data = await curate_content([coin], coin_names)
-        historical_data = await fetch_historical_data(coin, session)
-        predicted_price, prediction_explanation = predict_price(historical_data, coin) if historical_data else (
-        None, "N/A")
-        dapp_data = await fetch_dapp_data(coin, session)
+        market = snapshot.get(coin)
+        if not market:
+            raise ValueError(f"{coin} missing from market snapshot")
+        if isinstance(dapp_data, Exception):
+            raise dapp_data
+        predicted_price, prediction_explanation = (
+            await asyncio.to_thread(predict_price, historical_data, coin)) if historical_data else (None, "N/A")
+        ma_30, prior_month_avg = price_averages(historical_data)
 
         result = {
             "coin": coin_names[coin],
-            "text": f"{coin_names[coin]}: ${data['market_data']['current_price']['usd']:.2f}",
-            "full_text": f"{coin_names[coin]}: ${data['market_data']['current_price']['usd']:.2f} ({data['market_data']['price_change_percentage_24h']:.2f}% 24h)",
             "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-            "market_cap": f"${data['market_data']['market_cap']['usd']:,}",
             "projects": project_sources[coin]["count"],
             "partnerships": project_sources[coin]["partnerships"],
             "project_source": project_sources[coin]["source"],
@@ -916,186 +988,142 @@ async def fetch_coin_data(coin, session):
             "total_projects": dapp_data['dapp_count'],
             "top_projects": dapp_data['top_projects'],
             "top_project_metrics": dapp_data['top_project_metrics'],
-            "volume": data['market_data']['total_volume']['usd'],
             "exchange": exchange_links[coin],
-            "price_change_24h": data['market_data']['price_change_percentage_24h'],
-            "trend": "Bullish" if data['market_data']['price_change_percentage_24h'] > 0 else "Bearish",
-            "ma_30": prior_year_averages.get(coin, 0),
-            "prior_month_avg": prior_year_averages.get(coin, 0),
+            "ma_30": ma_30,
+            "prior_month_avg": prior_month_avg,
             "fundamentals": "N/A",
             "onchain_metrics": {
-                "transaction_volume": f"${data['market_data']['total_volume']['usd']:,}",
-                "active_addresses_proxy": f"{data.get('community_data', {}).get('twitter_followers', 0):,} Twitter followers",
+                "active_addresses_proxy": f"{detail['twitter_followers']:,} Twitter followers",
                 "tvl": "N/A",
-                "developer_activity": f"{data.get('developer_data', {}).get('code_additions_deletions_4_weeks', 0)} code changes (4w)"
+                "developer_activity": f"{detail['code_changes_4w']} code changes (4w)"
             },
             "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
             "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-            "twitter_followers": data.get('community_data', {}).get('twitter_followers', 0),
+            "twitter_followers": detail['twitter_followers'],
             "predicted_price": f"${predicted_price:.2f}" if predicted_price else "N/A",
             "prediction_explanation": prediction_explanation
         }
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO coin_data_cache (coin_id, data, last_updated) VALUES (?, ?, ?)",
-                (coin, json.dumps(result), datetime.now(UTC).timestamp())
-            )
-            conn.commit()
+        apply_market(result, coin, market)
+        coin_data_cache.put(coin, result)
         return result
     except Exception as e:
         logger.error(f"Failed to fetch data for {coin}: {e}")
-        content_data = await curate_content([coin], coin_names)
-        dapp_data = {
-            'dapp_count': project_sources[coin]['total_projects'],
-            'top_projects': daily_projects.get(coin, []),
-            'top_project_metrics': {'public_interest': 'N/A',
-                                    'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
-        }
-        return {
-            "coin": coin_names[coin],
-            "text": f"{coin_names[coin]}: Price unavailable",
-            "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-            "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-            "market_cap": "N/A",
-            "projects": project_sources[coin]["count"],
-            "partnerships": project_sources[coin]["partnerships"],
-            "project_source": project_sources[coin]["source"],
-            "project_url": project_sources[coin]["url"],
-            "total_projects": dapp_data['dapp_count'],
-            "top_projects": dapp_data['top_projects'],
-            "top_project_metrics": dapp_data['top_project_metrics'],
-            "volume": 0,
-            "exchange": exchange_links[coin],
-            "price_change_24h": 0,
-            "trend": "N/A",
-            "ma_30": prior_year_averages.get(coin, 0),
-            "prior_month_avg": prior_year_averages.get(coin, 0),
-            "fundamentals": "N/A",
-            "onchain_metrics": {
-                "transaction_volume": "N/A",
-                "active_addresses_proxy": "N/A",
-                "tvl": "N/A",
-                "developer_activity": "N/A"
-            },
-            "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
-            "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-            "twitter_followers": 0,
-            "predicted_price": "N/A",
-            "prediction_explanation": "N/A"
-        }
+        return fallback_coin_data(coin, content_data)
 
 
+# !crypto_update and the posting loop can overlap; the second caller joins the running fetch
+@single_flight("TA data", key=lambda: "top_coins")
 async def get_ta_data():
-    ta_data = []
     content_data = await curate_content(coins, coin_names)
-    async with aiohttp.ClientSession() as session:
-        logger.info(f"Fetching data for coins: {coins}")
-        for coin in coins:
+    slots = asyncio.Semaphore(COIN_CONCURRENCY)
+
+    async def fetch_one(coin, session, snapshot):
+        async with slots:
             try:
-                data = await fetch_coin_data(coin, session)
+                data = await fetch_coin_data(coin, session, snapshot)
                 if not isinstance(data, dict):
                     raise ValueError(f"Invalid data type for {coin}: {type(data)}")
-                ta_data.append(data)
+                return data
             except Exception as e:
                 logger.error(f"Failed to fetch data for {coin}: {e}")
-                ta_data.append({
-                    "coin": coin_names[coin],
-                    "text": f"{coin_names[coin]}: Price unavailable",
-                    "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-                    "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-                    "market_cap": "N/A",
-                    "projects": project_sources[coin]["count"],
-                    "partnerships": project_sources[coin]["partnerships"],
-                    "project_source": project_sources[coin]["source"],
-                    "project_url": project_sources[coin]["url"],
-                    "total_projects": project_sources[coin]["total_projects"],
-                    "top_projects": daily_projects.get(coin, []),
-                    "top_project_metrics": {'public_interest': 'N/A',
-                                            'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
-                    "volume": 0,
-                    "exchange": exchange_links[coin],
-                    "price_change_24h": 0,
-                    "trend": "N/A",
-                    "ma_30": prior_year_averages.get(coin, 0),
-                    "prior_month_avg": prior_year_averages.get(coin, 0),
-                    "fundamentals": "N/A",
-                    "onchain_metrics": {
-                        "transaction_volume": "N/A",
-                        "active_addresses_proxy": "N/A",
-                        "tvl": "N/A",
-                        "developer_activity": "N/A"
-                    },
-                    "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
-                    "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-                    "twitter_followers": 0,
-                    "predicted_price": "N/A",
-                    "prediction_explanation": "N/A"
-                })
-            await asyncio.sleep(6)
-
-    if len(ta_data) < len(coins):
-        logger.warning(f"ta_data ({len(ta_data)}) shorter than coins ({len(coins)}), appending fallbacks...")
-        for coin in coins[len(ta_data):]:
-            ta_data.append({
-                "coin": coin_names[coin],
-                "text": f"{coin_names[coin]}: Price unavailable",
-                "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-                "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-                "market_cap": "N/A",
-                "projects": project_sources[coin]["count"],
-                "partnerships": project_sources[coin]["partnerships"],
-                "project_source": project_sources[coin]["source"],
-                "project_url": project_sources[coin]["url"],
-                "total_projects": project_sources[coin]["total_projects"],
-                "top_projects": daily_projects.get(coin, []),
-                "top_project_metrics": {'public_interest': 'N/A',
-                                        'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
-                "volume": 0,
-                "exchange": exchange_links[coin],
-                "price_change_24h": 0,
-                "trend": "N/A",
-                "ma_30": prior_year_averages.get(coin, 0),
-                "prior_month_avg": prior_year_averages.get(coin, 0),
-                "fundamentals": "N/A",
-                "onchain_metrics": {
-                    "transaction_volume": "N/A",
-                    "active_addresses_proxy": "N/A",
-                    "tvl": "N/A",
-                    "developer_activity": "N/A"
-                },
-                "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
-                "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-                "twitter_followers": 0,
-                "predicted_price": "N/A",
-                "prediction_explanation": "N/A"
-            })
+                return fallback_coin_data(coin, content_data)
+
+    session = get_session()
+    # One /coins/markets call covers the fast-changing fields of every coin CoinGecko still lists
+    listed = [coin for coin in coins if not await negative_cache.ahit("coingecko", f"coins/{coin}")]
+    try:
+        snapshot = await shared_market_snapshot(coingecko, session, market_cache, listed) if listed else {}
+    except Exception as e:
+        logger.error(f"Error fetching market snapshot for {coins}: {e}")
+        snapshot = {}
+    logger.info(f"Fetching data for coins: {coins} ({COIN_CONCURRENCY} at a time)")
+    ta_data = list(await asyncio.gather(*(fetch_one(coin, session, snapshot) for coin in coins)))
 
     logger.info(f"get_ta_data completed: {len(ta_data)} entries for coins {coins}")
+    logger.debug(f"Cache stats: {cache.stats()}")
     return ta_data
 
 
+async def warm_post_caches():
+    """Fetch everything the next thread reads, so posting only renders cached data."""
+    coin_data = await get_ta_data()
+    await asyncio.gather(
+        *(fetch_news(data['coin']) for data in coin_data[:3]),
+        curate_content([data['coin'].lower() for data in coin_data[:3]], coin_names),
+        return_exceptions=True
+    )
+    return coin_data
+
+
+def coin_post_source(data, news):
+    """The fields a coin's post fragments are rendered from; their hash keys the rendered text."""
+    return {
+        "coin": data['coin'],
+        "price": data.get('price'),
+        "price_change_24h": data['price_change_24h'],
+        "volume": data['volume'],
+        "predicted_price": data['predicted_price'],
+        "prediction_explanation": data['prediction_explanation'],
+        "top_project": data['top_projects'][0][0] if data['top_projects'] else "N/A",
+        "total_projects": data['total_projects'],
+        "onchain_metrics": data['onchain_metrics'],
+        "chart_url": data['chart_url'],
+        "news": news
+    }
+
+
+def price_line(source):
+    if source['price'] is None:
+        raise ValueError(f"No price for {source['coin']}")
+    change = source['price_change_24h']
+    return f"${source['price']:.2f} ({change:.2f}% 24h) {'📈' if change > 0 else '📉'}"
+
+
+def render_coin_tweet(source):
+    """One coin's reply in the X thread."""
+    news = source['news']
+    headline = news['headline'][:40] + "..." if len(news['headline']) > 40 else news['headline']
+    return (
+        f"{source['coin']} ({token_symbols[source['coin'].lower()]}): {price_line(source)}\n"
+        f"Predicted: {source['predicted_price']} ({source['prediction_explanation']})\n"
+        f"Tx Volume: {format_number(source['volume'])}\n"
+        f"Top Project: {source['top_project']}\n"
+        f"News: {headline} {news['url']} #Crypto"
+    )
+
+
+def render_coin_block(source):
+    """One coin's section of the !crypto_update Discord message."""
+    news = source['news']
+    headline = news['headline'][:100] if news['headline'] else "No headline available"
+    return (
+        f"**{source['coin']} ({token_symbols[source['coin'].lower()]})**\n"
+        f"Price: {price_line(source)}\n"
+        f"Predicted Price: {source['predicted_price']} ({source['prediction_explanation']})\n"
+        f"Transaction Volume: {format_number(source['volume'])}\n"
+        f"Active Addresses (Proxy): {source['onchain_metrics']['active_addresses_proxy']}\n"
+        f"Developer Activity: {source['onchain_metrics']['developer_activity']}\n"
+        f"Projects: {source['total_projects']}, Top: {source['top_project']}\n"
+        f"News: {headline}\n"
+        f"Link: {news['url']}\n"
+        f"Chart: {source['chart_url']}\n\n"
+    )
+
+
 async def post_x_update():
+    next_post = datetime.now(UTC)
     while True:
+        warmed = await prewarm_until(next_post, warm_post_caches, name="X thread")
+        next_post = max(next_post + timedelta(seconds=POST_INTERVAL), datetime.now(UTC))
         try:
-            coin_data = await get_ta_data()
+            coin_data = warmed or await get_ta_data()
             thread = [
                 f"🚀 Crypto Market Update! 📈 Latest on top altcoins: {', '.join([data['coin'] for data in coin_data[:3]])}. #Crypto #Altcoins"]
 
             for data in coin_data[:3]:
                 news = await fetch_news(data['coin'])
-                top_project = data['top_projects'][0][0] if data['top_projects'] else "N/A"
-                tx_volume = format_number(data['onchain_metrics']['transaction_volume'])
-                headline = news['headline'][:40] + "..." if len(news['headline']) > 40 else news['headline']
-                tweet = (
-                    f"{data['coin']} ({token_symbols[data['coin'].lower()]}): ${data['text'].split('$')[1]} "
-                    f"({data['price_change_24h']:.2f}% 24h) {'📈' if data['price_change_24h'] > 0 else '📉'}\n"
-                    f"Predicted: {data['predicted_price']} ({data['prediction_explanation']})\n"
-                    f"Tx Volume: {tx_volume}\n"
-                    f"Top Project: {top_project}\n"
-                    f"News: {headline} {news['url']} #Crypto"
-                )
-                thread.append(tweet)
+                # Unchanged coin data and news reuse the text rendered on an earlier run
+                thread.append(fragments.render("x_coin", coin_post_source(data, news), render_coin_tweet))
 
             content_data = await curate_content([data['coin'].lower() for data in coin_data[:3]], coin_names)
             influencers_list = []
@@ -1109,21 +1137,19 @@ async def post_x_update():
             else:
                 thread.append("Stay tuned for more crypto updates! #CryptoNews")
 
-            history = load_history()
             thread_hashes = [hash_post(post) for post in thread]
-            if all(is_post_unique(post, history) for post in thread):
+            if await is_thread_unique(thread):
                 await send_x_thread(thread)
-                history.append({
+                await save_history({
                     "timestamp": datetime.now(UTC).timestamp(),
                     "post_hashes": thread_hashes,
+                    "coins": [coin for coin, name in coin_names.items() if name in {data['coin'] for data in coin_data[:3]}],
                     "influencers": influencers_list
                 })
-                save_history(prune_history(history))
             else:
                 logger.info("Skipping X post: duplicate content detected")
         except Exception as e:
             logger.error(f"Error in post_x_update: {e}")
-        await asyncio.sleep(14400)
 
 
 @bot.command()
@@ -1132,21 +1158,7 @@ async def crypto_update(ctx):
     message = "🚀 **Crypto Market Update** 📈\n\n"
     for data in coin_data[:3]:
         news = await fetch_news(data['coin'])
-        top_project = data['top_projects'][0][0] if data['top_projects'] else "N/A"
-        tx_volume = format_number(data['onchain_metrics']['transaction_volume'])
-        headline = news['headline'][:100] if news['headline'] else "No headline available"
-        message += (
-            f"**{data['coin']} ({token_symbols[data['coin'].lower()]})**\n"
-            f"Price: ${data['text'].split('$')[1]} ({data['price_change_24h']:.2f}% 24h) {'📈' if data['price_change_24h'] > 0 else '📉'}\n"
-            f"Predicted Price: {data['predicted_price']} ({data['prediction_explanation']})\n"
-            f"Transaction Volume: {tx_volume}\n"
-            f"Active Addresses (Proxy): {data['onchain_metrics']['active_addresses_proxy']}\n"
-            f"Developer Activity: {data['onchain_metrics']['developer_activity']}\n"
-            f"Projects: {data['total_projects']}, Top: {top_project}\n"
-            f"News: {headline}\n"
-            f"Link: {news['url']}\n"
-            f"Chart: {data['chart_url']}\n\n"
-        )
+        message += fragments.render("discord_coin", coin_post_source(data, news), render_coin_block)
     content_data = await curate_content([data['coin'].lower() for data in coin_data[:3]], coin_names)
     influencers_list = []
     for coin in content_data:
@@ -1163,6 +1175,7 @@ async def crypto_update(ctx):
 @bot.event
 async def on_ready():
     logger.info(f"Bot logged in as {bot.user}")
+    cache.start_sweeper()
     global coins
     coins = await get_top_coins()
     bot.loop.create_task(post_x_update())
@@ -10,18 +10,32 @@ import aiohttp
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from joblib import dump
-from googleapiclient.discovery import build
 import random
 import traceback
-import json
+import copy
 import hashlib
 import tweepy
 from tweepy import TooManyRequests
-import time
 import logging
-import sqlite3
-from contextlib import contextmanager
 import uuid
+from crypto_bot.modules.coingecko_client import CoinGeckoClient
+from crypto_bot.modules.api_endpoints import base_url, youtube_client
+from crypto_bot.modules.http_session import get_session, close_session
+from crypto_bot.modules.http_cache import HttpCache, init_http_cache
+from crypto_bot.modules.db_pool import close_all, connection
+from crypto_bot.modules.async_db import close_all as close_databases, database
+from crypto_bot.modules.cache_store import CacheStore, DAILY, NegativeCache, init_cache
+from crypto_bot.modules.rate_limiter import provider_limiter
+from crypto_bot.modules.circuit_breaker import breakers, CircuitOpenError
+from crypto_bot.modules.single_flight import single_flight
+from crypto_bot.modules.prewarm import prewarm_until
+from crypto_bot.modules.price_history import fetch_price_history, price_averages
+from crypto_bot.modules.market_snapshot import COIN_DETAIL_TTL, MARKET_TTL, shared_market_snapshot, fetch_coin_detail
+from crypto_bot.modules.youtube_utils import CHANNEL_TTL, latest_uploads
+from crypto_bot.modules.post_fragments import fragments
+from crypto_bot.modules.post_index import PostIndex
+from crypto_bot.modules.schema import migrate
+from crypto_bot.modules.thread_mgmt import append_history
 
 # Setup logging with custom formatter to suppress repetitive warnings
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,25 +45,24 @@ logger = logging.getLogger(__name__)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 logging.getLogger('googleapiclient').setLevel(logging.WARNING)
 
-# Rate limit tracking
-COINGECKO_REQUESTS = 0
+# Rate limit tracking: one CoinGecko client shared by every call site
 COINGECKO_RATE_LIMIT = 8
-COINGECKO_RESET_TIME = time.time()
 COINGECKO_MAX_RETRIES = 5
+coingecko = CoinGeckoClient(calls_per_minute=COINGECKO_RATE_LIMIT, max_retries=COINGECKO_MAX_RETRIES, backoff=15, base_url=base_url("coingecko"))
 
 def format_number(value):
     try:
-        value = float(value.replace('$', '').replace(',', ''))
-        if value >= 1_000_000_000:
-            return f"${value / 1_000_000_000:.2f}B"
-        elif value >= 1_000_000:
-            return f"${value / 1_000_000:.2f}M"
-        elif value >= 1_000:
-            return f"${value / 1_000:.2f}K"
-        else:
-            return f"${value:,.2f}"
-    except (ValueError, AttributeError):
+        value = float(value)
+    except (TypeError, ValueError):
         return "N/A"
+    if value >= 1_000_000_000:
+        return f"${value / 1_000_000_000:.2f}B"
+    elif value >= 1_000_000:
+        return f"${value / 1_000_000:.2f}M"
+    elif value >= 1_000:
+        return f"${value / 1_000:.2f}K"
+    else:
+        return f"${value:,.2f}"
 
 async def download_vader_lexicon(max_retries=5, delay=10):
     try:
@@ -60,12 +73,12 @@ async def download_vader_lexicon(max_retries=5, delay=10):
         logger.info("VADER lexicon not found. Attempting to download...")
     for attempt in range(max_retries):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head("https://www.google.com", timeout=5) as response:
-                    if response.status == 200:
-                        nltk.download('vader_lexicon', quiet=True)
-                        logger.info("VADER lexicon downloaded successfully.")
-                        return True
+            session = get_session()
+            async with session.head("https://www.google.com", timeout=5) as response:
+                if response.status == 200:
+                    nltk.download('vader_lexicon', quiet=True)
+                    logger.info("VADER lexicon downloaded successfully.")
+                    return True
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.warning(f"No network connectivity (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
@@ -90,12 +103,21 @@ if not os.getenv("DISCORD_TOKEN"):
     logger.error("DISCORD_TOKEN is not set in .env file. Exiting.")
     exit(1)
 
+class CryptoBot(commands.Bot):
+    async def close(self):
+        # Release pooled HTTP/SQLite connections and the cache sweeper together with the bot
+        cache.stop_sweeper()
+        await close_session()
+        await super().close()
+        await close_databases()
+        close_all()
+
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = CryptoBot(command_prefix="!", intents=intents)
 
 # Initialize APIs
-youtube = build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+youtube = youtube_client(os.getenv("YOUTUBE_API_KEY"))
 
 # Validate X API credentials
 x_api_keys = ["X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET"]
@@ -127,80 +149,99 @@ except tweepy.TweepyException as e:
 
 # Initialize VADER sentiment analyzer
 sid = None
-if asyncio.run(download_vader_lexicon()):
+
+async def bootstrap_vader():
+    # Runs in its own event loop before the bot starts, so close the pool it borrowed
+    try:
+        return await download_vader_lexicon()
+    finally:
+        await close_session()
+
+if asyncio.run(bootstrap_vader()):
     sid = SentimentIntensityAnalyzer()
 
 # Configuration
 USE_TOP_ACCOUNTS = True
+# Coins fetched at once by get_ta_data; provider budgets still apply to every call
+COIN_CONCURRENCY = int(os.getenv("COIN_CONCURRENCY", 4))
+# coin_data_cache entries are served as-is for COIN_DATA_TTL, then served stale while a
+# background refresh runs; past COIN_DATA_MAX_STALE callers wait for fresh data
+COIN_DATA_TTL = 3600
+COIN_DATA_MAX_STALE = 24 * 3600
+# X threads go out every POST_INTERVAL seconds; caches are warmed prewarm.PREWARM_LEAD seconds before each
+POST_INTERVAL = 14400
+# Duplicate checks look back this far; thread_mgmt.RETENTION decides how long threads
+# are kept, since every bot shares the table
+HISTORY_DAYS = 2
+# Known-empty answers are remembered for this long per kind and not asked for again meanwhile
+NEGATIVE_TTLS = {
+    "coingecko": 6 * 3600,   # paths CoinGecko answers 404 for, ids it leaves out of /coins/markets
+    "news": 2 * 3600,        # NewsAPI queries with no articles
+    "youtube": 6 * 3600,     # searches with no video from the past week
+    "dappradar": 24 * 3600,  # chains DappRadar lists no dApps for or rejects
+}
+# Calls allowed in flight per provider (the YouTube client is not thread-safe)
+provider_slots = {
+    'youtube': asyncio.Semaphore(1),
+    'dappradar': asyncio.Semaphore(2)
+}
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 DATABASE = os.path.join(DATA_DIR, "crypto_bot.db")
+# Revalidates NewsAPI, DappRadar and CoinGecko responses with ETag/Last-Modified instead of refetching
+http_cache = HttpCache(DATABASE)
+coingecko.cache = http_cache
+# Every cached payload lives in one namespaced store with its own TTL, retention and size
+# bound; hot entries stay decoded in memory and a background sweeper enforces the bounds.
+# The other bots share this database: leases (Namespace.shared) let one process refresh
+# a key while the rest wait for its result instead of calling the API themselves
+cache = CacheStore(DATABASE)
+coin_data_cache = cache.namespace("coin_data", COIN_DATA_TTL, retain=COIN_DATA_MAX_STALE - COIN_DATA_TTL,
+                                  max_entries=100, memory_size=64, compress=True)
+market_cache = cache.namespace("markets", MARKET_TTL, retain=3600, max_entries=200, memory_size=64)
+coin_detail_cache = cache.namespace("coin_detail", COIN_DETAIL_TTL, retain=7 * 24 * 3600, max_entries=100, memory_size=64)
+news_cache = cache.namespace("news", DAILY, retain=7 * 24 * 3600, max_entries=500)
+youtube_cache = cache.namespace("youtube", 3600, retain=24 * 3600, max_entries=500)
+youtube_channel_cache = cache.namespace("youtube_channels", CHANNEL_TTL, retain=30 * 24 * 3600, max_entries=100)
+youtube_summary_cache = cache.namespace("youtube_summary", 3600, retain=24 * 3600, max_entries=10, memory_size=8)
+cache.on_sweep(http_cache.prune)
+negative_cache = NegativeCache(cache, NEGATIVE_TTLS)
+coingecko.negative = negative_cache
+# Duplicate checks against every thread posted within HISTORY_DAYS, by any bot process
+post_index = PostIndex(DATABASE, HISTORY_DAYS * 24 * 3600)
 
 # SQLite database setup
 def init_database():
-    with sqlite3.connect(DATABASE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS thread_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp REAL NOT NULL,
-                post_hashes TEXT NOT NULL,
-                influencers TEXT
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS coin_data_cache (
-                coin_id TEXT PRIMARY KEY,
-                data TEXT NOT NULL,
-                last_updated REAL NOT NULL
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS news_cache (
-                query TEXT PRIMARY KEY,
-                result TEXT NOT NULL,
-                date TEXT NOT NULL
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS youtube_cache (
-                query TEXT PRIMARY KEY,
-                result TEXT NOT NULL,
-                last_updated REAL NOT NULL
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS youtube_summary_cache (
-                query TEXT PRIMARY KEY,
-                result TEXT NOT NULL,
-                last_updated REAL NOT NULL
-            )
-        """)
-        conn.commit()
-
-def clean_news_cache():
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT query, result FROM news_cache")
-        for row in cursor.fetchall():
-            query, result = row
-            try:
-                json.loads(result)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Removing corrupted news_cache entry for query {query}: {e}")
-                cursor.execute("DELETE FROM news_cache WHERE query = ?", (query,))
-        conn.commit()
+    # thread_history, post_hashes and coins are created and upgraded by the shared migrations
+    migrate(DATABASE)
+
+def adopt_legacy_caches():
+    # One-time move of the per-feature cache tables into their namespaces
+    coin_data_cache.adopt("coin_data_cache", "coin_id", "data", "last_updated")
+    coin_detail_cache.adopt("coin_detail_cache", "coin_id", "data", "last_updated")
+    news_cache.adopt("news_cache", "query", "result", "date")
+    # Older databases keep one headline per coin, the same value fetch_news caches
+    news_cache.adopt("news_cache", "coin", ("headline", "url"), "last_updated")
+    youtube_cache.adopt("youtube_cache", "query", "result", "last_updated")
+    youtube_summary_cache.adopt("youtube_summary_cache", "query", "result", "last_updated")
+    # What is left of youtube_cache is the older layout: bare summaries with no query to key them by
+    cache.discard("youtube_cache")
 
-@contextmanager
 def get_db():
-    conn = sqlite3.connect(DATABASE)
-    try:
-        yield conn
-    finally:
-        conn.close()
+    # Pooled connection to the bot database (WAL, busy timeout, cached statements)
+    return connection(DATABASE)
+
+def last_good(entry, label):
+    # An expired cache entry still beats static fallbacks while a provider's circuit is open
+    if not entry:
+        return None
+    logger.warning(f"Serving last good {label}")
+    return entry.value
 
 init_database()
-clean_news_cache()
+init_http_cache(DATABASE)
+init_cache(DATABASE)
+adopt_legacy_caches()
 
 # Coin data
 coin_names = {
@@ -343,17 +384,6 @@ channel_ids = [
     ("UCtQycmSrKdJ0zE0bWumO4vA", "@digitalassetinvestor")
 ]
 
-prior_year_averages = {
-    'ripple': 0.60,
-    'hedera-hashgraph': 0.09,
-    'stellar': 0.11,
-    'xdce-crowd-sale': 0.03,
-    'sui': 0.80,
-    'ondo': 0.25,
-    'algorand': 0.15,
-    'cspr': 0.04
-}
-
 async def test_url(url, session, timeout=5):
     try:
         async with session.head(url, timeout=timeout, allow_redirects=True) as response:
@@ -371,143 +401,77 @@ async def test_url(url, session, timeout=5):
         return False, "https://www.coinbase.com"
 
 async def get_top_coins():
-    global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
     supported_coins = list(coin_names.keys())
-    async with aiohttp.ClientSession() as session:
-        valid_coins = []
-        for attempt in range(COINGECKO_MAX_RETRIES):
-            try:
-                current_time = time.time()
-                if current_time - COINGECKO_RESET_TIME > 60:
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                if COINGECKO_REQUESTS >= COINGECKO_RATE_LIMIT:
-                    wait_time = 60 - (current_time - COINGECKO_RESET_TIME)
-                    if wait_time > 0:
-                        logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds...")
-                        await asyncio.sleep(wait_time)
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                COINGECKO_REQUESTS += 1
-
-                async with session.get(
-                        "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1",
-                        timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    data = await response.json()
-                    if not isinstance(data, list) or not data:
-                        logger.error(f"Invalid CoinGecko response: {data}")
-                        raise ValueError("Empty or invalid response from CoinGecko")
-                    valid_coins = [coin["id"] for coin in data if coin["id"] in supported_coins]
-                    logger.info(f"CoinGecko returned {len(data)} coins, filtered to {len(valid_coins)} supported coins: {valid_coins}")
-
-                    # Validate all supported coins
-                    for coin in supported_coins:
-                        if coin not in valid_coins:
-                            # Check if coin has cached data
-                            with get_db() as conn:
-                                cursor = conn.cursor()
-                                cursor.execute("SELECT data, last_updated FROM coin_data_cache WHERE coin_id = ?", (coin,))
-                                row = cursor.fetchone()
-                                if row and (datetime.now(UTC).timestamp() - row[1]) < 3600:
-                                    valid_coins.append(coin)
-                                    logger.debug(f"Added {coin} to valid_coins based on cached data")
-                                else:
-                                    logger.warning(f"Coin {coin} not found in CoinGecko markets and no recent cache, may use fallback data")
-
-                    coins = valid_coins[:4]
-                    if len(coins) < 4:
-                        logger.warning(f"Insufficient valid coins from CoinGecko ({len(coins)}), supplementing with supported coins.")
-                        needed = 4 - len(coins)
-                        history = load_history()
-                        recent_coins = set()
-                        for entry in history[-1:]:
-                            for post in json.loads(entry['post_hashes']):
-                                for coin in supported_coins:
-                                    if coin_names[coin] in post:
-                                        recent_coins.add(coin)
-                        available_coins = [c for c in supported_coins if c not in coins and c not in recent_coins]
-                        additional_coins = random.sample(available_coins, min(needed, len(available_coins)))
-                        if len(additional_coins) < needed:
-                            remaining = needed - len(additional_coins)
-                            additional_coins.extend(random.sample([c for c in supported_coins if c not in coins and c not in additional_coins], remaining))
-                        coins.extend(additional_coins)
-                        logger.info(f"Supplemented with {additional_coins}")
-                    logger.info(f"Final coins list: {coins}")
-                    return coins
-            except Exception as e:
-                logger.error(f"Error fetching top coins (attempt {attempt + 1}/{COINGECKO_MAX_RETRIES}): {type(e).__name__}: {str(e)}")
-                if attempt < COINGECKO_MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt * 15)
+    session = get_session()
+    valid_coins = []
+    try:
+        data = await coingecko.get(
+            "coins/markets",
+            session,
+            params={"vs_currency": "usd", "order": "market_cap_desc", "per_page": 10, "page": 1}
+        )
+        if not isinstance(data, list):
+            logger.error(f"Invalid CoinGecko response: {data}")
+            raise ValueError("Empty or invalid response from CoinGecko")
+        valid_coins = [coin["id"] for coin in data if coin["id"] in supported_coins]
+        logger.info(f"CoinGecko returned {len(data)} coins, filtered to {len(valid_coins)} supported coins: {valid_coins}")
+
+        # Validate all supported coins
+        for coin in supported_coins:
+            if coin not in valid_coins:
+                # Check if coin has cached data
+                entry = await coin_data_cache.aget(coin)
+                if entry and entry.fresh:
+                    valid_coins.append(coin)
+                    logger.debug(f"Added {coin} to valid_coins based on cached data")
                 else:
-                    logger.warning("Max retries reached, returning fallback coins.")
-                    return random.sample(supported_coins, 4)
-    return random.sample(supported_coins, 4)
-
-def load_history():
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT timestamp, post_hashes, influencers FROM thread_history")
-        history = []
-        for row in cursor.fetchall():
-            try:
-                history.append({
-                    "timestamp": row[0],
-                    "post_hashes": json.loads(row[1]),
-                    "influencers": json.loads(row[2]) if row[2] else []
-                })
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing thread_history JSON for row {row}: {e}")
-                continue
-    return history
+                    logger.warning(f"Coin {coin} not found in CoinGecko markets and no recent cache, may use fallback data")
+
+        coins = valid_coins[:4]
+        if len(coins) < 4:
+            logger.warning(f"Insufficient valid coins from CoinGecko ({len(coins)}), supplementing with supported coins.")
+            needed = 4 - len(coins)
+            recent_coins = await post_index.last_coins()
+            available_coins = [c for c in supported_coins if c not in coins and c not in recent_coins]
+            additional_coins = random.sample(available_coins, min(needed, len(available_coins)))
+            if len(additional_coins) < needed:
+                remaining = needed - len(additional_coins)
+                additional_coins.extend(random.sample([c for c in supported_coins if c not in coins and c not in additional_coins], remaining))
+            coins.extend(additional_coins)
+            logger.info(f"Supplemented with {additional_coins}")
+        logger.info(f"Final coins list: {coins}")
+        return coins
+    except Exception as e:
+        logger.error(f"Error fetching top coins: {type(e).__name__}: {str(e)}")
+        logger.warning("Max retries reached, returning fallback coins.")
+        return random.sample(supported_coins, 4)
 
-def save_history(history):
-    with get_db() as conn:
-        cursor = conn.cursor()
-        for entry in history:
-            try:
-                cursor.execute(
-                    "INSERT OR REPLACE INTO thread_history (timestamp, post_hashes, influencers) VALUES (?, ?, ?)",
-                    (entry["timestamp"], json.dumps(entry["post_hashes"]), json.dumps(entry.get("influencers", [])))
-                )
-            except Exception as e:
-                logger.error(f"Error saving history entry {entry}: {e}")
-                continue
-        conn.commit()
+def save_history(entry):
+    """Append one posted thread and drop threads older than thread_mgmt.RETENTION.
 
-def prune_history(history):
-    cutoff = (datetime.now(UTC) - timedelta(days=2)).timestamp()
-    return [entry for entry in history if entry['timestamp'] > cutoff]
+    Committed by the database's writer task; await the result to wait for the commit.
+    """
+    return database(DATABASE).write(append_history, entry)
 
 def hash_post(post):
     return hashlib.md5(post.encode()).hexdigest()
 
-def is_thread_unique(thread, history):
+async def is_thread_unique(thread):
     thread_hashes = [hash_post(post) for post in thread]
+    posted = await post_index.seen(thread_hashes)
     duplicate_count = 0
     duplicate_posts = []
     for post, post_hash in zip(thread, thread_hashes):
-        for entry in history:
-            if post_hash in entry['post_hashes']:
-                logger.debug(f"Duplicate post detected: hash {post_hash} found in history entry {entry['timestamp']}")
-                duplicate_count += 1
-                duplicate_posts.append(post[:50] + "..." if len(post) > 50 else post)
-                break
+        if post_hash in posted:
+            logger.debug(f"Duplicate post detected: hash {post_hash} was posted within {HISTORY_DAYS} days")
+            duplicate_count += 1
+            duplicate_posts.append(post[:50] + "..." if len(post) > 50 else post)
     if duplicate_count > len(thread) / 2:
         logger.info(f"Skipping thread: {duplicate_count}/{len(thread)} posts are duplicates: {duplicate_posts}")
         return False
     logger.debug(f"Thread is unique: {duplicate_count}/{len(thread)} duplicate posts")
     return True
 
-def get_used_influencers(history):
-    used_influencers = set()
-    cutoff = (datetime.now(UTC) - timedelta(days=2)).timestamp()
-    for entry in history:
-        if entry['timestamp'] > cutoff:
-            for influencer in entry.get('influencers', []):
-                used_influencers.add(influencer)
-    return used_influencers
-
 def score_influencers(influencer_list, followers):
     for influencer in influencer_list:
         # Scale to 100: 50% followers, 30% engagement, 10% accuracy, 10% trend_score
@@ -550,23 +514,26 @@ async def send_discord_message(channel_id, message, files=None):
     return success
 
 async def send_x_thread(thread, chart_urls=None, influencers_per_post=None):
+    limiter = provider_limiter("x")
     parent_id = None
     for i, post in enumerate(thread):
         for attempt in range(3):
             try:
                 if len(post) > 280:
                     post = post[:277] + "..."
+                await limiter.acquire()
                 tweet = x_client.create_tweet(
                     text=post,
                     in_reply_to_tweet_id=parent_id if i > 0 else None
                 )
                 parent_id = tweet.data["id"]
                 logger.info(f"Posted X Tweet {i + 1}: {tweet.data['id']}")
-                await asyncio.sleep(5)
+                limiter.on_success()
                 break
-            except TooManyRequests:
-                logger.warning(f"X rate limit hit for tweet {i + 1}. Waiting 15 minutes...")
-                await asyncio.sleep(900)
+            except TooManyRequests as e:
+                # Wait for the reset X reports (x-rate-limit-reset) rather than a fixed 15 minutes
+                wait = limiter.on_throttle(e.response.headers if e.response is not None else None, default_wait=900)
+                logger.warning(f"X rate limit hit for tweet {i + 1}. Waiting {wait:.0f} seconds...")
             except tweepy.TweepyException as e:
                 logger.error(f"X error for tweet {i + 1}: {e}")
                 if "401" in str(e):
@@ -585,20 +552,16 @@ async def send_x_thread(thread, chart_urls=None, influencers_per_post=None):
                     return False
     return True
 
+@single_flight("news")
+@news_cache.shared()
 async def fetch_news(query):
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT result, date FROM news_cache WHERE query = ?", (query,))
-        row = cursor.fetchone()
-        if row and datetime.fromisoformat(row[1]).date() == datetime.now(UTC).date():
-            try:
-                result = json.loads(row[0])
-                logger.debug(f"Using cached news for {query}")
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing cached news for {query}: {e}")
-                cursor.execute("DELETE FROM news_cache WHERE query = ?", (query,))
-                conn.commit()
+    cached = await news_cache.aget(query)
+    if cached and cached.fresh:
+        logger.debug(f"Using cached news for {query}")
+        return cached.value
+    if await negative_cache.ahit("news", query):
+        logger.debug(f"NewsAPI had nothing for {query} recently, not asking again yet")
+        return {"headline": f"No new updates for {query} today", "url": ""}
 
     newsapi_key = os.getenv('NEWSAPI_KEY')
     if not newsapi_key:
@@ -608,141 +571,112 @@ async def fetch_news(query):
     async def fetch_with_backoff(url, session, max_attempts=3):
         for attempt in range(max_attempts):
             try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 429:
-                        retry_after = int(response.headers.get('Retry-After', 60))
-                        logger.warning(f"NewsAPI rate limit hit for {query}, waiting {retry_after} seconds...")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    data = await response.json()
-                    if not data:
-                        logger.error(f"Empty response from NewsAPI for {query}")
-                        return None
-                    return data
+                response = await http_cache.get(session, url, limiter=provider_limiter("newsapi"))
+                if response.status == 429:
+                    # The NewsAPI limiter is paused until the reset; the next attempt waits for it
+                    logger.warning(f"NewsAPI rate limit hit for {query}")
+                    continue
+                data = response.data
+                if not data:
+                    logger.error(f"Empty response from NewsAPI for {query}")
+                    return None
+                breakers.success("newsapi")
+                return data
             except Exception as e:
                 logger.error(f"Error fetching news attempt {attempt + 1}: {e}")
+                if breakers.failure("newsapi"):
+                    break
                 if attempt < max_attempts - 1:
                     await asyncio.sleep(2 ** attempt)
         return None
 
-    async with aiohttp.ClientSession() as session:
-        url = f"https://newsapi.org/v2/everything?q={query}&language=en&sortBy=publishedAt&apiKey={newsapi_key}"
-        data = await fetch_with_backoff(url, session)
-        if not data or data.get("status") != "ok" or not data.get("articles"):
-            logger.debug(f"No relevant news found for {query}")
-            result = {"headline": f"No new updates for {query} today", "url": ""}
-        else:
-            article = data["articles"][0]
-            headline = article.get("title", "No headline available")[:100]
-            article_url = article.get("url", "")
-            keywords = ["filed", "approved", "rejected", "settlement", "paused", "appeal", "ruling", "partnership", "launch", "update", "announce", "integrate", "collaborate"]
-            if not any(keyword in headline.lower() for keyword in keywords):
-                headline = article.get("title", f"No significant updates for {query} today")[:100]
-                article_url = article.get("url", "") if article.get("url") else ""
-            result = {"headline": headline, "url": article_url}
-
-        with get_db() as conn:
-            cursor = conn.cursor()
-            if result and "headline" in result and "url" in result:
-                try:
-                    cursor.execute(
-                        "INSERT OR REPLACE INTO news_cache (query, result, date) VALUES (?, ?, ?)",
-                        (query, json.dumps(result), datetime.now(UTC).isoformat())
-                    )
-                    conn.commit()
-                except Exception as e:
-                    logger.error(f"Error caching news for {query}: {e}")
-            else:
-                logger.warning(f"Skipping cache for {query}: invalid result {result}")
-        return result
+    session = get_session()
+    url = f"{base_url('newsapi')}/everything?q={query}&language=en&sortBy=publishedAt&apiKey={newsapi_key}"
+    try:
+        breakers.check("newsapi")
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping NewsAPI for {query}: {e}")
+        return last_good(cached, f"news for {query}") or {"headline": f"No new updates for {query} today", "url": ""}
+    data = await fetch_with_backoff(url, session)
+    if not data or data.get("status") != "ok":
+        # A failed fetch is not an empty answer: serve what we had and cache nothing
+        return last_good(cached, f"news for {query}") or {"headline": f"No new updates for {query} today", "url": ""}
+    if not data.get("articles"):
+        logger.debug(f"No relevant news found for {query}")
+        negative_cache.remember("news", query, "no articles")
+        return {"headline": f"No new updates for {query} today", "url": ""}
+    article = data["articles"][0]
+    headline = article.get("title", "No headline available")[:100]
+    article_url = article.get("url", "")
+    keywords = ["filed", "approved", "rejected", "settlement", "paused", "appeal", "ruling", "partnership", "launch", "update", "announce", "integrate", "collaborate"]
+    if not any(keyword in headline.lower() for keyword in keywords):
+        headline = article.get("title", f"No significant updates for {query} today")[:100]
+        article_url = article.get("url", "") if article.get("url") else ""
+    result = {"headline": headline, "url": article_url}
+
+    if result and "headline" in result and "url" in result:
+        news_cache.put(query, result)
+    else:
+        logger.warning(f"Skipping cache for {query}: invalid result {result}")
+    return result
 
 async def get_youtube_summary():
     query = "crypto_market_summary"
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT result, last_updated FROM youtube_summary_cache WHERE query = ?", (query,))
-        row = cursor.fetchone()
-        if row and (datetime.now(UTC).timestamp() - row[1]) < 3600:
-            try:
-                result = json.loads(row[0])
-                logger.debug("Using cached YouTube summary")
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing cached YouTube summary: {e}")
-                cursor.execute("DELETE FROM youtube_summary_cache WHERE query = ?", (query,))
-                conn.commit()
+    cached = await youtube_summary_cache.aget(query)
+    if cached and cached.fresh:
+        logger.debug("Using cached YouTube summary")
+        return cached.value
+
+    # Channel metadata is cached, so a refresh is one playlist call per channel plus one videos call
+    try:
+        async with provider_slots['youtube']:
+            latest = await asyncio.to_thread(
+                latest_uploads, youtube, youtube_channel_cache, [channel_id for channel_id, _ in channel_ids]
+            )
+    except Exception as e:
+        logger.error(f"Error fetching YouTube uploads: {type(e).__name__}: {str(e)}")
+        latest = {channel_id: e for channel_id, _ in channel_ids}
 
     summaries = []
     for channel_id, channel_name in channel_ids:
-        try:
-            channel_response = youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            ).execute()
-            if "items" not in channel_response or not channel_response["items"]:
-                summaries.append(f"{channel_name}: No channel found")
-                continue
-            uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-            playlist_response = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=uploads_playlist_id,
-                maxResults=1
-            ).execute()
-
-            if "items" not in playlist_response or not playlist_response["items"]:
-                summaries.append(f"{channel_name}: No videos found")
-                continue
-            video = playlist_response["items"][0]["snippet"]
-            video_id = video["resourceId"]["videoId"]
-            video_response = youtube.videos().list(
-                part="snippet",
-                id=video_id
-            ).execute()
-            description = video_response["items"][0]["snippet"]["description"] if video_response["items"] else ""
-            summary = video["title"] if len(video["title"]) <= 60 else description.split('.')[0].strip()[:57] + "..."
-            summaries.append(f"{channel_name}: {summary} youtu.be/{video_id}")
-        except Exception as e:
-            logger.error(f"Error fetching YouTube data for {channel_name}: {type(e).__name__}: {str(e)}")
+        video = latest.get(channel_id)
+        if isinstance(video, Exception):
+            logger.error(f"Error fetching YouTube data for {channel_name}: {type(video).__name__}: {str(video)}")
             summaries.append(f"{channel_name}: Error fetching video")
-        await asyncio.sleep(1)
+        elif channel_id not in latest:
+            summaries.append(f"{channel_name}: No channel found")
+        elif video is None:
+            summaries.append(f"{channel_name}: No videos found")
+        else:
+            summary = video["title"] if len(video["title"]) <= 60 else video["description"].split('.')[0].strip()[:57] + "..."
+            summaries.append(f"{channel_name}: {summary} youtu.be/{video['video_id']}")
 
     result = "\n".join(summaries)[:200] + ("..." if len("\n".join(summaries)) > 200 else "")
-    with get_db() as conn:
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                "INSERT OR REPLACE INTO youtube_summary_cache (query, result, last_updated) VALUES (?, ?, ?)",
-                (query, json.dumps(result), datetime.now(UTC).timestamp())
-            )
-            conn.commit()
-        except Exception as e:
-            logger.error(f"Error caching YouTube summary: {e}")
+    youtube_summary_cache.put(query, result)
     return result
 
+@single_flight("YouTube")
 async def fetch_youtube_content(query, session):
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT result, last_updated FROM youtube_cache WHERE query = ?", (query,))
-        row = cursor.fetchone()
-        if row and (datetime.now(UTC).timestamp() - row[1]) < 3600:
-            try:
-                result = json.loads(row[0])
-                logger.debug(f"Using cached YouTube data for {query}")
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing cached YouTube data for {query}: {e}")
-                cursor.execute("DELETE FROM youtube_cache WHERE query = ?", (query,))
-                conn.commit()
+    cached = await youtube_cache.aget(query)
+    if cached and cached.fresh:
+        logger.debug(f"Using cached YouTube data for {query}")
+        return cached.value
+    if await negative_cache.ahit("youtube", query):
+        logger.debug(f"No recent YouTube videos for {query} last time, not searching again yet")
+        return {"youtube": "No recent videos found", "youtube_score": 0}
 
     try:
-        search_response = youtube.search().list(
-            part="snippet",
-            q=query,
-            type="video",
-            order="date",
-            maxResults=1,
-            publishedAfter=(datetime.now(UTC) - timedelta(days=7)).isoformat()
-        ).execute()
+        breakers.check("youtube")
+        async with provider_slots['youtube']:
+            search_response = await asyncio.to_thread(youtube.search().list(
+                part="snippet",
+                q=query,
+                type="video",
+                order="date",
+                maxResults=1,
+                publishedAfter=(datetime.now(UTC) - timedelta(days=7)).isoformat()
+            ).execute)
+        breakers.success("youtube")
 
         videos = search_response.get("items", [])
         if videos:
@@ -753,82 +687,78 @@ async def fetch_youtube_content(query, session):
                 "youtube_score": 10 if "fundamental" in video["title"].lower() else 5
             }
         else:
-            result = {"youtube": "No recent videos found", "youtube_score": 0}
+            negative_cache.remember("youtube", query, "no videos in the past week")
+            return {"youtube": "No recent videos found", "youtube_score": 0}
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping YouTube for {query}: {e}")
+        return last_good(cached, f"YouTube data for {query}") or {"youtube": "No recent videos found", "youtube_score": 0}
     except Exception as e:
         logger.error(f"Error fetching YouTube for {query}: {type(e).__name__}: {str(e)}")
+        breakers.failure("youtube")
         result = {"youtube": f"Error: {e}", "youtube_score": 0}
 
-    with get_db() as conn:
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                "INSERT OR REPLACE INTO youtube_cache (query, result, last_updated) VALUES (?, ?, ?)",
-                (query, json.dumps(result), datetime.now(UTC).timestamp())
-            )
-            conn.commit()
-        except Exception as e:
-            logger.error(f"Error caching YouTube data for {query}: {e}")
+    youtube_cache.put(query, result)
     return result
 
 async def curate_content(coins, coin_names):
     content_data = {}
-    async with aiohttp.ClientSession() as session:
-        for coin in coins:
-            if coin not in coin_names:
-                logger.warning(f"Skipping unsupported coin: {coin}")
-                content_data[coin] = {"youtube": "Unsupported coin", "youtube_score": 0, "x_accounts": "N/A"}
-                continue
-            try:
-                youtube_data = await fetch_youtube_content(f"{coin_names[coin]} fundamentals", session)
-                content_data[coin] = youtube_data
-            except Exception as e:
-                logger.error(f"Error curating YouTube for {coin}: {type(e).__name__}: {str(e)}")
-                content_data[coin] = {"youtube": f"Error: {e}", "youtube_score": 0}
-
-            scored_accounts = []
-            token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
-            influencer_list = influencers.get(token_key, [])
-            if influencer_list:
-                scored_influencers = score_influencers(influencer_list, 0)
-                for influencer in scored_influencers[:2]:
-                    score = influencer['total_score']
-                    reason = influencer['reason']
-                    scored_accounts.append(f"{influencer['handle']} ({reason}, {score:.0f}/100)")
-                content_data[coin]["x_accounts"] = ", ".join(scored_accounts) if scored_accounts else "No accounts curated"
-            else:
-                content_data[coin]["x_accounts"] = "No accounts curated"
-            await asyncio.sleep(1)
+    session = get_session()
+    for coin in coins:
+        if coin not in coin_names:
+            logger.warning(f"Skipping unsupported coin: {coin}")
+            content_data[coin] = {"youtube": "Unsupported coin", "youtube_score": 0, "x_accounts": "N/A"}
+            continue
+        try:
+            youtube_data = await fetch_youtube_content(f"{coin_names[coin]} fundamentals", session)
+            # Copy: the result may be shared with a concurrent caller
+            content_data[coin] = dict(youtube_data)
+        except Exception as e:
+            logger.error(f"Error curating YouTube for {coin}: {type(e).__name__}: {str(e)}")
+            content_data[coin] = {"youtube": f"Error: {e}", "youtube_score": 0}
+
+        scored_accounts = []
+        token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
+        influencer_list = influencers.get(token_key, [])
+        if influencer_list:
+            scored_influencers = score_influencers(influencer_list, 0)
+            for influencer in scored_influencers[:2]:
+                score = influencer['total_score']
+                reason = influencer['reason']
+                scored_accounts.append(f"{influencer['handle']} ({reason}, {score:.0f}/100)")
+            content_data[coin]["x_accounts"] = ", ".join(scored_accounts) if scored_accounts else "No accounts curated"
+        else:
+            content_data[coin]["x_accounts"] = "No accounts curated"
     return content_data
 
 async def get_top_accounts(coin, days=7):
     logger.debug(f"Fetching community data for {coin} (X API free-tier workaround)...")
-    async with aiohttp.ClientSession() as session:
-        try:
-            url = f"https://api.coingecko.com/api/v3/coins/{coin}?localization=false&tickers=false&market_data=false&community_data=true&developer_data=false&sparkline=false"
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                data = await response.json()
-                if not data:
-                    logger.error(f"Empty response from CoinGecko for {coin}")
-                    raise ValueError("Empty response")
-                followers = data.get('community_data', {}).get('twitter_followers', 0)
-                token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
-                top_influencers = influencers.get(token_key, [])[:3]
-                accounts = [
-                    {
-                        "username": influencer["handle"],
-                        "engagement": influencer["engagement"] * 100,
-                        "text": f"Positive sentiment for {coin_names[coin]} based on {followers:,} Twitter followers!"
-                    } for influencer in top_influencers
-                ]
-                logger.debug(f"Generated {len(accounts)} accounts for {coin} with {followers:,} followers")
-                return accounts
-        except Exception as e:
-            logger.error(f"Error fetching community data for {coin}: {e}")
-            return [
-                {"username": f"@{coin}_user1", "engagement": random.randint(100, 1000), "text": f"Excited about {coin}!"},
-                {"username": f"@{coin}_user2", "engagement": random.randint(50, 500), "text": f"{coin} is the future!"},
-                {"username": f"@{coin}_user3", "engagement": random.randint(10, 200), "text": f"Checking {coin} charts"}
-            ]
+    session = get_session()
+    try:
+        data = await coingecko.get(
+            f"coins/{coin}",
+            session,
+            params={"localization": "false", "tickers": "false", "market_data": "false", "community_data": "true", "developer_data": "false", "sparkline": "false"},
+            max_attempts=1
+        )
+        followers = data.get('community_data', {}).get('twitter_followers', 0)
+        token_key = token_symbols.get(coin, coin_names[coin].split()[0].upper())
+        top_influencers = influencers.get(token_key, [])[:3]
+        accounts = [
+            {
+                "username": influencer["handle"],
+                "engagement": influencer["engagement"] * 100,
+                "text": f"Positive sentiment for {coin_names[coin]} based on {followers:,} Twitter followers!"
+            } for influencer in top_influencers
+        ]
+        logger.debug(f"Generated {len(accounts)} accounts for {coin} with {followers:,} followers")
+        return accounts
+    except Exception as e:
+        logger.error(f"Error fetching community data for {coin}: {e}")
+        return [
+            {"username": f"@{coin}_user1", "engagement": random.randint(100, 1000), "text": f"Excited about {coin}!"},
+            {"username": f"@{coin}_user2", "engagement": random.randint(50, 500), "text": f"{coin} is the future!"},
+            {"username": f"@{coin}_user3", "engagement": random.randint(10, 200), "text": f"Checking {coin} charts"}
+        ]
 
 async def analyze_engagement(top_accounts, coin):
     analysis = []
@@ -862,8 +792,8 @@ async def fetch_dapp_data(coin, session):
         'hedera-hashgraph': 'hedera',
     }
     chain = chain_mapping.get(coin.lower())
-    if not chain:
-        logger.debug(f"No DappRadar support for {coin}, using project_sources")
+    if not chain or await negative_cache.ahit("dappradar", chain):
+        logger.debug(f"No DappRadar data for {coin}, using project_sources")
         projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
         return {
             'dapp_count': project_sources[coin]['total_projects'],
@@ -872,41 +802,47 @@ async def fetch_dapp_data(coin, session):
         }
 
     try:
-        url = f"https://apis.dappradar.com/v2/dapps?chain={chain}&sort=transactions&order=desc&page=1&resultsPerPage=5"
+        breakers.check("dappradar", chain)
+        url = f"{base_url('dappradar')}/dapps?chain={chain}&sort=transactions&order=desc&page=1&resultsPerPage=5"
         headers = {'X-Api-Key': os.getenv('DAPPRADAR_API_KEY')}
-        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-            if response.status == 429:
-                logger.warning(f"DappRadar rate limit hit for {coin}, falling back to project_sources")
-                projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
-                return {
-                    'dapp_count': project_sources[coin]['total_projects'],
-                    'top_projects': [projects],
-                    'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
-                }
-            data = await response.json()
-            if not data.get('results'):
-                logger.debug(f"No dApps found for {coin} on DappRadar, using project_sources")
-                projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
-                return {
-                    'dapp_count': project_sources[coin]['total_projects'],
-                    'top_projects': [projects],
-                    'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
-                }
-
-            dapp_count = data.get('totalResults', project_sources[coin]['total_projects'])
-            top_projects = [(dapp['name'], dapp['description'], dapp['website'] if dapp.get('website') else "") for dapp in data['results'][:1]]
-            top_project_metrics = {
-                'public_interest': f"{data['results'][0]['dailyUsers']} daily users" if data['results'] else 'N/A',
-                'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"
+        async with provider_slots['dappradar']:
+            response = await http_cache.get(session, url, headers=headers, limiter=provider_limiter("dappradar"))
+        if response.status == 429:
+            logger.warning(f"DappRadar rate limit hit for {coin}, falling back to project_sources")
+            projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
+            return {
+                'dapp_count': project_sources[coin]['total_projects'],
+                'top_projects': [projects],
+                'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
             }
-            logger.info(f"Fetched {dapp_count} dApps for {coin} from DappRadar")
+        breakers.success("dappradar", chain)
+        data = response.data
+        if response.status in (400, 404) or not data.get('results'):
+            logger.debug(f"No dApps found for {coin} on DappRadar, using project_sources")
+            negative_cache.remember("dappradar", chain, f"HTTP {response.status}" if response.status >= 400 else "no dApps")
+            projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
             return {
-                'dapp_count': dapp_count,
-                'top_projects': top_projects,
-                'top_project_metrics': top_project_metrics
+                'dapp_count': project_sources[coin]['total_projects'],
+                'top_projects': [projects],
+                'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
             }
+
+        dapp_count = data.get('totalResults', project_sources[coin]['total_projects'])
+        top_projects = [(dapp['name'], dapp['description'], dapp['website'] if dapp.get('website') else "") for dapp in data['results'][:1]]
+        top_project_metrics = {
+            'public_interest': f"{data['results'][0]['dailyUsers']} daily users" if data['results'] else 'N/A',
+            'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"
+        }
+        logger.info(f"Fetched {dapp_count} dApps for {coin} from DappRadar")
+        return {
+            'dapp_count': dapp_count,
+            'top_projects': top_projects,
+            'top_project_metrics': top_project_metrics
+        }
     except Exception as e:
         logger.error(f"Error fetching DappRadar data for {coin}: {e}")
+        if not isinstance(e, CircuitOpenError):
+            breakers.failure("dappradar", chain)
         projects = random.choice(daily_projects.get(coin, [])) if daily_projects.get(coin) else ("N/A", "No project data", "")
         return {
             'dapp_count': project_sources[coin]['total_projects'],
@@ -914,41 +850,10 @@ async def fetch_dapp_data(coin, session):
             'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
         }
 
-async def fetch_historical_data(coin, session, days=14):
-    historical_data = []
-    end_date = datetime.now(UTC).date() - timedelta(days=1)
-    start_date = end_date - timedelta(days=days)
-    current_date = start_date
-    missing_data_count = 0
-
-    while current_date <= end_date:
-        date_str = current_date.strftime("%d-%m-%Y")
-        url = f"https://api.coingecko.com/api/v3/coins/{coin}/history?date={date_str}&localization=false"
-        try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                data = await response.json()
-                if not data:
-                    logger.debug(f"Empty response for {coin} on {date_str}")
-                    missing_data_count += 1
-                    continue
-                if 'market_data' in data:
-                    historical_data.append({
-                        'date': datetime.strptime(date_str, "%d-%m-%Y").timestamp(),
-                        'price': data['market_data']['current_price']['usd'],
-                        'volume': data['market_data']['total_volume']['usd'],
-                        'market_cap': data['market_data']['market_cap']['usd']
-                    })
-                else:
-                    logger.debug(f"No market data for {coin} on {date_str}")
-                    missing_data_count += 1
-        except Exception as e:
-            logger.error(f"Error fetching historical data for {coin} on {date_str}: {e}")
-            missing_data_count += 1
-        current_date += timedelta(days=1)
-        await asyncio.sleep(1)
-
-    logger.info(f"Historical data for {coin}: {len(historical_data)} days fetched, {missing_data_count} days missing")
-    return historical_data
+async def fetch_historical_data(coin, session, days=60):
+    # Past days never change, so only the gaps in the local store hit CoinGecko; 60 days
+    # cover ma_30 and the month before it
+    return await fetch_price_history(coingecko, session, DATABASE, coin, days)
 
 def predict_price(historical_data, coin):
     if len(historical_data) < 3:
@@ -1003,70 +908,124 @@ def predict_price(historical_data, coin):
 
     return predicted_price, explanation
 
-async def fetch_coin_data(coin, session):
-    global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT data, last_updated FROM coin_data_cache WHERE coin_id = ?", (coin,))
-        row = cursor.fetchone()
-        if row and (datetime.now(UTC).timestamp() - row[1]) < 3600:
-            try:
-                result = json.loads(row[0])
-                logger.debug(f"Using cached coin data for {coin}")
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing cached coin data for {coin}: {e}")
-                cursor.execute("DELETE FROM coin_data_cache WHERE coin_id = ?", (coin,))
-                conn.commit()
-
-    async def fetch_with_backoff(url, session, max_attempts=COINGECKO_MAX_RETRIES):
-        global COINGECKO_REQUESTS, COINGECKO_RESET_TIME
-        for attempt in range(max_attempts):
-            try:
-                current_time = time.time()
-                if current_time - COINGECKO_RESET_TIME > 60:
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                if COINGECKO_REQUESTS >= COINGECKO_RATE_LIMIT:
-                    wait_time = 60 - (current_time - COINGECKO_RESET_TIME)
-                    if wait_time > 0:
-                        logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds...")
-                        await asyncio.sleep(wait_time)
-                    COINGECKO_REQUESTS = 0
-                    COINGECKO_RESET_TIME = current_time
-                COINGECKO_REQUESTS += 1
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 429:
-                        retry_after = int(response.headers.get('Retry-After', 180))
-                        logger.warning(f"CoinGecko rate limit hit for {url}, waiting {retry_after} seconds...")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    data = await response.json()
-                    if not data or 'error' in data:
-                        raise ValueError(f"Invalid response from {url}: {data.get('error', 'No data')}")
-                    return data
-            except Exception as e:
-                logger.error(f"Error fetching {url} attempt {attempt + 1}: {type(e).__name__} - {str(e)}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2 ** attempt * 15)
-                else:
-                    raise
-        raise ValueError(f"Failed to fetch {url} after {max_attempts} attempts")
+def fallback_coin_data(coin, content_data=None):
+    """Placeholder record for a coin whose live data could not be fetched."""
+    content = (content_data or {}).get(coin, {})
+    projects = random.choice(daily_projects.get(coin, [("N/A", "No project data", "")]))
+    return {
+        "coin": coin_names[coin],
+        "text": f"{coin_names[coin]}: Price unavailable",
+        "price": None,
+        "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
+        "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
+        "market_cap": "N/A",
+        "projects": project_sources[coin]["count"],
+        "partnerships": project_sources[coin]["partnerships"],
+        "project_source": project_sources[coin]["source"],
+        "project_url": project_sources[coin]["url"],
+        "total_projects": project_sources[coin]["total_projects"],
+        "top_projects": [projects],
+        "top_project_metrics": {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
+        "volume": 0,
+        "exchange": exchange_links[coin],
+        "price_change_24h": 0,
+        "trend": "N/A",
+        "ma_30": None,
+        "prior_month_avg": None,
+        "fundamentals": "N/A",
+        "onchain_metrics": {
+            "transaction_volume": "N/A",
+            "active_addresses_proxy": "N/A",
+            "tvl": "N/A",
+            "developer_activity": "N/A"
+        },
+        "curated_youtube": content.get("youtube", "N/A"),
+        "curated_x": content.get("x_accounts", "No accounts curated"),
+        "twitter_followers": 0,
+        "predicted_price": "N/A",
+        "prediction_explanation": "N/A"
+    }
 
+def apply_market(data, coin, market):
+    """Write the fast-moving snapshot fields (price, change, volume, cap) into a coin entry."""
+    data.update({
+        "text": f"{coin_names[coin]}: ${market['price']:.2f}",
+        "price": market['price'],
+        "full_text": f"{coin_names[coin]}: ${market['price']:.2f} ({market['price_change_24h']:.2f}% 24h)",
+        "market_cap": f"${market['market_cap']:,}",
+        "volume": market['volume'],
+        "price_change_24h": market['price_change_24h'],
+        "trend": "Bullish" if market['price_change_24h'] > 0 else "Bearish"
+    })
+    if isinstance(data.get("onchain_metrics"), dict):
+        data["onchain_metrics"]["transaction_volume"] = f"${market['volume']:,}"
+    return data
+
+async def fetch_coin_data(coin, session, snapshot=None):
+    # Entries are kept until COIN_DATA_MAX_STALE, so anything returned here may be served
+    cached = await coin_data_cache.aget(coin)
+    if cached:
+        if cached.fresh:
+            logger.debug(f"Using cached coin data for {coin}")
+        else:
+            # Stale-while-revalidate: answer now, refresh detail/history/DappRadar in the background
+            logger.info(f"Serving coin data for {coin} from {cached.age / 60:.0f} min ago, refreshing in background")
+            refresh_coin_data.start(coin, session, snapshot)
+        market = (snapshot or {}).get(coin)
+        # The cached dict is shared; overlay prices on a copy
+        return apply_market(copy.deepcopy(cached.value), coin, market) if market else cached.value
+    return await refresh_coin_data(coin, session, snapshot)
+
+@single_flight("coin data")
+@coin_data_cache.shared(lease=300, wait=120)
+async def refresh_coin_data(coin, session, snapshot=None):
+    if snapshot is None:
+        try:
+            snapshot = await shared_market_snapshot(coingecko, session, market_cache, [coin])
+        except Exception as e:
+            logger.error(f"Error fetching market snapshot for {coin}: {e}")
+            snapshot = {}
+    if coin not in snapshot:
+        # CoinGecko is failing for this coin (or its circuit is open): answer from cache at once
+        cached = last_good(await coin_data_cache.aget(coin), f"coin data for {coin}")
+        if cached:
+            return cached
+        if await negative_cache.ahit("coingecko", f"coins/{coin}"):
+            # Rejected id: detail/history/YouTube/DappRadar lookups would all be wasted
+            logger.info(f"CoinGecko does not list {coin}, using fallback data")
+            return fallback_coin_data(coin)
+
+    # Prices come from the batched snapshot; the slow-changing detail payload, YouTube,
+    # history and DappRadar are independent, so fetch them together
+    detail, content_data, historical_data, dapp_data = await asyncio.gather(
+        fetch_coin_detail(coingecko, session, coin_detail_cache, coin),
+        curate_content([coin], coin_names),
+        fetch_historical_data(coin, session),
+        fetch_dapp_data(coin, session),
+        return_exceptions=True
+    )
+    if isinstance(detail, Exception):
+        logger.warning(f"No community/developer data for {coin}: {detail}")
+        detail = {"twitter_followers": 0, "code_changes_4w": 0}
+    if isinstance(content_data, Exception):
+        logger.error(f"Error curating content for {coin}: {content_data}")
+        content_data = {}
+    if isinstance(historical_data, Exception):
+        logger.error(f"Error fetching historical data for {coin}: {historical_data}")
+        historical_data = []
     try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin}?localization=false&tickers=false&market_data=true&community_data=true&developer_data=true&sparkline=false"
-        data = await fetch_with_backoff(url, session)
-        content_data = await curate_content([coin], coin_names)
-        historical_data = await fetch_historical_data(coin, session)
-        predicted_price, prediction_explanation = predict_price(historical_data, coin) if historical_data else (None, "N/A")
-        dapp_data = await fetch_dapp_data(coin, session)
+        market = snapshot.get(coin)
+        if not market:
+            raise ValueError(f"{coin} missing from market snapshot")
+        if isinstance(dapp_data, Exception):
+            raise dapp_data
+        # The model is fit on the last two weeks only
+        predicted_price, prediction_explanation = (await asyncio.to_thread(predict_price, historical_data[-14:], coin)) if historical_data else (None, "N/A")
+        ma_30, prior_month_avg = price_averages(historical_data)
 
         result = {
             "coin": coin_names[coin],
-            "text": f"{coin_names[coin]}: ${data['market_data']['current_price']['usd']:.2f}",
-            "full_text": f"{coin_names[coin]}: ${data['market_data']['current_price']['usd']:.2f} ({data['market_data']['price_change_percentage_24h']:.2f}% 24h)",
             "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-            "market_cap": f"${data['market_data']['market_cap']['usd']:,}",
             "projects": project_sources[coin]["count"],
             "partnerships": project_sources[coin]["partnerships"],
             "project_source": project_sources[coin]["source"],
@@ -1074,172 +1033,148 @@ async def fetch_coin_data(coin, session):
             "total_projects": dapp_data['dapp_count'],
             "top_projects": dapp_data['top_projects'],
             "top_project_metrics": dapp_data['top_project_metrics'],
-            "volume": data['market_data']['total_volume']['usd'],
             "exchange": exchange_links[coin],
-            "price_change_24h": data['market_data']['price_change_percentage_24h'],
-            "trend": "Bullish" if data['market_data']['price_change_percentage_24h'] > 0 else "Bearish",
-            "ma_30": prior_year_averages.get(coin, 0),
-            "prior_month_avg": prior_year_averages.get(coin, 0),
+            "ma_30": ma_30,
+            "prior_month_avg": prior_month_avg,
             "fundamentals": "N/A",
             "onchain_metrics": {
-                "transaction_volume": f"${data['market_data']['total_volume']['usd']:,}",
-                "active_addresses_proxy": f"{data.get('community_data', {}).get('twitter_followers', 0):,} Twitter followers",
+                "active_addresses_proxy": f"{detail['twitter_followers']:,} Twitter followers",
                 "tvl": "N/A",
-                "developer_activity": f"{data.get('developer_data', {}).get('code_additions_deletions_4_weeks', 0)} code changes (4w)"
+                "developer_activity": f"{detail['code_changes_4w']} code changes (4w)"
             },
             "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
             "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-            "twitter_followers": data.get('community_data', {}).get('twitter_followers', 0),
+            "twitter_followers": detail['twitter_followers'],
             "predicted_price": f"${predicted_price:.2f}" if predicted_price else "N/A",
             "prediction_explanation": prediction_explanation
         }
-        with get_db() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute(
-                    "INSERT OR REPLACE INTO coin_data_cache (coin_id, data, last_updated) VALUES (?, ?, ?)",
-                    (coin, json.dumps(result), datetime.now(UTC).timestamp())
-                )
-                conn.commit()
-            except Exception as e:
-                logger.error(f"Error caching coin data for {coin}: {e}")
+        apply_market(result, coin, market)
+        coin_data_cache.put(coin, result)
         return result
     except Exception as e:
         logger.error(f"Failed to fetch data for {coin}: {e}")
-        content_data = await curate_content([coin], coin_names)
-        dapp_data = {
-            'dapp_count': project_sources[coin]['total_projects'],
-            'top_projects': [random.choice(daily_projects.get(coin, [("N/A", "No project data", "")]))],
-            'top_project_metrics': {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"}
-        }
-        return {
-            "coin": coin_names[coin],
-            "text": f"{coin_names[coin]}: Price unavailable",
-            "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-            "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-            "market_cap": "N/A",
-            "projects": project_sources[coin]["count"],
-            "partnerships": project_sources[coin]["partnerships"],
-            "project_source": project_sources[coin]["source"],
-            "project_url": project_sources[coin]["url"],
-            "total_projects": dapp_data['dapp_count'],
-            "top_projects": dapp_data['top_projects'],
-            "top_project_metrics": dapp_data['top_project_metrics'],
-            "volume": 0,
-            "exchange": exchange_links[coin],
-            "price_change_24h": 0,
-            "trend": "N/A",
-            "ma_30": prior_year_averages.get(coin, 0),
-            "prior_month_avg": prior_year_averages.get(coin, 0),
-            "fundamentals": "N/A",
-            "onchain_metrics": {
-                "transaction_volume": "N/A",
-                "active_addresses_proxy": "N/A",
-                "tvl": "N/A",
-                "developer_activity": "N/A"
-            },
-            "curated_youtube": content_data.get(coin, {}).get("youtube", "N/A"),
-            "curated_x": content_data.get(coin, {}).get("x_accounts", "N/A"),
-            "twitter_followers": 0,
-            "predicted_price": "N/A",
-            "prediction_explanation": "N/A"
-        }
+        return fallback_coin_data(coin, content_data)
 
+# !crypto_update and the posting loop can overlap; the second caller joins the running fetch
+@single_flight("TA data", key=lambda: "top_coins")
 async def get_ta_data():
-    ta_data = []
     coins = await get_top_coins()
-    async with aiohttp.ClientSession() as session:
-        logger.info(f"Fetching data for coins: {coins}")
-        for coin in coins:
+    slots = asyncio.Semaphore(COIN_CONCURRENCY)
+
+    async def fetch_one(coin, session, snapshot):
+        async with slots:
             try:
-                data = await fetch_coin_data(coin, session)
+                data = await fetch_coin_data(coin, session, snapshot)
                 if not isinstance(data, dict):
                     raise ValueError(f"Invalid data type for {coin}: {type(data)}")
-                ta_data.append(data)
+                return data
             except Exception as e:
                 logger.error(f"Failed to fetch data for {coin}: {e}")
-                projects = random.choice(daily_projects.get(coin, [("N/A", "No project data", "")]))
-                ta_data.append({
-                    "coin": coin_names[coin],
-                    "text": f"{coin_names[coin]}: Price unavailable",
-                    "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-                    "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-                    "market_cap": "N/A",
-                    "projects": project_sources[coin]["count"],
-                    "partnerships": project_sources[coin]["partnerships"],
-                    "project_source": project_sources[coin]["source"],
-                    "project_url": project_sources[coin]["url"],
-                    "total_projects": project_sources[coin]["total_projects"],
-                    "top_projects": [projects],
-                    "top_project_metrics": {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
-                    "volume": 0,
-                    "exchange": exchange_links[coin],
-                    "price_change_24h": 0,
-                    "trend": "N/A",
-                    "ma_30": prior_year_averages.get(coin, 0),
-                    "prior_month_avg": prior_year_averages.get(coin, 0),
-                    "fundamentals": "N/A",
-                    "onchain_metrics": {
-                        "transaction_volume": "N/A",
-                        "active_addresses_proxy": "N/A",
-                        "tvl": "N/A",
-                        "developer_activity": "N/A"
-                    },
-                    "curated_youtube": "N/A",
-                    "curated_x": "No accounts curated",
-                    "twitter_followers": 0,
-                    "predicted_price": "N/A",
-                    "prediction_explanation": "N/A"
-                })
-            await asyncio.sleep(8)
-
-    if len(ta_data) < len(coins):
-        logger.warning(f"ta_data ({len(ta_data)}) shorter than coins ({len(coins)}), appending fallbacks...")
-        for coin in coins[len(ta_data):]:
-            projects = random.choice(daily_projects.get(coin, [("N/A", "No project data", "")]))
-            ta_data.append({
-                "coin": coin_names[coin],
-                "text": f"{coin_names[coin]}: Price unavailable",
-                "full_text": f"{coin_names[coin]}: Data temporarily unavailable, check chart",
-                "chart_url": f"https://www.tradingview.com/chart/?symbol=BITFINEX:{coin_symbols[coin]}",
-                "market_cap": "N/A",
-                "projects": project_sources[coin]["count"],
-                "partnerships": project_sources[coin]["partnerships"],
-                "project_source": project_sources[coin]["source"],
-                "project_url": project_sources[coin]["url"],
-                "total_projects": project_sources[coin]["total_projects"],
-                "top_projects": [projects],
-                "top_project_metrics": {'public_interest': 'N/A', 'corporate_utilization': f"{project_sources[coin]['partnerships']} partnerships"},
-                "volume": 0,
-                "exchange": exchange_links[coin],
-                "price_change_24h": 0,
-                "trend": "N/A",
-                "ma_30": prior_year_averages.get(coin, 0),
-                "prior_month_avg": prior_year_averages.get(coin, 0),
-                "fundamentals": "N/A",
-                "onchain_metrics": {
-                    "transaction_volume": "N/A",
-                    "active_addresses_proxy": "N/A",
-                    "tvl": "N/A",
-                    "developer_activity": "N/A"
-                },
-                "curated_youtube": "N/A",
-                "curated_x": "No accounts curated",
-                "twitter_followers": 0,
-                "predicted_price": "N/A",
-                "prediction_explanation": "N/A"
-            })
+                return fallback_coin_data(coin)
+
+    session = get_session()
+    # One /coins/markets call covers the fast-changing fields of every coin CoinGecko still lists
+    listed = [coin for coin in coins if not await negative_cache.ahit("coingecko", f"coins/{coin}")]
+    try:
+        snapshot = await shared_market_snapshot(coingecko, session, market_cache, listed) if listed else {}
+    except Exception as e:
+        logger.error(f"Error fetching market snapshot for {coins}: {e}")
+        snapshot = {}
+    logger.info(f"Fetching data for coins: {coins} ({COIN_CONCURRENCY} at a time)")
+    ta_data = list(await asyncio.gather(*(fetch_one(coin, session, snapshot) for coin in coins)))
 
     logger.info(f"get_ta_data completed: {len(ta_data)} entries for coins {coins}")
+    logger.debug(f"Cache stats: {cache.stats()}")
     return ta_data
 
+async def warm_post_caches():
+    """Fetch everything the next thread reads, so posting only renders cached data."""
+    coin_data = await get_ta_data()
+    await asyncio.gather(
+        *(fetch_news(data['coin']) for data in coin_data),
+        get_youtube_summary(),
+        return_exceptions=True
+    )
+    return coin_data
+
+def coin_post_source(data, news):
+    """The fields a coin's post fragments are rendered from; their hash keys the rendered text."""
+    return {
+        "coin": data['coin'],
+        "price": data.get('price'),
+        "price_change_24h": data['price_change_24h'],
+        "volume": data['volume'],
+        "predicted_price": data['predicted_price'],
+        "prediction_explanation": data['prediction_explanation'],
+        "top_project": list(data['top_projects'][0]) if data['top_projects'] else None,
+        "total_projects": data['total_projects'],
+        "onchain_metrics": data['onchain_metrics'],
+        "chart_url": data['chart_url'],
+        "news": news
+    }
+
+def price_line(source):
+    if source['price'] is None:
+        raise ValueError(f"No price for {source['coin']}")
+    change = source['price_change_24h']
+    return f"${source['price']:.2f} ({change:.2f}% 24h) {'📈' if change > 0 else '📉'}"
+
+def top_project_link(source):
+    project = source['top_project']
+    if not project:
+        return "N/A", ""
+    return project[0], project[2] if project[2] and project[2] != "N/A" else ""
+
+def render_coin_tweet(source):
+    """One coin's reply in the X thread."""
+    coin_id = [k for k, v in coin_names.items() if v == source['coin']][0]
+    news = source['news']
+    top_project, project_url = top_project_link(source)
+    headline = news['headline'][:40] + "..." if len(news['headline']) > 40 else news['headline']
+    token_key = token_symbols.get(coin_id, source['coin'].split()[0].upper())
+    tweet_lines = [
+        f"{source['coin']} ({token_key}): {price_line(source)}",
+        f"Tx Volume: {format_number(source['volume'])}",
+        f"Top Project: {top_project}" + (f" {project_url}" if project_url else ""),
+        f"News: {headline} {news['url']} #Crypto"
+    ]
+    if source['predicted_price'] != "N/A":
+        tweet_lines.insert(1, f"Predicted: {source['predicted_price']} ({source['prediction_explanation']})")
+    return "\n".join(tweet_lines)
+
+def render_coin_block(source):
+    """One coin's section of the !crypto_update Discord message."""
+    coin_id = [k for k, v in coin_names.items() if v == source['coin']][0]
+    news = source['news']
+    top_project, project_url = top_project_link(source)
+    headline = news['headline'][:100] if news['headline'] else "No headline available"
+    token_key = token_symbols.get(coin_id, source['coin'].upper())
+    block = (
+        f"**{source['coin']} ({token_key})**\n"
+        f"Price: {price_line(source)}\n"
+    )
+    if source['predicted_price'] != "N/A":
+        block += f"Predicted Price: {source['predicted_price']} ({source['prediction_explanation']})\n"
+    block += (
+        f"Transaction Volume: {format_number(source['volume'])}\n"
+        f"Active Addresses (Proxy): {source['onchain_metrics']['active_addresses_proxy']}\n"
+        f"Developer Activity: {source['onchain_metrics']['developer_activity']}\n"
+        f"Projects: {source['total_projects']}, Top: {top_project}" + (f" {project_url}" if project_url else "") + "\n"
+        f"News: {headline}\n"
+        f"Link: {news['url']}\n"
+        f"Chart: {source['chart_url']}\n\n"
+    )
+    return block
+
 async def post_x_update():
+    next_post = datetime.now(UTC)
     while True:
+        warmed = await prewarm_until(next_post, warm_post_caches, name="X thread")
+        next_post = max(next_post + timedelta(seconds=POST_INTERVAL), datetime.now(UTC))
         try:
-            coin_data = await get_ta_data()
+            coin_data = warmed or await get_ta_data()
             if not coin_data:
                 logger.error("No coin data retrieved, skipping X update")
-                await asyncio.sleep(14400)
                 continue
 
             timestamp = datetime.now(UTC).strftime("%b %d, %Y")
@@ -1252,21 +1187,8 @@ async def post_x_update():
                 try:
                     coin_id = [k for k, v in coin_names.items() if v == data['coin']][0]
                     news = await fetch_news(data['coin'])
-                    top_project = data['top_projects'][0][0] if data['top_projects'] else "N/A"
-                    project_url = data['top_projects'][0][2] if data['top_projects'] and data['top_projects'][0][2] and data['top_projects'][0][2] != "N/A" else ""
-                    tx_volume = format_number(data['onchain_metrics']['transaction_volume'])
-                    headline = news['headline'][:40] + "..." if len(news['headline']) > 40 else news['headline']
-                    token_key = token_symbols.get(coin_id, data['coin'].split()[0].upper())
-                    tweet_lines = [
-                        f"{data['coin']} ({token_key}): ${data['text'].split('$')[1]} ({data['price_change_24h']:.2f}% 24h) {'📈' if data['price_change_24h'] > 0 else '📉'}",
-                        f"Tx Volume: {tx_volume}",
-                        f"Top Project: {top_project}" + (f" {project_url}" if project_url else ""),
-                        f"News: {headline} {news['url']} #Crypto"
-                    ]
-                    if data['predicted_price'] != "N/A":
-                        tweet_lines.insert(1, f"Predicted: {data['predicted_price']} ({data['prediction_explanation']})")
-                    tweet = "\n".join(tweet_lines)
-                    thread.append(tweet)
+                    # Unchanged coin data and news reuse the text rendered on an earlier run
+                    thread.append(fragments.render("x_coin", coin_post_source(data, news), render_coin_tweet))
                     valid_coins.append(coin_id)
                 except Exception as e:
                     logger.error(f"Error processing coin {data['coin']} for thread: {e}")
@@ -1274,7 +1196,6 @@ async def post_x_update():
 
             if len(thread) < 2:
                 logger.error("Insufficient valid coin data for thread, skipping X update")
-                await asyncio.sleep(14400)
                 continue
 
             try:
@@ -1308,25 +1229,23 @@ async def post_x_update():
                 logger.error(f"Error curating content for thread: {e}")
                 thread.append(f"Stay tuned for more crypto updates ({timestamp})! #CryptoNews")
 
-            history = load_history()
             thread_hashes = [hash_post(post) for post in thread]
             logger.debug(f"Thread content and hashes: {list(zip(thread, thread_hashes))}")
-            if is_thread_unique(thread, history):
+            if await is_thread_unique(thread):
                 success = await send_x_thread(thread)
                 if success:
-                    history.append({
+                    await save_history({
                         "timestamp": datetime.now(UTC).timestamp(),
                         "post_hashes": thread_hashes,
+                        "coins": valid_coins,
                         "influencers": [infl.split(" (")[0] for infl in influencers_list]
                     })
-                    save_history(prune_history(history))
                 else:
                     logger.error("Failed to post thread to X, not saving to history")
             else:
                 logger.info(f"Skipping X post: thread contains too many duplicates. Hashes: {thread_hashes}")
         except Exception as e:
             logger.error(f"Error in post_x_update: {e}\n{traceback.format_exc()}")
-        await asyncio.sleep(14400)
 
 @bot.command()
 async def crypto_update(ctx):
@@ -1335,28 +1254,8 @@ async def crypto_update(ctx):
         message = "🚀 **Crypto Market Update** 📈\n\n"
         for data in coin_data[:4]:
             try:
-                coin_id = [k for k, v in coin_names.items() if v == data['coin']][0]
                 news = await fetch_news(data['coin'])
-                top_project = data['top_projects'][0][0] if data['top_projects'] else "N/A"
-                project_url = data['top_projects'][0][2] if data['top_projects'] and data['top_projects'][0][2] and data['top_projects'][0][2] != "N/A" else ""
-                tx_volume = format_number(data['onchain_metrics']['transaction_volume'])
-                headline = news['headline'][:100] if news['headline'] else "No headline available"
-                token_key = token_symbols.get(coin_id, data['coin'].upper())
-                message += (
-                    f"**{data['coin']} ({token_key})**\n"
-                    f"Price: ${data['text'].split('$')[1]} ({data['price_change_24h']:.2f}% 24h) {'📈' if data['price_change_24h'] > 0 else '📉'}\n"
-                )
-                if data['predicted_price'] != "N/A":
-                    message += f"Predicted Price: {data['predicted_price']} ({data['prediction_explanation']})\n"
-                message += (
-                    f"Transaction Volume: {tx_volume}\n"
-                    f"Active Addresses (Proxy): {data['onchain_metrics']['active_addresses_proxy']}\n"
-                    f"Developer Activity: {data['onchain_metrics']['developer_activity']}\n"
-                    f"Projects: {data['total_projects']}, Top: {top_project}" + (f" {project_url}" if project_url else "") + "\n"
-                    f"News: {headline}\n"
-                    f"Link: {news['url']}\n"
-                    f"Chart: {data['chart_url']}\n\n"
-                )
+                message += fragments.render("discord_coin", coin_post_source(data, news), render_coin_block)
             except Exception as e:
                 logger.error(f"Error processing coin {data['coin']} for Discord message: {e}")
                 continue
@@ -1386,6 +1285,7 @@ async def crypto_update(ctx):
 @bot.event
 async def on_ready():
     logger.info(f"Bot logged in as {bot.user}")
+    cache.start_sweeper()
     bot.loop.create_task(post_x_update())
 
 if __name__ == "__main__":